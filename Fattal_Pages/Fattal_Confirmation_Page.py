@@ -4,26 +4,28 @@ from datetime import datetime
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
 
 
 class FattalConfirmPage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 30)
+        self.wait = FattalWait(driver, 30)
 
     def complete_and_verify_payment(self, expected_email):
         try:
             logging.info("Attempting to click 'בצע תשלום' in iframe...")
 
             # Switch to iframe
-            WebDriverWait(self.driver, 15).until(
+            FattalWait(self.driver, 15).until(
                 EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, "iframe[id*='credit-card']"))
             )
             logging.info("Switched into payment iframe")
 
             # Wait for the button to be clickable
-            pay_btn = WebDriverWait(self.driver, 10).until(
+            pay_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "submitBtn"))
             )
 
@@ -39,7 +41,7 @@ class FattalConfirmPage:
 
             # Wait for confirmation page
             logging.info("Waiting for confirmation page (מספר ההזמנה)...")
-            WebDriverWait(self.driver, 30).until(
+            FattalWait(self.driver, 30).until(
                 EC.visibility_of_element_located((By.XPATH, "//p[contains(text(),'מספר ההזמנה')]"))
             )
 
@@ -57,10 +59,8 @@ class FattalConfirmPage:
 
     def _save_screenshot(self, prefix):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        path = os.path.join(screenshot_dir, f"{prefix}_{timestamp}.png")
-        self.driver.save_screenshot(path)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots"))
+        path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{prefix}_{timestamp}")
         logging.error(f"Screenshot saved at: {path}")
         return path
 
@@ -101,10 +101,8 @@ class FattalConfirmPage:
 
             # 📸 Save confirmation screenshot
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            screenshot_dir = os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots")
-            os.makedirs(screenshot_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshot_dir, f"confirmation_PASS_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots"))
+            screenshot_path = screenshot_service_for(self.driver).capture(screenshot_dir, f"confirmation_PASS_{timestamp}")
 
             logging.info(f"Confirmation screenshot saved at: {screenshot_path}")
             logging.info(f"Order Number: {order_number}, Email: {confirmed_email}, HotelID: {hotel_id}")
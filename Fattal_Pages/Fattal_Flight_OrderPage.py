@@ -4,13 +4,18 @@ import os
 from selenium.common import TimeoutException, ElementNotInteractableException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+
+from Fattal_Utils.Typing import typer_for
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
 
 
 class FattalFlightOrderPage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = FattalWait(driver, 15)
+        self.typer = typer_for(driver)
 
     # Edit buttons for departure & return
     def click_edit_departure_flight(self):
@@ -75,7 +80,7 @@ class FattalFlightOrderPage:
     def close_flight_overlay_if_present(self):
         try:
             logging.info("Checking for flight overlay close button...")
-            close_button = WebDriverWait(self.driver, 5).until(
+            close_button = FattalWait(self.driver, 5).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='סגור']"))
             )
             close_button.click()
@@ -100,12 +105,8 @@ class FattalFlightOrderPage:
             logging.warning(f"'עריכה' not present or already dismissed: {e}")
 
     def take_screenshot(self, name):
-        screenshot_dir = os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{name}_{int(time.time())}.png"
-        )
-        self.driver.save_screenshot(filename)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots"))
+        filename = screenshot_service_for(self.driver).capture(screenshot_dir, f"{name}_{int(time.time())}")
         logging.info(f"Screenshot saved to {filename}")
 
     def try_flight_options_by_time_of_day(self):
@@ -147,7 +148,7 @@ class FattalFlightOrderPage:
 
     def handle_passenger_form_if_flight_selection_skipped(self):
         try:
-            WebDriverWait(self.driver, 5).until(
+            FattalWait(self.driver, 5).until(
                 EC.presence_of_element_located((By.XPATH, "//span[contains(text(),'פרטי הטסים')]"))
             )
             logging.info("Passenger form is present, not skipped.")
@@ -207,7 +208,7 @@ class FattalFlightOrderPage:
     def click_continue_button(self):
         logging.info("Looking for continue button...")
         try:
-            continueButton = WebDriverWait(self.driver, 10).until(
+            continueButton = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "checkout-flights-button-submit"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continueButton)
@@ -227,14 +228,10 @@ class FattalFlightOrderPage:
         tab_elements[0].click()
         logging.info(f"Time tab '{label_text}' clicked.")
 
-    def scroll_and_type(self, element, value):
+    def scroll_and_type(self, element, value, mode=None):
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
-            element.clear()
-            for _ in range(10):  # Clear any existing text
-                element.send_keys("\b")  # backspace
-            element.send_keys(value)
+            self.typer.type(element, value, mode=mode, char_delay=0)
             logging.info(f"Typed '{value}' into field")
         except ElementNotInteractableException as e:
             logging.warning(f"Element not interactable. Using JS fallback: {e}")
@@ -264,7 +261,7 @@ class FattalFlightOrderPage:
     def wait_for_passenger_form(self):
         logging.info("Waiting for passenger form to load...")
         try:
-            WebDriverWait(self.driver, 15).until(
+            FattalWait(self.driver, 15).until(
                 EC.presence_of_element_located((By.XPATH, "//span[contains(text(),'פרטי הטסים')]"))
             )
             logging.info("Passenger form loaded successfully.")
@@ -285,7 +282,7 @@ class FattalFlightOrderPage:
 
     def ensure_passenger_form_loaded(self):
         try:
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.XPATH, "//span[contains(text(),'פרטי הטסים')]"))
             )
             logging.info("Passenger form detected - flight selection successful.")
@@ -3,13 +3,18 @@ from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.keys import Keys
 import time
 import random
 import logging
 from datetime import datetime
 from pathlib import Path
+
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Calendar_Index import FattalCalendarIndex
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
 # Set up logging configuration once
 logging.basicConfig(
     level=logging.INFO,
@@ -19,14 +24,17 @@ logging.basicConfig(
 
 
 class FattalMainPage:
+        CALENDAR_TILES = ".react-calendar__tile"
+
         def __init__(self, driver: webdriver.Chrome):
-            self.wait = WebDriverWait(driver, 10)
+            self.wait = FattalWait(driver, 10)
+            self.waits = FattalWaitPolicy(driver)
             self.driver = driver
 
         def deal_popup(self):
             try:
                 # Wait until the div with the full unique class path is clickable
-                close_button = WebDriverWait(self.driver, 3).until(
+                close_button = FattalWait(self.driver, 3).until(
                     EC.element_to_be_clickable(
                         (By.CSS_SELECTOR, "#header-user-section-container > div > div > div.sc-4a11a149-3.dVxqFs svg"))
                 )
@@ -40,7 +48,7 @@ class FattalMainPage:
 
         def click_clear_button_hotel(self):
             try:
-                clear_button = WebDriverWait(self.driver, 5).until(
+                clear_button = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='נקה שדה']"))
                 )
                 clear_button.click()
@@ -52,7 +60,7 @@ class FattalMainPage:
             try:
                 # Step 1: Open flight filter section (if applicable)
                 try:
-                    dropdown_btn = WebDriverWait(self.driver, 5).until(
+                    dropdown_btn = FattalWait(self.driver, 5).until(
                         EC.element_to_be_clickable((By.ID, "search-engine-flight-select-option_all_flights"))
                     )
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", dropdown_btn)
@@ -70,7 +78,7 @@ class FattalMainPage:
             try:
                 input_field = self.driver.find_element(By.ID, "main-input")
                 input_field.click()
-                WebDriverWait(self.driver, 5).until(
+                FattalWait(self.driver, 5).until(
                     EC.presence_of_element_located((By.XPATH, "//div[text()='יעדים שעשויים לעניין אותך']"))
                 )
                 logging.info("Suggestions triggered.")
@@ -93,7 +101,7 @@ class FattalMainPage:
             try:
                 chosen_text = button.text
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(button))
+                FattalWait(self.driver, 5).until(EC.element_to_be_clickable(button))
                 self.driver.execute_script("arguments[0].click();", button)
                 logging.info(f"נבחרה הצעה: {chosen_text}")
             except Exception as e:
@@ -102,7 +110,7 @@ class FattalMainPage:
         # Wait for suggestion buttons to appear
         def wait_for_suggestion_container(self):
             try:
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.sc-c017a840-10.dBYtDd button"))
                 )
                 logging.info("Suggestion container is visible.")
@@ -112,7 +120,7 @@ class FattalMainPage:
         # Find the suggestion button containing specific city name
         def find_suggestion_button(self, city_name: str):
             try:
-                buttons = WebDriverWait(self.driver, 10).until(
+                buttons = FattalWait(self.driver, 10).until(
                     EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.sc-c017a840-10.dBYtDd button"))
                 )
                 for btn in buttons:
@@ -129,7 +137,7 @@ class FattalMainPage:
         def set_city(self, city_name: str):
             self.type_city_name(city_name)
             try:
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.autocomplete-menu button"))
                 )
                 time.sleep(1.2)
@@ -162,7 +170,7 @@ class FattalMainPage:
                 logging.info("Trying to open calendar...")
 
                 # ✅ Find by partial match instead of exact ID
-                calendar_div = WebDriverWait(self.driver, 10).until(
+                calendar_div = FattalWait(self.driver, 10).until(
                     EC.presence_of_element_located((
                         By.XPATH, "//*[starts-with(@id, 'search-engine-date-picker-display-container')]"
                     ))
@@ -175,7 +183,7 @@ class FattalMainPage:
                 logging.info("Clicked calendar <div> via JS.")
 
                 # ✅ Wait for the actual calendar to appear
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.ID, "search-engine-date-picker-container"))
                 )
                 logging.info("Calendar opened successfully.")
@@ -188,7 +196,7 @@ class FattalMainPage:
         # Switch to the arrival tab in the calendar (if not already active)
         def switch_to_arrival_tab(self):
             try:
-                arrival_tab = WebDriverWait(self.driver, 2).until(
+                arrival_tab = FattalWait(self.driver, 2).until(
                     EC.presence_of_element_located((By.XPATH, "//div[text()='בחירת תאריך הגעה']"))
                 )
                 arrival_tab.click()
@@ -211,7 +219,7 @@ class FattalMainPage:
                 self.open_calendar()
                 self.switch_to_arrival_tab()
 
-                next_button = WebDriverWait(self.driver, 5).until(
+                next_button = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, "//button[contains(@class, 'react-calendar__navigation__next-button')]"))
                 )
@@ -239,7 +247,7 @@ class FattalMainPage:
                 time.sleep(1)  # Give the browser a moment to react
 
                 # ✅ Wait until the calendar modal disappears before moving on
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.invisibility_of_element_located((By.CLASS_NAME, "react-calendar"))
                 )
 
@@ -259,7 +267,7 @@ class FattalMainPage:
 
                 # Move 2 months ahead
                 for _ in range(2):
-                    next_button = WebDriverWait(self.driver, 5).until(
+                    next_button = FattalWait(self.driver, 5).until(
                         EC.element_to_be_clickable(
                             (By.XPATH, "//button[contains(@class, 'react-calendar__navigation__next-button')]"))
                     )
@@ -271,39 +279,25 @@ class FattalMainPage:
                         self.driver.execute_script("arguments[0].click();", next_button)
                     time.sleep(1)
 
-                # Find valid dates
-                valid_dates = self.get_valid_date_buttons()
-                if not valid_dates or len(valid_dates) < min_nights:
+                # Index the calendar once, then pick the range locally
+                index = FattalCalendarIndex(self.driver, self.CALENDAR_TILES)
+                stay = index.random_range(min_nights, max_nights)
+                if not stay:
                     raise Exception("Not enough valid dates to select range.")
-
-                # Random pick
-                max_start_index = len(valid_dates) - min_nights
-                start_index = random.randint(0, max_start_index)
-                nights = random.randint(min_nights, max_nights)
-                end_index = start_index + nights
-                if end_index >= len(valid_dates):
-                    end_index = len(valid_dates) - 1
-
-                check_in = valid_dates[start_index]
-                check_in_text = check_in.text
-                check_out = valid_dates[end_index]
-                check_out_text = check_out.text
-
-                actions = ActionChains(self.driver)
+                check_in, check_out, nights = stay
+                check_in_text = check_in.label
+                check_out_text = check_out.label
 
                 # 1️⃣ Click End Date first (this clears previous selection!)
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", check_out)
-                actions.move_to_element(check_out).pause(0.2).click().perform()
+                index.click(check_out)
                 time.sleep(0.5)
 
                 # 2️⃣ Click Start Date
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", check_in)
-                actions.move_to_element(check_in).pause(0.2).click().perform()
+                index.click(check_in)
                 time.sleep(0.5)
 
                 # 3️⃣ Click End Date Again
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", check_out)
-                actions.move_to_element(check_out).pause(0.2).click().perform()
+                index.click(check_out)
 
                 logging.info(f"Selected custom stay: {check_in_text} to {check_out_text} ({nights} nights)")
 
@@ -311,7 +305,7 @@ class FattalMainPage:
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
                 time.sleep(1)  # Give browser a moment to react
 
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.invisibility_of_element_located((By.CLASS_NAME, "react-calendar"))
                 )
 
@@ -337,61 +331,43 @@ class FattalMainPage:
 
             # Step 2: Advance calendar two months
             for _ in range(2):
-                next_btn = WebDriverWait(self.driver, 10).until(
+                next_btn = FattalWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, ".react-calendar__navigation__next-button"))
                 )
                 js_click(next_btn)
                 time.sleep(0.5)
 
-            # Step 3: Get all valid selectable dates
-            def get_valid_date_buttons():
-                return self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    ".react-calendar__tile:not(.react-calendar__tile--disabled):not(.react-calendar__month-view__days__day--neighboringMonth)"
-                )
+            # Step 3: Index every date tile in one call
+            index = FattalCalendarIndex(self.driver, self.CALENDAR_TILES)
 
-            dates = get_valid_date_buttons()
-            if len(dates) < min_nights + 1:
+            # Step 4: Choose a random check-in/check-out pair locally
+            stay = index.random_range(min_nights, max_nights)
+            if not stay:
                 raise RuntimeError("❌ Not enough selectable dates available.")
+            check_in, check_out, nights = stay
+            check_in_text = check_in.label
+            check_out_text = check_out.label
 
-            # Step 4: Choose random check-in and check-out indexes
-            start_idx = random.randint(0, len(dates) - min_nights)
-            nights = random.randint(min_nights, max_nights)
-            end_idx = min(start_idx + nights, len(dates) - 1)
-
-            check_in_el = dates[start_idx]
-            check_in_text = check_in_el.get_attribute("aria-label") or check_in_el.text  # ✅ BEFORE click
-
-            logging.info(f"Selecting stay from index {start_idx} to {end_idx} ({nights} nights)")
+            logging.info(f"Selecting stay from tile {check_in.index} to {check_out.index} ({nights} nights)")
 
             # Step 5: Click check-in
-            js_click(check_in_el)
+            index.click(check_in)
             time.sleep(0.3)
 
-            # Step 6: Re-fetch dates to get fresh references (DOM has re-rendered)
-            new_dates = get_valid_date_buttons()
-
-            if end_idx >= len(new_dates):
-                logging.warning("⚠️ Calendar shrank after re-render — adjusting check-out index")
-                end_idx = len(new_dates) - 1
-
-            check_out_el = new_dates[end_idx]
-            check_out_text = check_out_el.get_attribute("aria-label") or check_out_el.text
-
-            # Step 7: Click check-out
-            js_click(check_out_el)
+            # Step 6: Click check-out (found again by its position, so a re-render can't leave it stale)
+            index.click(check_out)
             time.sleep(0.3)
 
-            # Step 8: Click continue if it appears
+            # Step 7: Click continue if it appears
             try:
-                cont = WebDriverWait(self.driver, 3).until(
+                cont = FattalWait(self.driver, 3).until(
                     EC.element_to_be_clickable((By.ID, "search-engine-date-picker-footer-side-button"))
                 )
                 js_click(cont)
             except TimeoutException:
                 logging.warning("⚠️ 'Continue' button not found — skipping.")
 
-            # Step 9: Store values for logs/report
+            # Step 8: Store values for logs/report
             self.selected_checkin_date = check_in_text
             self.selected_checkout_date = check_out_text
             self.selected_nights = nights
@@ -409,41 +385,29 @@ class FattalMainPage:
             self.switch_to_arrival_tab()
 
             for _ in range(2):
-                next_btn = WebDriverWait(self.driver, 10).until(
+                next_btn = FattalWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, ".react-calendar__navigation__next-button"))
                 )
                 js_click(next_btn)
                 time.sleep(0.4)
 
-            def get_valid_buttons():
-                return self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    ".react-calendar__tile:not(.react-calendar__tile--disabled):not(.react-calendar__month-view__days__day--neighboringMonth)"
-                )
-
-            dates = get_valid_buttons()
-            if len(dates) < min_nights + 1:
+            index = FattalCalendarIndex(self.driver, self.CALENDAR_TILES)
+            stay = index.random_range(min_nights, max_nights)
+            if not stay:
                 raise RuntimeError("❌ Not enough selectable dates")
-
-            start_idx = random.randint(0, len(dates) - min_nights)
-            nights = random.randint(min_nights, max_nights)
-            end_idx = min(start_idx + nights, len(dates) - 1)
+            check_in, check_out, nights = stay
+            check_in_text = check_in.label
+            check_out_text = check_out.label
 
             # Click check-in FIRST
-            check_in = dates[start_idx]
-            check_in_text = check_in.get_attribute("aria-label") or check_in.text
-            js_click(check_in)
+            index.click(check_in)
             time.sleep(0.5)
 
-            # Re-fetch for fresh reference
-            dates_after_click = get_valid_buttons()
-            check_out = dates_after_click[min(end_idx, len(dates_after_click) - 1)]
-            check_out_text = check_out.get_attribute("aria-label") or check_out.text
-            js_click(check_out)
+            index.click(check_out)
             time.sleep(0.5)
 
             try:
-                cont = WebDriverWait(self.driver, 3).until(
+                cont = FattalWait(self.driver, 3).until(
                     EC.element_to_be_clickable((By.ID, "search-engine-date-picker-footer-side-button"))
                 )
                 js_click(cont)
@@ -461,7 +425,7 @@ class FattalMainPage:
                 logging.info("Opening room selection modal...")
 
                 # Locate the <div> "button" by XPath (using ID)
-                button = WebDriverWait(self.driver, 10).until(
+                button = FattalWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.XPATH, "//*[@id='main-search-rooms-select']"))
                 )
 
@@ -474,7 +438,7 @@ class FattalMainPage:
                 logging.info("Clicked room selection <div> button via JS.")
 
                 # Wait for the room selection modal to appear
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.visibility_of_element_located((By.XPATH, "//*[@id='search-engine-room-selection-popover']"))
                 )
                 logging.info("Room selection modal is now visible.")
@@ -488,7 +452,7 @@ class FattalMainPage:
 
                 def select_guest(cell_id, value):
                     try:
-                        container = WebDriverWait(self.driver, 5).until(
+                        container = FattalWait(self.driver, 5).until(
                             EC.presence_of_element_located((By.ID, cell_id))
                         )
                         dropdown_button = container.find_element(By.TAG_NAME, "button")
@@ -497,7 +461,7 @@ class FattalMainPage:
                         logging.info(f"Opened dropdown for {cell_id}.")
                         time.sleep(0.3)
 
-                        options = WebDriverWait(self.driver, 5).until(
+                        options = FattalWait(self.driver, 5).until(
                             EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[id^='select-options_'] button"))
                         )
 
@@ -523,7 +487,7 @@ class FattalMainPage:
                 time.sleep(0.3)
 
                 # ➡️ Click continue to confirm
-                continue_btn = WebDriverWait(self.driver, 5).until(
+                continue_btn = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable((By.ID, "search-engine-build-room-next-button"))
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
@@ -574,6 +538,8 @@ class FattalMainPage:
 
         def close_post_login_popup(self):
             """Closes the post-login popup/modal if it appears."""
+            if popup_watchdog_for(self.driver).handles("post_login"):
+                return
             try:
                 logging.info("Checking for post-login popup...")
 
@@ -600,10 +566,8 @@ class FattalMainPage:
         # In FattalMainPage.py
         def take_screenshot(self, name="error_screenshot"):
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            screenshot_dir = Path.cwd() / "Screenshots"
-            screenshot_dir.mkdir(exist_ok=True)
-            path = screenshot_dir / f"{name}_{timestamp}.png"
-            self.driver.save_screenshot(str(path))
+            screenshot_dir = worker_dir(str(Path.cwd() / "Screenshots"))
+            path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{name}_{timestamp}")
             logging.error(f"Screenshot saved: {path}")
 
         def select_specific_date_range_desktop(self, checkin_day: int, checkout_day: int, month: str = "יולי 2025"):
@@ -611,12 +575,12 @@ class FattalMainPage:
                 logging.info(f"[DESKTOP] Selecting date range {checkin_day} to {checkout_day} in {month}")
 
                 # Open calendar
-                calendar_opener = WebDriverWait(self.driver, 10).until(
+                calendar_opener = FattalWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//div[contains(@id, 'date-picker')]"))
                 )
                 calendar_opener.click()
 
-                WebDriverWait(self.driver, 15).until(
+                FattalWait(self.driver, 15).until(
                     EC.presence_of_element_located((By.CLASS_NAME, "react-calendar"))
                 )
 
@@ -659,7 +623,7 @@ class FattalMainPage:
                         break
                     else:
                         logging.info(f"Did not find dates in attempt {attempts}. Clicking next month.")
-                        next_btn = WebDriverWait(self.driver, 5).until(
+                        next_btn = FattalWait(self.driver, 5).until(
                             EC.element_to_be_clickable(
                                 (By.XPATH, "//button[contains(@class, 'react-calendar__navigation__next-button')]"))
                         )
@@ -681,7 +645,7 @@ class FattalMainPage:
 
                 # Optional continue button
                 try:
-                    continue_btn = WebDriverWait(self.driver, 10).until(
+                    continue_btn = FattalWait(self.driver, 10).until(
                         EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'המשך')]"))
                     )
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
@@ -701,30 +665,22 @@ class FattalMainPage:
             Tries both by ID (#ex-popup-modal-close-btn) and by close button class (.u-close-button).
             If not found, skips gracefully.
             """
-            try:
-                # Try by ID first
-                close_button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#ex-popup-modal-close-btn"))
-                )
-                self.driver.execute_script("arguments[0].click();", close_button)
-                logging.info("WAR popup closed (by id).")
+            if popup_watchdog_for(self.driver).handles("war"):
                 return
-            except Exception as e_id:
-                logging.info(f"WAR popup close by ID failed: {e_id}")
 
-            try:
-                # Try by class 'u-close-button' (generic modal close, fallback)
-                close_button_alt = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "a.u-close-button"))
-                )
-                self.driver.execute_script("arguments[0].click();", close_button_alt)
-                logging.info("WAR popup closed (by class 'u-close-button').")
+            locators = {
+                "id": (By.CSS_SELECTOR, "#ex-popup-modal-close-btn"),
+                "class": (By.CSS_SELECTOR, "a.u-close-button"),
+            }
+            # One explicit wait over both selectors instead of a full timeout per selector
+            found = self.waits.first_of(locators, "popup")
+            if not found:
+                logging.info("No WAR popup found, or already closed. Continuing test flow.")
                 return
-            except Exception as e_class:
-                logging.info(f"WAR popup close by class failed: {e_class}")
 
-            # Not found — skip silently
-            logging.info("No WAR popup found, or already closed. Continuing test flow.")
+            close_button = self.waits.probe(*locators[found])[0]
+            self.driver.execute_script("arguments[0].click();", close_button)
+            logging.info(f"WAR popup closed (by {found}).")
 
         def accessibility_button(self): self.driver.find_element(By.CSS_SELECTOR, 'a.sc-d3198970-0.MBsfR:nth-of-type(1)').click()
         def customer_support_button(self): self.driver.find_element(By.CSS_SELECTOR, 'a.sc-d3198970-0.MBsfR:nth-of-type(2)').click()
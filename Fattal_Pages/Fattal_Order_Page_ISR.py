@@ -2,22 +2,40 @@ import random
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support.ui import Select
 import logging
 
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.React_Forms import fill_react_fields
+from Fattal_Utils.Payment_Form import payment_form_for
+from Fattal_Utils.Typing import REALISTIC, typer_for
+
 class FattalOrderPage:
+    # New checkout structure first, old structure as the alternative
+    GUEST_FIELDS = {
+        "email": ("checkout-form-field-input_email", "checkout.personal_details_form.label_email"),
+        "phone": ("checkout-form-field-input_phone", "checkout.personal_details_form.label_phone"),
+        "first_name": ("checkout-form-field-input_first-name", "checkout.personal_details_form.label_first_name"),
+        "last_name": ("checkout-form-field-input_last-name", "checkout.personal_details_form.label_last_name"),
+        "id_number": ("checkout-form-field-input_id", "checkout.personal_details_form.label_id"),
+    }
+
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = FattalWait(driver, 15)
+        self.waits = FattalWaitPolicy(driver)
+        self.dom_wait = FattalDomWait(driver, 15)
+        self.typer = typer_for(driver)
+        self.payment_form = payment_form_for(driver)
 
-    def _safe_fill_field(self, by, value, text, label):
+    def _safe_fill_field(self, by, value, text, label, mode=None):
         try:
             el = self.wait.until(EC.presence_of_element_located((by, value)))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", el)
             if el.is_enabled():
-                el.clear()
-                el.send_keys(text)
+                self.typer.type(el, text, mode=mode, label=label, char_delay=0)
                 logging.info(f"✅ {label} set: {text}")
             else:
                 logging.info(f"ℹ️ {label} field is disabled, skipping input.")
@@ -55,6 +73,37 @@ class FattalOrderPage:
         except:
             self._safe_fill_field(By.ID, "checkout.personal_details_form.label_id", id_number, "ID number")
 
+    def fill_fields(self, values: dict, key_event_fields=()):
+        """
+        Sets several checkout fields in a single round trip and verifies them.
+        Keys are a field id or a tuple of alternative ids. Fields listed in key_event_fields,
+        and any the batch could not set, are typed one by one through _safe_fill_field.
+        """
+        batched = {k: v for k, v in values.items() if k not in key_event_fields}
+        report = fill_react_fields(self.driver, batched) if batched else {}
+        for key, value in values.items():
+            result = report.get(key)
+            if result and (result["ok"] or result["disabled"]):
+                continue
+            ids = key if isinstance(key, tuple) else (key,)
+            if result:
+                logging.warning(f"⚠️ Batch fill missed '{ids[0]}' (read back {result['value']!r}) — typing it instead.")
+            field_id = result["id"] if result and result["id"] else ids[0]
+            mode = REALISTIC if key in key_event_fields else None
+            self._safe_fill_field(By.ID, field_id, value, field_id, mode=mode)
+        return report
+
+    def fill_guest_form(self, email, phone, first_name, last_name, id_number=None):
+        values = {
+            self.GUEST_FIELDS["email"]: email,
+            self.GUEST_FIELDS["phone"]: phone,
+            self.GUEST_FIELDS["first_name"]: first_name,
+            self.GUEST_FIELDS["last_name"]: last_name,
+        }
+        if id_number is not None:
+            values[self.GUEST_FIELDS["id_number"]] = id_number
+        return self.fill_fields(values)
+
     def _fallback_set_by_js(self, text, label):
         script = f"""
             const inputs = Array.from(document.querySelectorAll('input'));
@@ -79,11 +128,11 @@ class FattalOrderPage:
 
     def wait_until_personal_form_ready(self):
         try:
-            self.wait.until(EC.visibility_of_element_located((By.ID, "checkout-personal-details-content")))
+            self.dom_wait.until(DC.visibility_of_element_located((By.ID, "checkout-personal-details-content")))
             logging.info("🕐 Order form is ready (new structure).")
         except:
             try:
-                self.wait.until(EC.visibility_of_element_located((By.ID, "checkout.personal_details_form.label_email")))
+                self.dom_wait.until(DC.visibility_of_element_located((By.ID, "checkout.personal_details_form.label_email")))
                 logging.info("🕐 Order form is ready (old structure).")
             except Exception as e:
                 logging.error(f"❌ Payment form not ready: {e}")
@@ -212,7 +261,7 @@ class FattalOrderPage:
             retries = 3
             for attempt in range(retries):
                 try:
-                    submit_btn = WebDriverWait(self.driver, 10).until(
+                    submit_btn = FattalWait(self.driver, 10).until(
                         EC.presence_of_element_located((By.ID, "submitBtn"))
                     )
                     logging.info(f" Found submit button on attempt {attempt + 1}")
@@ -257,6 +306,22 @@ class FattalOrderPage:
             logging.error(f"❌ Failed to expand special requests section: {e}")
             raise
 
+    def wait_for_payment_iframe_ready(self):
+        """Waits until the card fields inside paymentIframe can be filled, instead of a fixed sleep."""
+        try:
+            self.waits.payment_iframe_ready()
+        except TimeoutException:
+            logging.error("❌ Payment iframe did not become ready.")
+            raise
+
+    def fill_payment_card(self, card: dict) -> dict:
+        """Fills paymentIframe from a payment_card dict in one scripted call; returns the fill report."""
+        try:
+            return self.payment_form.fill(card)
+        except Exception as e:
+            logging.error(f"❌ Failed to fill payment form in iframe: {e}")
+            raise
+
     def switch_to_payment_iframe(self):
         try:
             self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, "paymentIframe")))
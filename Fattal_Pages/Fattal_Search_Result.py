@@ -1,15 +1,20 @@
 import logging
-import time
 
-from selenium.common import TimeoutException
+from selenium.common import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.Network_Idle import network_idle_for
 
 class FattalSearchResultPage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = FattalWait(driver, 15)
+        self.waits = FattalWaitPolicy(driver)
+        self.network_idle = network_idle_for(driver)
 
 
     SHOW_PRICES_BUTTONS = (By.XPATH, "//button[normalize-space()='הצג מחירים']")
@@ -24,8 +29,8 @@ class FattalSearchResultPage:
             logging.info("Waiting for room cards to fully load...")
 
             # Option 1: Wait for the skeleton placeholders to disappear (if class changes)
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_all_elements_located(self.ROOM_CARDS_LOADED)
+            FattalDomWait(self.driver, 30).until(
+                DC.presence_of_all_elements_located(self.ROOM_CARDS_LOADED)
             )
 
             logging.info("Room cards are loaded.")
@@ -38,11 +43,11 @@ class FattalSearchResultPage:
 
         for attempt in range(3):
             try:
-                show_buttons = WebDriverWait(self.driver, 20).until(
+                show_buttons = FattalWait(self.driver, 20).until(
                     EC.presence_of_all_elements_located(self.SHOW_PRICES_BUTTONS)
                 )
 
-                WebDriverWait(self.driver, 10).until(
+                FattalWait(self.driver, 10).until(
                     EC.element_to_be_clickable(self.SHOW_PRICES_BUTTONS)
                 )
 
@@ -52,7 +57,8 @@ class FattalSearchResultPage:
                 return
             except Exception as e:
                 logging.warning(f"Attempt {attempt + 1}: 'הצג מחירים' buttons not yet present or not clickable.")
-                time.sleep(5)
+                # Wait for the search/pricing requests to settle instead of a fixed pause
+                self.network_idle.wait_for_idle(cap=5, label="show prices retry")
 
         try:
             show_buttons = self.driver.find_elements(*self.SHOW_PRICES_BUTTONS)
@@ -93,14 +99,12 @@ class FattalSearchResultPage:
 
     def no_results_found(self) -> bool:
         try:
-            banner = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//h1[contains(text(),'לא נמצאו מלונות')]"))
-            )
-            if banner.is_displayed():
+            banners = self.waits.probe(By.XPATH, "//h1[contains(text(),'לא נמצאו מלונות')]")
+            if banners and banners[0].is_displayed():
                 logging.warning("No hotels matched the search.")
                 return True
             return False
-        except:
+        except StaleElementReferenceException:
             return False
 
     def click_book_room_button(self):
@@ -109,7 +113,7 @@ class FattalSearchResultPage:
 
             try:
                 # Try finding the 'להזמנת חדר' button for 20 seconds
-                button = WebDriverWait(self.driver, 20).until(
+                button = FattalWait(self.driver, 20).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'להזמנת חדר')]"))
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
@@ -120,7 +124,7 @@ class FattalSearchResultPage:
                 logging.warning("'להזמנת חדר' button not found after 20 seconds, trying alternative 'בחר חדר' link...")
 
                 # Try fallback 'בחר חדר' link
-                fallback_link = WebDriverWait(self.driver, 10).until(
+                fallback_link = FattalWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'בחר חדר')]"))
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", fallback_link)
@@ -134,26 +138,17 @@ class FattalSearchResultPage:
     def wait_for_prices_to_load(self):
         logging.info("Waiting for hotel details page to fully load...")
 
-        retries = 2
-        for attempt in range(retries):
-            try:
-                # Wait for the button with part of the ID (ignoring the dynamic 'NaN' part)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.XPATH, "//button[contains(@id, 'room-price-button')]"))
-                )
-                # Wait for visibility of the button
-                WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.XPATH, "//button[contains(@id, 'room-price-button')]"))
-                )
-                logging.info("'הצג מחירים' button is visible.")
-                return
-            except Exception as e:
-                logging.warning(f"Attempt {attempt + 1}/{retries} failed: {e}")
-                if attempt < retries - 1:
-                    logging.info("Retrying after short wait...")
-                else:
-                    logging.error(f"Timeout or stale element on last attempt: {e}")
-                    raise
+        try:
+            # Wait for the button with part of the ID (ignoring the dynamic 'NaN' part).
+            # Bounded by the pricing requests instead of two blind 30s attempts.
+            self.network_idle.until(
+                EC.visibility_of_element_located((By.XPATH, "//button[contains(@id, 'room-price-button')]")),
+                cap=60, label="room prices",
+            )
+            logging.info("'הצג מחירים' button is visible.")
+        except Exception as e:
+            logging.error(f"Timeout or stale element while waiting for prices: {e}")
+            raise
 
     def handle_no_search_results_and_choose_alternative(self):
         try:
@@ -186,9 +181,12 @@ class FattalSearchResultPage:
 
     def handle_search_flow_with_fallback(self, test):
         try:
-            # Check if "no results" fallback UI appears
-            no_results = self.driver.find_elements(By.CSS_SELECTOR, "div.sc-32916819-1.chtiXu")
-            if no_results:
+            # Wait for whichever page variant renders first — the fallback suggestions or real results
+            page_variant = self.waits.first_of({
+                "fallback": (By.CSS_SELECTOR, "div.sc-32916819-1.chtiXu"),
+                "results": (By.XPATH, "//button[starts-with(@id, 'room-price-button') or normalize-space()='הצג מחירים' or normalize-space()='להזמנת חדר']"),
+            }, "default")
+            if page_variant == "fallback":
                 logging.info("⚠️ No direct hotel results found — fallback path triggered.")
 
                 fallback_links = self.driver.find_elements(By.CSS_SELECTOR,
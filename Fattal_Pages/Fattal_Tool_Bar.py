@@ -1,19 +1,22 @@
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.common import TimeoutException, StaleElementReferenceException
 import logging
 
+from Fattal_Utils.Login_Session_Cache import login_with_session_cache
+from Fattal_Utils.Element_Snapshot import snapshot_all
+from Fattal_Utils.Wait_Policy import FattalWait
+
 class FattalToolBar:
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
+        self.wait = FattalWait(self.driver, 10)
 
     def logo_mainpage(self):
         """Try clicking the homepage logo, or fallback to reload."""
         try:
-            self.wait = WebDriverWait(self.driver, 5)
+            self.wait = FattalWait(self.driver, 5)
             logo = self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "a[href='/'] img"))
             )
@@ -64,7 +67,7 @@ class FattalToolBar:
 
     def personal_zone(self):
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = FattalWait(self.driver, 10)
 
             # 1️⃣ Try direct button with visible text (best case)
             try:
@@ -123,11 +126,10 @@ class FattalToolBar:
                 
         except Exception as e:
             logging.error(f"Failed to find ID input field: {e}")
-            # Last resort - try to find any visible input that might be the ID field
-            inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            for input_field in inputs:
-                if input_field.is_displayed() and "id" in input_field.get_attribute("id").lower():
-                    return input_field
+            # Last resort - any visible input that might be the ID field, from one snapshot
+            for state in snapshot_all(self.driver, (By.CSS_SELECTOR, "input[id*='id' i]")):
+                if state.visible:
+                    return state.element
             
             # If we got here, we couldn't find the field
             raise
@@ -150,11 +152,10 @@ class FattalToolBar:
                 
         except Exception as e:
             logging.error(f"Failed to find password input field: {e}")
-            # Last resort - try to find any password input
-            inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            for input_field in inputs:
-                if input_field.is_displayed() and input_field.get_attribute("type") == "password":
-                    return input_field
+            # Last resort - any visible password input, from one snapshot
+            for state in snapshot_all(self.driver, (By.CSS_SELECTOR, "input[type='password']")):
+                if state.visible:
+                    return state.element
             
             # If we got here, we couldn't find the field
             raise
@@ -260,3 +261,30 @@ class FattalToolBar:
 
     def more_element_list(self):
         return self.driver.find_elements(By.CSS_SELECTOR, 'body > div.sc-f2b8f215-4.krWrfJ > div.sc-3edcab97-4.kXLiBV > div.sc-3edcab97-5.gOMYYC > div > button:nth-child(7) > div.sc-3edcab97-11.HByCA')
+
+    def login_marker(self):
+        """Text of the personal-zone button — it changes once a club member is logged in."""
+        return self.driver.execute_script("""
+            const el = document.querySelector("button[aria-label='אזור אישי']") ||
+                       Array.from(document.querySelectorAll('header button'))
+                            .find(b => b.textContent.includes('אזור האישי') || b.textContent.includes('אזור אישי'));
+            return el ? (el.innerText + '|' + (el.getAttribute('aria-label') || '')).trim() : '';
+        """)
+
+    def club_login(self, user_id, password, post_login=None):
+        """
+        Logs a club member in, restoring a cached session when possible.
+        post_login runs after a UI login only (e.g. close_post_login_popup).
+        """
+        def ui_login():
+            self.personal_zone()
+            self.click_footer_login_with_id_and_password()
+            FattalWait(self.driver, 5).until(
+                EC.visibility_of(self.user_id_input())
+            ).send_keys(user_id)
+            self.user_password_input().send_keys(password)
+            self.login_button()
+            if post_login:
+                post_login()
+
+        return login_with_session_cache(self.driver, user_id, ui_login, self.login_marker)
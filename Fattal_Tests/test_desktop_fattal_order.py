@@ -1,11 +1,7 @@
-import json
 import traceback
 import unittest
-from selenium import webdriver
-from openpyxl.styles import  PatternFill
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from Fattal_Pages.Fattal_Main_Page import FattalMainPage
 from Fattal_Pages.Fattal_Tool_Bar import FattalToolBar
@@ -13,54 +9,56 @@ from Fattal_Pages.Fattal_Search_Result import FattalSearchResultPage
 from Fattal_Pages.Fattal_Order_Page_ISR import FattalOrderPage
 from Fattal_Pages.Fattal_Flight_OrderPage import FattalFlightOrderPage
 from Fattal_Pages.Fattal_Confirmation_Page import FattalConfirmPage
+from Fattal_Utils.Session_Pool import FattalSessionPool
+from Fattal_Utils.Driver_Factory import create_driver
+from Fattal_Utils.Dashboard import update_dashboard
+from Fattal_Utils.Artifact_Store import save_log
+from Fattal_Utils.Excel_Exporter import excel_exporter
+from Fattal_Utils.Results_Store import results_store
+from Fattal_Utils.Screenshot_Service import screenshot_exists, screenshot_service_for, thumbnail_path, wait_for_screenshots
+from Fattal_Utils.Result_Sink import append_order, compact_orders, result_sink_for
+from Fattal_Utils.Worker_Env import new_run_folder, shared_run_folder, worker_dir
+from Fattal_Utils.Network_Shaping import network_shaper_for
+from Fattal_Utils.Asset_Cache import asset_interceptor_for
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Network_Idle import network_idle_for
+from Fattal_Utils.Payment_Form import payment_form_for
+from Fattal_Utils.Wait_Policy import FattalWait, wait_stats_for
+from Fattal_Utils.Deep_Links import HOTEL_IDS
 import logging
 import platform
 from datetime import datetime
 import os
-from openpyxl import Workbook, load_workbook
 import io
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
 import sys
 from dotenv import load_dotenv
-from time import sleep
-HOTEL_NAME_TO_ID = {
-    "לאונרדו נגב, באר שבע": "10048",
-    "לאונרדו פלאזה אילת": "10038"
-}
 
 
 def save_order_for_cancellation(master_id, hotel_id, filepath="orders_to_cancel.json"):
-    import json
-    orders = []
-    if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            try:
-                orders = json.load(f)
-            except json.JSONDecodeError:
-                pass
-
-    orders.append({
+    # Queued with a locked append; tearDownClass moves the queue into filepath
+    append_order(filepath, {
         "masterID": master_id,
         "hotelID": hotel_id
     })
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(orders, f, ensure_ascii=False, indent=4)
 class FattalDesktopTests(unittest.TestCase):
+    @staticmethod
+    def build_driver():
+        return create_driver("desktop")
+
     @classmethod
     def setUpClass(cls):
         cls.run_folder, cls.run_id = cls.get_static_run_folder()
+        load_dotenv()
+        cls.session_pool = FattalSessionPool(
+            cls.build_driver,
+            size=int(os.getenv("DRIVER_POOL_SIZE", "1")),
+            start_url=os.getenv("ENV_ACTIVE"),
+        )
+        cls.session_pool.warm_up()
     def setUp(self):
         self.run_folder = self.__class__.run_folder
         load_dotenv()
 
-        options = webdriver.ChromeOptions()
-        options.add_argument("--force-device-scale-factor=0.75")
-        # options.add_argument("--headless")
-        # options.add_argument("--no-sandbox")
-        # options.add_argument("--disable-dev-shm-usage")
-
         self.test_start_time = datetime.now()
         self.log_stream = io.StringIO()
 
@@ -100,12 +98,20 @@ class FattalDesktopTests(unittest.TestCase):
         if hasattr(sys.stdout, "reconfigure"):
             sys.stdout.reconfigure(encoding="utf-8")
 
-        self.driver = webdriver.Chrome(options=options)
+        self.lease = self.__class__.session_pool.acquire()
+        self.driver = self.lease.driver
+        self.network_shaper = network_shaper_for(self.driver)
+        self.network_shaper.apply(allow=getattr(getattr(self, self._testMethodName), "network_allow", ()))
+        self.asset_cache = asset_interceptor_for(self.driver)
+        self.asset_cache.reset_counters()
+        self.popup_watchdog = popup_watchdog_for(self.driver)
+        self.popup_watchdog.reset()
+        self.network_idle = network_idle_for(self.driver)
+        self.network_idle.reset()
+        payment_form_for(self.driver).reset()
+        wait_stats_for(self.driver).reset()
         active_key = os.getenv("ENV_ACTIVE")
-        self.driver.get(active_key)
         logging.info(f"Opened environment URL: {active_key}")
-        self.driver.maximize_window()
-        self.driver.implicitly_wait(10)
         self.default_hotel_name = os.getenv("DEFAULT_HOTEL_NAME")
 
         # Page object setup
@@ -119,23 +125,10 @@ class FattalDesktopTests(unittest.TestCase):
         # Start performance marker
         self.driver.execute_script("window.performance.mark('selenium-start')")
     def save_test_result_to_run_json(self, info: dict, run_folder: str):
-        # 🔐 Ensure the folder exists
-        os.makedirs(run_folder, exist_ok=True)
-
-        json_path = os.path.join(run_folder, "run_data.json")
-
-        if os.path.exists(json_path):
-            with open(json_path, "r", encoding="utf-8") as f:  # type: TextIO
-                data = json.load(f)
-        else:
-            data = []
-
-        data.append(info)
-
-        with open(json_path, "w", encoding="utf-8") as f:  # type: TextIO
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        logging.info(f"📄 Saved test result to: {json_path}")
+        # One locked append to this process's segment; run_data.json is compacted in tearDownClass
+        sink = result_sink_for(run_folder)
+        sink.append(info)
+        logging.info(f"📄 Saved test result to: {sink.segment}")
     def soft_assert(self, condition, msg, errors_list):
         try:
             assert condition, msg
@@ -144,12 +137,11 @@ class FattalDesktopTests(unittest.TestCase):
 
     @classmethod
     def get_static_run_folder(cls):
-        base_path = os.path.join(os.path.dirname(__file__), 'html_reports', 'runs')
-        os.makedirs(base_path, exist_ok=True)
-        now = datetime.now().strftime("run_%Y-%m-%d_%H-%M-%S")
-        run_folder = os.path.join(base_path, now)
-        os.makedirs(run_folder, exist_ok=True)
-        return run_folder, now
+        # Parallel workers all write into the one run folder the runner created
+        shared = shared_run_folder()
+        if shared:
+            return shared
+        return new_run_folder(os.path.join(os.path.dirname(__file__), 'html_reports', 'runs'))
 
     @staticmethod
     def get_current_run_folder(cls=None):
@@ -162,246 +154,9 @@ class FattalDesktopTests(unittest.TestCase):
 
     @staticmethod
     @staticmethod
-    def generate_dashboard_html(runs_base_dir: str):
-        import os
-        import json
-        from datetime import datetime
-        import logging
-
-        dashboard_path = os.path.join(runs_base_dir, "..", "dashboard.html")
-        run_dirs = sorted(
-            [d for d in os.listdir(runs_base_dir) if d.startswith("run_")],
-            reverse=True
-        )
-
-        run_data_js_entries = []
-        select_html_entries = []
-
-        for i, run_dir in enumerate(run_dirs):
-            json_path = os.path.join(runs_base_dir, run_dir, "run_data.json")
-            if not os.path.exists(json_path):
-                continue
-
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                run_data_js_entries.append(f'"{run_dir}": {json.dumps(data, ensure_ascii=False)}')
-
-                total = len(data)
-                failed = sum(1 for t in data if t.get("status") == "FAILED")
-                passed = total - failed
-                mobile = sum(1 for t in data if t.get("test_type") == "mobile")
-                desktop = sum(1 for t in data if t.get("test_type") == "desktop")
-
-                run_timestamp_str = run_dir.replace("run_", "")  # e.g., '2025-06-17_14-33-12'
-                run_datetime = datetime.strptime(run_timestamp_str, "%Y-%m-%d_%H-%M-%S")
-                day_label = run_datetime.strftime("%A")
-                datetime_label = run_datetime.strftime("%Y-%m-%d %H:%M:%S")
-
-                label = f"{day_label} {datetime_label} | {total} tests | ✅ {passed} | ❌ {failed}"
-                if mobile:
-                    label += f" | 📱 {mobile}"
-                if desktop:
-                    label += f" | 💻 {desktop}"
-
-                selected = "selected" if i == 0 else ""
-                select_html_entries.append(f'<option value="{run_dir}" {selected}>{label}</option>')
-
-        run_data_js = "{\n" + ",\n".join(run_data_js_entries) + "\n}"
-        select_html = "\n".join(select_html_entries)
-
-        script = f"""
-            <script>
-            const runData = {run_data_js};
-
-            function populateRun(runId) {{
-                const container = document.getElementById("results");
-                container.innerHTML = "";
-                const showPassed = document.getElementById("filterPassed").checked;
-                const showFailed = document.getElementById("filterFailed").checked;
-                const data = runData[runId] || [];
-                data.forEach(test => {{
-                    if ((test.status === "PASSED" && !showPassed) || (test.status === "FAILED" && !showFailed)) return;
-
-                    const div = document.createElement("div");
-                    div.classList.add("test-entry");
-                    const screenshots = ["room_selection", "payment_stage", test.status === "FAILED" ? "error_screenshot" : "confirmation_screenshot"]
-                      .map(label => {{
-                          const path = test[label] || "";
-                          if (!path) return "";
-                          const short = path.split(/[/\\\\]/).pop();
-                          return `<div><strong>${{label}}:</strong><br><img src="../Screenshots/${{short}}" style="max-height:120px;cursor:pointer;" onclick="openModal(this.src)" /></div>`;
-                      }}).join("");
-
-                    // ---- Log path robust logic ----
-                    const logPath = test.log || "";
-                    let logHref = "#";
-                    if (logPath) {{
-                      let parts = logPath.replace(/\\\\/g, '/').split('/');
-                      if (parts.length >= 2) {{
-                        logHref = "../" + parts.slice(-2).join('/');
-                      }} else {{
-                        logHref = logPath;
-                      }}
-                    }}
-                    // --------------------------------
-
-                    div.innerHTML = `
-                      <h3>${{test.name}} — <span style="color:${{test.status === 'PASSED' ? 'green' : 'red'}}">${{test.status}}</span></h3>
-                      <p><strong>Description:</strong> ${{test.description || "—"}}</p>
-                      <p><strong>Timestamp:</strong> ${{test.timestamp}} | <strong>Duration:</strong> ${{test.duration}}</p>
-                      <p><strong>Guest:</strong> ${{test.full_name}} | <strong>Email:</strong> ${{test.email}}</p>
-                      <p><strong>Order #:</strong> ${{test.order_number}} | <strong>ID:</strong> ${{test.id_number}}</p>
-                      <p><strong>Log:</strong> <a href="${{logHref}}" target="_blank">${{logPath.split(/[\\\\/]/).pop()}}</a></p>
-                      ${{test.error ? `<p style='color:red'><strong>Error:</strong> ${{test.error}}</p>` : ""}}
-                      <div class="screenshot-grid">${{screenshots}}</div>
-                      <hr>`;
-                    container.appendChild(div);
-                }});
-            }}
-
-            function openModal(src) {{
-                const modal = document.getElementById("screenshotModal");
-                const modalImg = document.getElementById("modalImage");
-                modal.style.display = "block";
-                modalImg.src = src;
-            }}
-
-            function closeModal() {{
-                document.getElementById("screenshotModal").style.display = "none";
-            }}
-            </script>
-            """
-
-        html = f"""<!DOCTYPE html>
-        <html>
-        <head>
-          <meta charset="UTF-8">
-          <title>🧪 Fattal Run Selector Dashboard</title>
-          <style>
-            body {{
-              font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-              background-color: #f9f9f9;
-              margin: 20px;
-              color: #333;
-            }}
-            .dashboard-header {{
-              display: flex;
-              align-items: center;
-              justify-content: space-between;
-              margin-bottom: 10px;
-              gap: 24px;
-            }}
-            .dashboard-header h1 {{
-              margin: 0;
-              font-size: 1.8em;
-              display: flex;
-              align-items: center;
-              white-space: nowrap;
-            }}
-            .dashboard-header h1::before {{
-              content: '🧪';
-              margin-right: 10px;
-            }}
-            .header-logo {{
-              height: 60px;
-              max-width: 200px;
-              object-fit: contain;
-              border-radius: 8px;
-              background: #fff;
-              padding: 6px 12px;
-              box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-            }}
-            @media (max-width: 700px) {{
-              .dashboard-header {{
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 8px;
-              }}
-              .header-logo {{
-                margin-left: 0;
-                margin-top: 6px;
-                height: 44px;
-                max-width: 150px;
-              }}
-            }}
-            select {{
-              font-size: 14px;
-              padding: 5px;
-              margin-left: 10px;
-            }}
-            .test-entry {{
-              background: #fff;
-              border-radius: 6px;
-              padding: 15px;
-              margin-bottom: 20px;
-              box-shadow: 0 1px 4px rgba(0,0,0,0.1);
-              transition: background 0.3s ease;
-            }}
-            .test-entry:hover {{
-              background: #f0f8ff;
-            }}
-            .screenshot-grid {{
-              display: flex;
-              gap: 12px;
-              margin-top: 10px;
-              flex-wrap: wrap;
-            }}
-            .screenshot-grid img {{
-              border-radius: 4px;
-              border: 1px solid #ccc;
-            }}
-            .modal {{
-              display: none;
-              position: fixed;
-              z-index: 999;
-              left: 0; top: 0; width: 100%; height: 100%;
-              background-color: rgba(0,0,0,0.85);
-            }}
-            .modal-content {{
-              margin: 5% auto;
-              display: block;
-              max-width: 90vw;
-              max-height: 80vh;
-            }}
-            .close {{
-              position: absolute;
-              top: 15px;
-              right: 35px;
-              color: #fff;
-              font-size: 40px;
-              font-weight: bold;
-              cursor: pointer;
-            }}
-          </style>
-          {script}
-        </head>
-        <body onload="populateRun(document.getElementById('runSelect').value)">
-          <div class="dashboard-header">
-            <h1>Fattal Run Selector Dashboard</h1>
-            <img src="https://d2nyvxq412w7ra.cloudfront.net/_fcb5f25e78.png" alt="Fattal Logo" class="header-logo" />
-          </div>
-          <label>Choose Run:
-            <select id="runSelect" onchange="populateRun(this.value)">
-              {select_html}
-            </select>
-          </label>
-          <div style="margin-top: 10px;">
-            <label><input type="checkbox" id="filterPassed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Passed</label>
-            <label><input type="checkbox" id="filterFailed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Failed</label>
-          </div>
-          <div id="results" style="margin-top: 20px;"></div>
-          <div id="screenshotModal" class="modal" onclick="closeModal()">
-            <span class="close">&times;</span>
-            <img class="modal-content" id="modalImage">
-          </div>
-        </body>
-        </html>"""
-
-        os.makedirs(os.path.dirname(dashboard_path), exist_ok=True)
-        with open(dashboard_path, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        logging.info(f"✅ Dashboard generated at: {dashboard_path}")
+    def generate_dashboard_html(runs_base_dir: str, run_folder: str = None):
+        # Rewrites only run_folder's data and manifest entry (see Fattal_Utils/Dashboard.py)
+        update_dashboard(runs_base_dir, run_folder)
 
     def confirm_and_assert_order(self):
         # Ensure confirmation_result is assigned before checking it
@@ -443,7 +198,7 @@ class FattalDesktopTests(unittest.TestCase):
 
             # Wait and verify results
             try:
-                WebDriverWait(self.driver, 15).until_not(
+                FattalWait(self.driver, 15).until_not(
                     EC.presence_of_element_located((By.ID, "search-page-no-search-results-title"))
                 )
                 logging.info("Flight results appeared after retry.")
@@ -479,8 +234,7 @@ class FattalDesktopTests(unittest.TestCase):
         log_file_path = os.path.join(logs_dir, f"{test_method}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
 
         try:
-            with open(log_file_path, "w", encoding="utf-8") as f:
-                f.write(log_summary)
+            log_file_path = save_log(log_summary, log_file_path)
             logging.info(f"[LOG DEBUG] Written log to {log_file_path}")
         except Exception as e:
             logging.error(f"[LOG DEBUG] Failed to write log: {e}")
@@ -527,10 +281,18 @@ class FattalDesktopTests(unittest.TestCase):
         # ── Final Info Dictionary ──
         test_info = {
             "name": test_method,
+            "test_id": self.id(),
             "description": getattr(self, "test_description", "No description provided"),
             "status": "FAILED" if has_failed else "PASSED",
             "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             "duration": f"{duration:.2f}s",
+            **self.lease.timing(),
+            **self.network_shaper.stats(),
+            **self.asset_cache.stats(),
+            **self.popup_watchdog.stats(),
+            **self.network_idle.stats(),
+            **payment_form_for(self.driver).stats(),
+            **wait_stats_for(self.driver).stats(),
             "browser": browser,
             "os": os_name,
             "full_name": f"{getattr(self, 'entered_first_name', '')} {getattr(self, 'entered_last_name', '')}".strip(),
@@ -556,105 +318,26 @@ class FattalDesktopTests(unittest.TestCase):
         self.save_to_excel(test_info)
         self.save_test_result_to_run_json(test_info, self.run_folder)
 
+        try:
+            results_store().record(test_info, self.run_id, log_text=self.log_stream.getvalue(), run_folder=self.run_folder)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not write the result to the results database: {e}")
+
     def take_stage_screenshot(self, label: str):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
         try:
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f"📸 Screenshot '{label}' saved at: {filename}")
             setattr(self, f"screenshot_{label}", filename)  # Dynamically track it
         except Exception as e:
             logging.warning(f"❌ Could not take screenshot for '{label}': {e}")
 
     def save_to_excel(self, info: dict):
-        SCREENSHOT_LABEL = "📷 Screenshot"
-        LOG_LABEL = "🧾 Log File"
-        parent_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        filename = os.path.join(parent_folder, "TestResults.xlsx")
-
-        try:
-            if not os.path.exists(filename):
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Test Results"
-                ws.append([
-                    "Test Name", "Order Number", "ID Number", "Description", "Status",
-                    "Timestamp", "Duration", "Browser", "OS", "Full Name", "Email",
-                    "Room Screenshot", "Payment Screenshot", "Confirmation Screenshot", "Log File"
-                ])
-            else:
-                wb = load_workbook(filename)
-                ws = wb.active
-
-            status = "FAILED" if info.get("error") else "PASSED"
-
-            row = [
-                info.get("name", ""),
-                info.get("order_number", ""),
-                info.get("id_number", ""),
-                info.get("description", ""),
-                status,
-                info.get("timestamp", ""),
-                info.get("duration", ""),
-                info.get("browser", ""),
-                info.get("os", ""),
-                info.get("full_name", ""),
-                info.get("email", ""),
-                getattr(self, "screenshot_room_selection", ""),
-                getattr(self, "screenshot_payment_stage", ""),
-                info.get("confirmation_screenshot" if info.get("status") == "PASSED" else "error_screenshot", ""),
-                info.get("log", "")
-            ]
-            ws.append(row)
-            row_num = ws.max_row
-
-            # 🎨 Color row based on result
-            red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-            green_fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-            row_fill = red_fill if status == "FAILED" else green_fill
-
-            for col_idx in range(1, 16):  # Columns A to O (1-15)
-                ws.cell(row=row_num, column=col_idx).fill = row_fill
-
-            # 📎 Hyperlink screenshots with label
-            for col_idx in [12, 13, 14]:
-                screenshot_path = row[col_idx - 1]
-                if screenshot_path and os.path.exists(screenshot_path):
-                    cell = ws.cell(row=row_num, column=col_idx)
-                    cell.value = SCREENSHOT_LABEL
-                    cell.hyperlink = f"file:///{screenshot_path.replace(os.sep, '/')}"
-                    cell.font = Font(color="0000EE", underline="single")
-
-            # 📎 Hyperlink log file with label
-            log_path = info.get("log", "")
-            if log_path and os.path.exists(log_path):
-                cell = ws.cell(row=row_num, column=15)
-                cell.value = LOG_LABEL
-                cell.hyperlink = f"file:///{log_path.replace(os.sep, '/')}"
-                cell.font = Font(color="0000EE", underline="single")
-
-            # ↔️ Auto-fit column widths
-            for col in ws.columns:
-                max_length = 0
-                col_letter = get_column_letter(col[0].column)
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except Exception as e:
-                        logging.warning(f"Column resize error: {e}")
-                ws.column_dimensions[col_letter].width = max_length + 5
-
-            wb.save(filename)
-            logging.info(f"Excel file saved at: {filename}")
-
-        except PermissionError as e:
-            logging.warning(f"Excel file is open or locked: {e}")
-        except Exception as e:
-            logging.error(f"Failed to save Excel file: {e}")
+        # Buffered; written to TestResults_<month>.xlsx once, in tearDownClass (see Fattal_Utils/Excel_Exporter.py)
+        excel_exporter().add(
+            info, getattr(self, "screenshot_room_selection", ""), getattr(self, "screenshot_payment_stage", "")
+        )
 
     def save_to_html(self, info: dict):
         html_dir = os.path.join(self.base_dir, "html_reports")
@@ -663,9 +346,10 @@ class FattalDesktopTests(unittest.TestCase):
         dashboard_path = os.path.join(html_dir, "TestDashboard.html")
 
         def image_tag(path):
-            if path and os.path.exists(path):
+            if screenshot_exists(path):
                 rel_path = os.path.relpath(path, start=html_dir).replace(os.sep, '/')
-                return f'<img src="{rel_path}" onclick="openModal(this.src)" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
+                thumb_path = os.path.relpath(thumbnail_path(path), start=html_dir).replace(os.sep, '/')
+                return f'<img src="{thumb_path}" onerror="this.onerror=null;this.src=\'{rel_path}\'" onclick="openModal(\'{rel_path}\')" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
             return "<em>No screenshot</em>"
 
         room_img = image_tag(getattr(self, 'screenshot_room_selection', ''))
@@ -865,12 +549,9 @@ class FattalDesktopTests(unittest.TestCase):
     """)
 
     def take_confirmation_screenshot(self, test_method, status):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
-        self.driver.save_screenshot(filename)
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+        filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
         logging.info(f"Confirmation screenshot saved at: {filename}")
         return filename
 
@@ -884,23 +565,13 @@ class FattalDesktopTests(unittest.TestCase):
         """
             Fills in credit card payment form fields from self.payment_card inside iframe context.
         """
-        self.order_page.switch_to_payment_iframe()
-        self.order_page.set_cardholder_name(self.payment_card["cardholder_name"])
-        self.order_page.set_card_number(self.payment_card["card_number"])
-        self.order_page.select_expiry_month(self.payment_card["expiry_month"])
-        self.order_page.select_expiry_year(self.payment_card["expiry_year"])
-        self.order_page.set_cvv(self.payment_card["cvv"])
-        self.order_page.set_id_number_card(self.payment_card["id_number"])
-        self.order_page.switch_to_default_content()
+        return self.order_page.fill_payment_card(self.payment_card)
 
     def take_screenshot(self, test_method_name):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{test_method_name}_{timestamp}.png"
-        )
-        self.driver.save_screenshot(filename)
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{test_method_name}_{timestamp}"
+        filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
         logging.error(f" Screenshot taken: {filename}")
 
     def retry_search_if_no_results(self, hotel_name, adults, children, infants):
@@ -918,7 +589,7 @@ class FattalDesktopTests(unittest.TestCase):
 
             self.toolbar.logo_mainpage()
 
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "main-input"))
             )
 
@@ -928,7 +599,7 @@ class FattalDesktopTests(unittest.TestCase):
             self.main_page.search_button()
 
             try:
-                WebDriverWait(self.driver, 15).until_not(
+                FattalWait(self.driver, 15).until_not(
                     EC.presence_of_element_located((By.ID, "search-page-no-search-results-title"))
                 )
                 logging.info("Hotel results appeared after retry.")
@@ -954,14 +625,13 @@ class FattalDesktopTests(unittest.TestCase):
         self.entered_last_name = guest["last_name"]
         self.entered_phone = guest["phone"]
 
-        self.order_page.set_email(self.entered_email)
-        self.order_page.set_phone(self.entered_phone)
-        self.order_page.set_first_name(self.entered_first_name)
-        self.order_page.set_last_name(self.entered_last_name)
-        self.order_page.set_id_number(random_id)
+        self.order_page.fill_guest_form(
+            email=self.entered_email, phone=self.entered_phone,
+            first_name=self.entered_first_name, last_name=self.entered_last_name, id_number=random_id,
+        )
 
         self.order_page.click_terms_approval_checkbox_js()
-        sleep(10)
+        self.order_page.wait_for_payment_iframe_ready()
         self.order_page.expand_special_requests_section()
         textarea = self.order_page.get_special_request_textarea()
         textarea.send_keys("בדיקת טסט נא לבטל")
@@ -984,7 +654,7 @@ class FattalDesktopTests(unittest.TestCase):
             raise
 
         try:
-            WebDriverWait(self.driver, 25).until(
+            FattalWait(self.driver, 25).until(
                 EC.visibility_of_element_located(
                     (By.XPATH, "//h1[contains(text(), 'אישור') or contains(text(), 'תודה')]"))
             )
@@ -1012,11 +682,10 @@ class FattalDesktopTests(unittest.TestCase):
         self.take_stage_screenshot("payment_stage")
 
         guest = self.default_guest
-        self.order_page.set_email(guest["email"])
-        self.order_page.set_phone(guest["phone"])
-        self.order_page.set_first_name(guest["first_name"])
-        self.order_page.set_last_name(guest["last_name"])
-        self.order_page.set_id_number(random_id)
+        self.order_page.fill_guest_form(
+            email=guest["email"], phone=guest["phone"],
+            first_name=guest["first_name"], last_name=guest["last_name"], id_number=random_id,
+        )
 
         self.entered_email = guest["email"]
         self.entered_first_name = guest["first_name"]
@@ -1025,7 +694,7 @@ class FattalDesktopTests(unittest.TestCase):
         self.order_page.click_terms_approval_checkbox_js()
         self.order_page.expand_special_requests_section()
         textarea = self.order_page.get_special_request_textarea()
-        sleep(10)
+        self.order_page.wait_for_payment_iframe_ready()
         self.order_page.click_terms_approval_checkbox_js()
         textarea.send_keys("בדיקת טסט נא לבטל")
         self.fill_payment_details()
@@ -1061,18 +730,17 @@ class FattalDesktopTests(unittest.TestCase):
 
         guest = self.default_guest
 
-        self.order_page.set_email(guest["email"])
-        self.order_page.set_phone(guest["phone"])
-        self.order_page.set_first_name(guest["first_name"])
-        self.order_page.set_last_name(guest["last_name"])
-        self.order_page.set_id_number(random_id)
+        self.order_page.fill_guest_form(
+            email=guest["email"], phone=guest["phone"],
+            first_name=guest["first_name"], last_name=guest["last_name"], id_number=random_id,
+        )
 
         self.entered_email = guest["email"]
         self.entered_first_name = guest["first_name"]
         self.entered_last_name = guest["last_name"]
 
         self.order_page.click_terms_approval_checkbox_js()
-        sleep(10)
+        self.order_page.wait_for_payment_iframe_ready()
         self.order_page.expand_special_requests_section()
 
         textarea = self.order_page.get_special_request_textarea()
@@ -1170,14 +838,7 @@ class FattalDesktopTests(unittest.TestCase):
                 if CLOSE_WAR_POPUP == 1:
                     self.mobile_main_page.close_war_popup()
             try:
-                self.toolbar.personal_zone()
-                self.toolbar.click_footer_login_with_id_and_password()
-                WebDriverWait(self.driver, 5).until(
-                    EC.visibility_of(self.toolbar.user_id_input())
-                ).send_keys("999318330")
-                self.toolbar.user_password_input().send_keys("Aa123456")
-                self.toolbar.login_button()
-                self.main_page.close_post_login_popup()
+                self.toolbar.club_login("999318330", "Aa123456", post_login=self.main_page.close_post_login_popup)
                 logging.info("Logged in to club account successfully.")
             except Exception as e:
                 logging.warning(f"Login failed: {e}")
@@ -1291,14 +952,7 @@ class FattalDesktopTests(unittest.TestCase):
             if CLOSE_WAR_POPUP == 1:
                 self.mobile_main_page.close_war_popup()
         try:
-            self.toolbar.personal_zone()
-            self.toolbar.click_footer_login_with_id_and_password()
-            WebDriverWait(self.driver, 5).until(
-                EC.visibility_of(self.toolbar.user_id_input())
-            ).send_keys("999318330")
-            self.toolbar.user_password_input().send_keys("Aa123456")
-            self.toolbar.login_button()
-            self.main_page.close_post_login_popup()
+            self.toolbar.club_login("999318330", "Aa123456", post_login=self.main_page.close_post_login_popup)
             logging.info("Logged in to club account successfully.")
         except Exception as e:
             logging.warning(f"Login failed: {e}")
@@ -1321,21 +975,19 @@ class FattalDesktopTests(unittest.TestCase):
         self.take_stage_screenshot("payment_stage")
 
         guest = self.default_guest
-        self.order_page.set_email(guest["email"])
-        self.order_page.set_phone(guest["phone"])
-        self.order_page.set_first_name(guest["first_name"])
-        self.order_page.set_last_name(guest["last_name"])
-
         random_id = self.order_page.generate_israeli_id()
         self.entered_id_number = random_id
-        self.order_page.set_id_number(random_id)
+        self.order_page.fill_guest_form(
+            email=guest["email"], phone=guest["phone"],
+            first_name=guest["first_name"], last_name=guest["last_name"], id_number=random_id,
+        )
 
         self.entered_email = guest["email"]
         self.entered_first_name = guest["first_name"]
         self.entered_last_name = guest["last_name"]
 
         self.order_page.click_terms_approval_checkbox_js()
-        sleep(10)
+        self.order_page.wait_for_payment_iframe_ready()
         self.order_page.expand_special_requests_section()
         textarea = self.order_page.get_special_request_textarea()
         textarea.send_keys("בדיקת טסט נא לבטל")
@@ -1358,9 +1010,17 @@ class FattalDesktopTests(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        cls.session_pool.close()
+        wait_for_screenshots()
+        excel_exporter().flush()
+        try:
+            result_sink_for(cls.run_folder).compact()
+            compact_orders("orders_to_cancel.json")
+        except Exception as e:
+            logging.warning(f"⚠️ Failed to compact run results: {e}")
         try:
             runs_base_dir = os.path.join(os.path.dirname(__file__), "html_reports", "runs")
-            cls.generate_dashboard_html(runs_base_dir)
+            cls.generate_dashboard_html(runs_base_dir, cls.run_folder)
             logging.info("✅ Dashboard generated once at the end of test suite.")
         except Exception as e:
             logging.warning(f"⚠️ Failed to generate dashboard in tearDownClass: {e}")
@@ -1377,7 +1037,7 @@ class FattalDesktopTests(unittest.TestCase):
                 try:
                     confirmation = getattr(self, "confirmation_result", {})
                     order_number = confirmation.get("order_number")
-                    hotel_id = HOTEL_NAME_TO_ID.get(self.default_hotel_name)
+                    hotel_id = HOTEL_IDS.get(self.default_hotel_name)
                     if getattr(self, "save_for_cancellation", False) and order_number and hotel_id:
                         save_order_for_cancellation(order_number, hotel_id)
                         logging.info(f"✅ Saved order {order_number} for cancellation.")
@@ -1399,12 +1059,8 @@ class FattalDesktopTests(unittest.TestCase):
             except Exception as e:
                 logging.warning(f"⚠️ Logging failed during tearDown: {e}")
 
-            logging.info("⌛ Waiting 2 seconds before closing browser...")
-            logging.info("🔚 Closing browser (tearDown).")
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logging.warning(f"⚠️ Browser quit failed: {e}")
+            logging.info("🔚 Returning browser to the session pool (tearDown).")
+            self.__class__.session_pool.release(self.driver)
 
         # 🧾 Generate the HTML dashboard
         try:
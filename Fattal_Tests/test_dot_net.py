@@ -3,10 +3,7 @@ import logging
 import sys
 import time
 import traceback
-from openpyxl.styles import PatternFill
-from time import sleep
 import unittest
-from selenium import webdriver
 import functools
 
 from selenium.common import TimeoutException
@@ -20,22 +17,27 @@ from Mobile_Fattal_Pages.Mobile_Fattal_ConfirmPage import FattalMobileConfirmPag
 from Mobile_Fattal_Pages.Mobile_Fattal_Deals_Packages import FattalDealsPageMobile
 from Mobile_Fattal_Pages.Mobile_Fattal_Customer_Contact_Page import FattalMobileCustomerSupport
 from Mobile_Fattal_Pages.Mobile_Fattal_Join_Club_Page import FattalMobileClubJoinPage
+from Fattal_Utils.Session_Pool import FattalSessionPool
+from Fattal_Utils.Driver_Factory import create_driver
+from Fattal_Utils.Artifact_Store import save_log
+from Fattal_Utils.Excel_Exporter import excel_exporter
+from Fattal_Utils.Results_Store import results_store
+from Fattal_Utils.Screenshot_Service import screenshot_exists, screenshot_service_for, thumbnail_path, wait_for_screenshots
+from Fattal_Utils.Result_Sink import append_order, compact_orders
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Network_Shaping import network_shaper_for
+from Fattal_Utils.Asset_Cache import asset_interceptor_for
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Network_Idle import network_idle_for
+from Fattal_Utils.Payment_Form import payment_form_for
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy, wait_stats_for
+from Fattal_Utils.Deep_Links import HOTEL_IDS
 from datetime import datetime
 import os
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
-from selenium.webdriver.support.ui import Select
 from dotenv import load_dotenv
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-HOTEL_NAME_TO_ID = {
-    "לאונרדו נגב, באר שבע": "10048",
-    "לאונרדו פלאזה אילת": "1051"
-}
-
 
 def retry_on_no_results(max_attempts=2):
     """
@@ -73,14 +75,12 @@ def retry_on_no_results(max_attempts=2):
 
 class FattalMobileTests(unittest.TestCase):
     def save_order_for_cancellation(self, order_number: str):
-        import json
-
         try:
             if not order_number:
                 logging.warning("Order number is empty, not saving for cancellation.")
                 return
 
-            hotel_id = HOTEL_NAME_TO_ID.get(self.default_hotel_name, "UNKNOWN")
+            hotel_id = HOTEL_IDS.get(self.default_hotel_name, "UNKNOWN")
 
             order_entry = {
                 "masterID": str(order_number),
@@ -91,29 +91,37 @@ class FattalMobileTests(unittest.TestCase):
             current_dir = os.path.dirname(os.path.abspath(__file__))
             cancel_file = os.path.join(current_dir, "orders_to_cancel.json")
 
-            if os.path.exists(cancel_file):
-                try:
-                    with open(cancel_file, "r", encoding="utf-8") as f:
-                        existing_orders = json.load(f)
-                        if not isinstance(existing_orders, list):
-                            logging.warning("⚠️ JSON file does not contain a list. Resetting it.")
-                            existing_orders = []
-                except Exception as e:
-                    logging.warning(f"⚠️ JSON file invalid — starting fresh. ({e})")
-                    existing_orders = []
-            else:
-                existing_orders = []
-
-            existing_orders.append(order_entry)
-
-            with open(cancel_file, "w", encoding="utf-8") as f:
-                json.dump(existing_orders, f, indent=2, ensure_ascii=False)
+            append_order(cancel_file, order_entry)
 
             logging.info(f"✅ Saved order {order_number} for cancellation (JSON included).")
 
         except Exception as e:
             logging.warning(f"⚠️ Could not save order for cancellation: {e}")
 
+    @staticmethod
+    def build_driver():
+        return create_driver("android")
+
+    @classmethod
+    def setUpClass(cls):
+        load_dotenv()
+        cls.session_pool = FattalSessionPool(
+            cls.build_driver,
+            size=int(os.getenv("DRIVER_POOL_SIZE", "1")),
+            start_url=os.getenv("ENV_ACTIVE"),
+        )
+        cls.session_pool.warm_up()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session_pool.close()
+        wait_for_screenshots()
+        excel_exporter().flush()
+        try:
+            compact_orders(os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders_to_cancel.json"))
+        except Exception as e:
+            logging.warning(f"⚠️ Failed to compact orders to cancel: {e}")
+
     def setUp(self):
         load_dotenv()
         self.log_stream = io.StringIO()
@@ -132,37 +140,21 @@ class FattalMobileTests(unittest.TestCase):
 
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
 
-        # Use a valid built-in Chrome emulation device (Pixel 2)
-        mobile_emulation = {
-            "deviceMetrics": {"width": 411, "height": 800, "pixelRatio": 3.0},
-            "userAgent": "Mozilla/5.0 (Linux; Android 10; Pixel 2 XL) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Mobile Safari/537.36"
-        }
-
-        options = webdriver.ChromeOptions()
-        options.add_experimental_option("mobileEmulation", mobile_emulation)
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        # options.add_argument("--disable-infobars")
-        # options.add_argument("--headless")
-        # options.add_argument("--no-sandbox")
-        # options.add_argument("--disable-dev-shm-usage")
-
-        self.driver = webdriver.Chrome(options=options)
-
-        # Override window size manually to make it taller 📸
-        # Pixel 2 is normally 411x731, so let's go 411x1200
-        self.driver.set_window_rect(x=620, y=0, width=411, height=950)
-
+        self.lease = self.__class__.session_pool.acquire()
+        self.driver = self.lease.driver
+        self.network_shaper = network_shaper_for(self.driver)
+        self.network_shaper.apply(allow=getattr(getattr(self, self._testMethodName), "network_allow", ()))
+        self.asset_cache = asset_interceptor_for(self.driver)
+        self.asset_cache.reset_counters()
+        self.popup_watchdog = popup_watchdog_for(self.driver)
+        self.popup_watchdog.reset()
+        self.network_idle = network_idle_for(self.driver)
+        self.network_idle.reset()
+        payment_form_for(self.driver).reset()
+        wait_stats_for(self.driver).reset()
         self.test_start_time = datetime.now()
-        self.driver.implicitly_wait(10)
 
-        # Optional — force touch emulation for some mobile interactions
-        self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {
-            "enabled": True,
-            "configuration": "mobile"
-        })
         active_key = os.getenv("ENV_ACTIVE")
-        self.driver.get(active_key)
         logging.info(f"Opened environment URL: {active_key}")
         # Load defaults from .env
         self.default_guest = {
@@ -220,8 +212,7 @@ class FattalMobileTests(unittest.TestCase):
         os.makedirs(logs_dir, exist_ok=True)
         log_file = os.path.join(logs_dir, f"{test_method}_{datetime.now():%Y-%m-%d_%H-%M-%S}.log")
         try:
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write(self.log_stream.getvalue())
+            log_file = save_log(self.log_stream.getvalue(), log_file)
         except Exception as e:
             logging.warning(f"[MOBILE] Could not write log file: {e}")
 
@@ -254,10 +245,18 @@ class FattalMobileTests(unittest.TestCase):
         status = "FAILED" if has_failed else "PASSED"
         info = {
             "name": test_method,
+            "test_id": self.id(),
             "description": getattr(self, "test_description", ""),
             "status": status,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "duration": f"{duration:.2f}s",
+            **self.lease.timing(),
+            **self.network_shaper.stats(),
+            **self.asset_cache.stats(),
+            **self.popup_watchdog.stats(),
+            **self.network_idle.stats(),
+            **payment_form_for(self.driver).stats(),
+            **wait_stats_for(self.driver).stats(),
             "browser": "unknown",  # Update if needed
             "os": "unknown",  # Update if needed
             "full_name": f"{getattr(self, 'entered_first_name', '')} {getattr(self, 'entered_last_name', '')}".strip(),
@@ -267,7 +266,8 @@ class FattalMobileTests(unittest.TestCase):
             "confirmation_screenshot": confirmation_screenshot,
             "error_screenshot": error_screenshot,
             "log": log_file,
-            "error": error_msg if has_failed else ""
+            "error": error_msg if has_failed else "",
+            "test_type": "mobile"
         }
 
         # Log soft assertion errors if they exist
@@ -280,92 +280,16 @@ class FattalMobileTests(unittest.TestCase):
         self.save_to_excel(info)
         self.save_to_html(info)
 
-    def save_to_excel(self, info: dict):
-        SCREENSHOT_LABEL = "📷 Screenshot"
-        LOG_LABEL = "🧾 Log File"
-        parent_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        filename = os.path.join(parent_folder, "TestResults.xlsx")
-
         try:
-            if not os.path.exists(filename):
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Test Results"
-                ws.append([
-                    "Test Name", "Order Number", "ID Number", "Description", "Status", "Timestamp", "Duration",
-                    "Browser", "OS", "Full Name", "Email",
-                    "Room Screenshot", "Payment Screenshot", "Confirmation Screenshot", "Log File"
-                ])
-            else:
-                wb = load_workbook(filename)
-                ws = wb.active
-
-            status = "FAILED" if info.get("error") else "PASSED"
-
-            row = [
-                info.get("name", ""),
-                info.get("order_number", ""),
-                info.get("id_number", ""),
-                info.get("description", ""),
-                status,
-                info.get("timestamp", ""),
-                info.get("duration", ""),
-                info.get("browser", ""),
-                info.get("os", ""),
-                info.get("full_name", ""),
-                info.get("email", ""),
-                getattr(self, "screenshot_room_selection", ""),
-                getattr(self, "screenshot_payment_stage", ""),
-                info.get("error_screenshot" if info.get("status") == "FAILED" else "confirmation_screenshot", ""),
-                info.get("log", "")
-            ]
-            ws.append(row)
-            row_num = ws.max_row
-
-            # 🎨 Color row based on result
-            red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-            green_fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-            row_fill = red_fill if status == "FAILED" else green_fill
-
-            for col_idx in range(1, 16):  # Adjusted to match 15 columns
-                ws.cell(row=row_num, column=col_idx).fill = row_fill
-
-            # 📎 Add hyperlinks for screenshots (Room, Payment, Confirmation)
-            for col_idx in [12, 13, 14]:  # Screenshot columns
-                screenshot_path = row[col_idx - 1]
-                if screenshot_path and os.path.exists(screenshot_path):
-                    cell = ws.cell(row=row_num, column=col_idx)
-                    cell.value = SCREENSHOT_LABEL
-                    cell.hyperlink = f"file:///{screenshot_path.replace(os.sep, '/')}"
-                    cell.font = Font(color="0000EE", underline="single")
-
-            # 📎 Add hyperlink for log file
-            log_path = info.get("log", "")
-            if log_path and os.path.exists(log_path):
-                cell = ws.cell(row=row_num, column=15)
-                cell.value = LOG_LABEL
-                cell.hyperlink = f"file:///{log_path.replace(os.sep, '/')}"
-                cell.font = Font(color="0000EE", underline="single")
-
-            # ↔️ Auto-fit column widths
-            for col in ws.columns:
-                max_length = 0
-                col_letter = get_column_letter(col[0].column)
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except Exception as e:
-                        logging.warning(f"Column resize error: {e}")
-                ws.column_dimensions[col_letter].width = max_length + 5
-
-            wb.save(filename)
-            logging.info(f"Excel file saved at: {filename}")
-
-        except PermissionError as e:
-            logging.warning(f"Excel file is open or locked: {e}")
+            results_store().record(info, log_text=self.log_stream.getvalue())
         except Exception as e:
-            logging.error(f"Failed to save Excel file: {e}")
+            logging.warning(f"⚠️ Could not write the result to the results database: {e}")
+
+    def save_to_excel(self, info: dict):
+        # Buffered; written to TestResults_<month>.xlsx once, in tearDownClass (see Fattal_Utils/Excel_Exporter.py)
+        excel_exporter().add(
+            info, getattr(self, "screenshot_room_selection", ""), getattr(self, "screenshot_payment_stage", "")
+        )
 
     def save_to_html(self, info: dict):
         import time
@@ -378,9 +302,10 @@ class FattalMobileTests(unittest.TestCase):
         dashboard_path = os.path.join(html_dir, "TestDashboard.html")
 
         def image_tag(path):
-            if path and os.path.exists(path):
+            if screenshot_exists(path):
                 rel_path = os.path.relpath(path, start=html_dir).replace(os.sep, '/')
-                return f'<img src="{rel_path}" onclick="openModal(this.src)" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
+                thumb_path = os.path.relpath(thumbnail_path(path), start=html_dir).replace(os.sep, '/')
+                return f'<img src="{thumb_path}" onerror="this.onerror=null;this.src=\'{rel_path}\'" onclick="openModal(\'{rel_path}\')" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
             return "<em>No screenshot</em>"
 
         room_img = image_tag(getattr(self, 'screenshot_room_selection', ''))
@@ -598,7 +523,8 @@ class FattalMobileTests(unittest.TestCase):
     def is_no_results_displayed(self):
         try:
             # Customize selector according to your "No results" element!
-            return self.driver.find_element(By.XPATH, "//div[contains(text(), 'לא נמצאו תוצאות')]").is_displayed()
+            banners = FattalWaitPolicy(self.driver).probe(By.XPATH, "//div[contains(text(), 'לא נמצאו תוצאות')]")
+            return bool(banners) and banners[0].is_displayed()
         except Exception:
             return False
 
@@ -622,14 +548,14 @@ class FattalMobileTests(unittest.TestCase):
 
         try:
             # Find email field and scroll into view
-            email_input = WebDriverWait(self.driver, 10).until(
+            email_input = FattalWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "checkout-form-field-input_email"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", email_input)
             time.sleep(0.5)  # Short pause after scroll
 
             # Wait until clickable
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "checkout-form-field-input_email"))
             )
             logging.info("✅ Email field is ready for input.")
@@ -638,10 +564,7 @@ class FattalMobileTests(unittest.TestCase):
             raise Exception("❌ Email input not clickable after timeout.")
 
         # Fill the fields
-        self.mobile_order_page.set_email(email)
-        self.mobile_order_page.set_phone(phone)
-        self.mobile_order_page.set_first_name(first_name)
-        self.mobile_order_page.set_last_name(last_name)
+        self.mobile_order_page.fill_guest_form(email=email, phone=phone, first_name=first_name, last_name=last_name)
 
         # For logging/export
         self.entered_email = email
@@ -652,62 +575,14 @@ class FattalMobileTests(unittest.TestCase):
         """
         Fills payment details using the credit card information from config.json
         """
-        try:
-            cardholder_name = self.payment_card["cardholder_name"]
-            card_number = self.payment_card["card_number"]
-            expiry_month = self.payment_card["expiry_month"]
-            expiry_year = self.payment_card["expiry_year"]
-            cvv = self.payment_card["cvv"]
-            id_number = self.payment_card["id_number"]
-
-            logging.info("Using credit card details from config.json")
-
-            # Find and switch to the iframe
-            iframe = self.driver.find_element(By.ID, "paymentIframe")
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", iframe)
-            self.driver.switch_to.frame(iframe)
-            # Fill Cardholder Name
-            cardholder_input = self.driver.find_element(By.ID, "card_holder_name_input")
-            cardholder_input.clear()
-            cardholder_input.send_keys(cardholder_name)
-            # Fill Card Number
-            card_number_input = self.driver.find_element(By.ID, "credit_card_number_input")
-            card_number_input.clear()
-            card_number_input.send_keys(card_number)
-
-            # Select Expiry Month
-            month_select = Select(self.driver.find_element(By.ID, "date_month_input"))
-            month_select.select_by_visible_text(expiry_month)
-
-            # Select Expiry Year
-            year_select = Select(self.driver.find_element(By.ID, "date_year_input"))
-            year_select.select_by_visible_text(expiry_year)
-
-            # Fill CVV
-            cvv_input = self.driver.find_element(By.ID, "cvv_input")
-            cvv_input.clear()
-            cvv_input.send_keys(cvv)
-
-            # Fill ID Number
-            id_input = self.driver.find_element(By.ID, "id_number_input")
-            id_input.clear()
-            id_input.send_keys(id_number)
-
-            logging.info("Credit card details from config applied successfully")
-
-        except Exception as e:
-            logging.error(f"Failed to apply credit card details from config: {e}")
-            raise
-        finally:
-            # Switch back to default content
-            self.driver.switch_to.default_content()
+        logging.info("Using credit card details from config.json")
+        report = self.mobile_order_page.fill_payment_card(self.payment_card)
+        logging.info("Credit card details from config applied successfully")
+        return report
 
     def take_confirmation_screenshot(self, test_method, status):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
         try:
             # Locate the element you want to anchor the screenshot from
@@ -719,12 +594,12 @@ class FattalMobileTests(unittest.TestCase):
 
             time.sleep(1)  # Let rendering stabilize
 
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f" Screenshot anchored with manual scroll saved at: {filename}")
         except Exception as e:
             logging.warning(f" Could not scroll to confirmation element: {e}")
             try:
-                self.driver.save_screenshot(filename)
+                filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
                 logging.info(f" Screenshot (fallback full view) saved at: {filename}")
             except Exception as inner_e:
                 logging.error(f" Screenshot failed: {inner_e}")
@@ -733,11 +608,8 @@ class FattalMobileTests(unittest.TestCase):
         return filename
 
     def take_confirmation_screenshot_renew_membership(self, test_method, status):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
         try:
             # Scroll to the container div for the confirmation message
@@ -749,12 +621,12 @@ class FattalMobileTests(unittest.TestCase):
 
             time.sleep(1)  # Allow time for scroll and render
 
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f" Screenshot anchored to confirmation container saved at: {filename}")
         except Exception as e:
             logging.warning(f" Could not scroll to confirmation container: {e}")
             try:
-                self.driver.save_screenshot(filename)
+                filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
                 logging.info(f" Screenshot (fallback full view) saved at: {filename}")
             except Exception as inner_e:
                 logging.error(f" Screenshot failed: {inner_e}")
@@ -769,12 +641,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -810,7 +677,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.wait_until_personal_form_ready()
         self.take_stage_screenshot("payment_stage")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         self.fill_payment_details_from_config()
         self.mobile_order_page.click_payment_submit_button()
@@ -830,22 +697,16 @@ class FattalMobileTests(unittest.TestCase):
 
     def take_screenshot(self, test_method_name):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{test_method_name}_{timestamp}.png"
-        )
-        self.driver.save_screenshot(filename)
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{test_method_name}_{timestamp}"
+        filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
         logging.error(f" Screenshot taken: {filename}")
 
     def take_stage_screenshot(self, label: str):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
         try:
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f"📸 Screenshot '{label}' saved at: {filename}")
             setattr(self, f"screenshot_{label}", filename)  # Dynamically set
         except Exception as e:
@@ -896,7 +757,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -957,7 +818,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1018,7 +879,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1079,7 +940,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1140,7 +1001,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1201,7 +1062,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1262,7 +1123,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1324,7 +1185,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1397,12 +1258,7 @@ class FattalMobileTests(unittest.TestCase):
             except Exception as e:
                 logging.warning(f"Logging failed during tearDown: {e}")
             finally:
-                logging.info("Waiting 2 seconds before closing browser...")
-                sleep(2)
-                try:
-                    self.driver.quit()
-                except Exception as e:
-                    logging.warning(f"Browser quit failed: {e}")
+                self.__class__.session_pool.release(self.driver)
 
     if __name__ == "__main__":
         import unittest
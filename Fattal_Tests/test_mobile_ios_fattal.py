@@ -1,13 +1,10 @@
 import io
-import json
 import logging
 import sys
 import time
 import traceback
-from openpyxl.styles import PatternFill
 from time import sleep
 import unittest
-from selenium import webdriver
 import functools
 from selenium.common import TimeoutException
 from Mobile_Fattal_Pages.Mobile_Fattal_Flight_Page import FattalFlightPageMobile
@@ -19,21 +16,28 @@ from Mobile_Fattal_Pages.Mobile_Fattal_ConfirmPage import FattalMobileConfirmPag
 from Mobile_Fattal_Pages.Mobile_Fattal_Deals_Packages import FattalDealsPageMobile
 from Mobile_Fattal_Pages.Mobile_Fattal_Customer_Contact_Page import FattalMobileCustomerSupport
 from Mobile_Fattal_Pages.Mobile_Fattal_Join_Club_Page import FattalMobileClubJoinPage
+from Fattal_Utils.Session_Pool import FattalSessionPool
+from Fattal_Utils.Driver_Factory import create_driver
+from Fattal_Utils.Dashboard import update_dashboard
+from Fattal_Utils.Artifact_Store import save_log
+from Fattal_Utils.Excel_Exporter import excel_exporter
+from Fattal_Utils.Results_Store import results_store
+from Fattal_Utils.Screenshot_Service import screenshot_exists, screenshot_service_for, thumbnail_path, wait_for_screenshots
+from Fattal_Utils.Result_Sink import append_order, compact_orders, result_sink_for
+from Fattal_Utils.Worker_Env import new_run_folder, shared_run_folder, worker_dir
+from Fattal_Utils.Network_Shaping import network_shaper_for
+from Fattal_Utils.Asset_Cache import asset_interceptor_for
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Network_Idle import network_idle_for
+from Fattal_Utils.Payment_Form import payment_form_for
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy, wait_stats_for
+from Fattal_Utils.Deep_Links import HOTEL_IDS
 from datetime import datetime
 import os
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
-from selenium.webdriver.support.ui import Select
 from dotenv import load_dotenv
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from typing import TextIO
-HOTEL_NAME_TO_ID = {
-    "לאונרדו נגב, באר שבע": "10048",
-    "לאונרדו פלאזה אילת": "1051"
-}
 
 
 def retry_on_no_results(max_attempts=2):
@@ -75,7 +79,7 @@ class FattalMobileTests(unittest.TestCase):
                 logging.warning("Order number is empty, not saving for cancellation.")
                 return
 
-            hotel_id = HOTEL_NAME_TO_ID.get(self.default_hotel_name, "UNKNOWN")
+            hotel_id = HOTEL_IDS.get(self.default_hotel_name, "UNKNOWN")
 
             order_entry = {
                 "masterID": str(order_number),
@@ -85,23 +89,7 @@ class FattalMobileTests(unittest.TestCase):
             current_dir = os.path.dirname(os.path.abspath(__file__))
             cancel_file = os.path.join(current_dir, "orders_to_cancel.json")
 
-            if os.path.exists(cancel_file):
-                try:
-                    with open(cancel_file, "r", encoding="utf-8") as f:
-                        existing_orders = json.load(f)
-                        if not isinstance(existing_orders, list):
-                            logging.warning("⚠️ JSON file does not contain a list. Resetting it.")
-                            existing_orders = []
-                except Exception as e:
-                    logging.warning(f"⚠️ JSON file invalid — starting fresh. ({e})")
-                    existing_orders = []
-            else:
-                existing_orders = []
-
-            existing_orders.append(order_entry)
-
-            with open(cancel_file, "w", encoding="utf-8") as f:
-                json.dump(existing_orders, f, indent=2, ensure_ascii=False)
+            append_order(cancel_file, order_entry)
 
             logging.info(f"✅ Saved order {order_number} for cancellation (JSON included).")
 
@@ -109,31 +97,28 @@ class FattalMobileTests(unittest.TestCase):
             logging.warning(f"⚠️ Could not save order for cancellation: {e}")
 
     def save_test_result_to_run_json(self, info: dict, run_folder: str):
-        # 🔐 Ensure the folder exists
-        os.makedirs(run_folder, exist_ok=True)
-
-        json_path = os.path.join(run_folder, "run_data.json")
-
-        if os.path.exists(json_path):
-            with open(json_path, "r", encoding="utf-8") as f:  # type: TextIO
-                data = json.load(f)
-        else:
-            data = []
-
-        data.append(info)
-
-        with open(json_path, "w", encoding="utf-8") as f:  # type: TextIO
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # One locked append to this process's segment; run_data.json is compacted in tearDownClass
+        sink = result_sink_for(run_folder)
+        sink.append(info)
+        logging.info(f"📄 Saved test result to: {sink.segment}")
 
-        logging.info(f"📄 Saved test result to: {json_path}")
+    @staticmethod
+    def build_driver():
+        return create_driver("ios")
 
     @classmethod
     def setUpClass(cls):
         cls.run_folder, cls.run_id = cls.get_static_run_folder()
+        load_dotenv()
+        cls.session_pool = FattalSessionPool(
+            cls.build_driver,
+            size=int(os.getenv("DRIVER_POOL_SIZE", "1")),
+            start_url=os.getenv("ENV_ACTIVE"),
+        )
+        cls.session_pool.warm_up()
 
     def setUp(self):
         import os, sys, io, logging
-        from selenium import webdriver
         from dotenv import load_dotenv
         from datetime import datetime
 
@@ -152,45 +137,21 @@ class FattalMobileTests(unittest.TestCase):
         )
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
 
-        # Mobile emulation config
-        mobile_emulation = {
-            "deviceMetrics": {"width": 390, "height": 844, "pixelRatio": 3},
-            "userAgent": (
-                "Mozilla/5.0 (iPhone; CPU iPhone OS 15_2 like Mac OS X) "
-                "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.2 Mobile/15E148 Safari/604.1"
-            )
-        }
-
-        options = webdriver.ChromeOptions()
-        options.add_experimental_option("mobileEmulation", mobile_emulation)
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-
-        # *** Add these options for universal compatibility ***
-        options.add_argument("--window-size=411,950")  # for headless and stability
-        options.add_argument("--force-device-scale-factor=1")
-
-        # Optional: for 100% clean state
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-popup-blocking")
-        # options.add_argument("--headless=new")  # Only if you want headless mode
-
-        self.driver = webdriver.Chrome(options=options)
-
-        # Set the window size again to force Chrome to correct physical size
-        self.driver.set_window_rect(x=0, y=0, width=411, height=950)
-
+        self.lease = self.__class__.session_pool.acquire()
+        self.driver = self.lease.driver
+        self.network_shaper = network_shaper_for(self.driver)
+        self.network_shaper.apply(allow=getattr(getattr(self, self._testMethodName), "network_allow", ()))
+        self.asset_cache = asset_interceptor_for(self.driver)
+        self.asset_cache.reset_counters()
+        self.popup_watchdog = popup_watchdog_for(self.driver)
+        self.popup_watchdog.reset()
+        self.network_idle = network_idle_for(self.driver)
+        self.network_idle.reset()
+        payment_form_for(self.driver).reset()
+        wait_stats_for(self.driver).reset()
         self.test_start_time = datetime.now()
-        self.driver.implicitly_wait(10)
-
-        # Optional: force touch emulation for some mobile interactions
-        self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {
-            "enabled": True,
-            "configuration": "mobile"
-        })
 
         active_key = os.getenv("ENV_ACTIVE")
-        self.driver.get(active_key)
         logging.info(f"Opened environment URL: {active_key}")
 
         # ... The rest of your environment variable code ...
@@ -230,253 +191,15 @@ class FattalMobileTests(unittest.TestCase):
 
     @classmethod
     def get_static_run_folder(cls):
-        base_path = os.path.join(os.path.dirname(__file__), 'html_reports', 'runs')
-        os.makedirs(base_path, exist_ok=True)
-        now = datetime.now().strftime("run_%Y-%m-%d_%H-%M-%S")
-        run_folder = os.path.join(base_path, now)
-        os.makedirs(run_folder, exist_ok=True)
-        return run_folder, now
+        # Parallel workers all write into the one run folder the runner created
+        shared = shared_run_folder()
+        if shared:
+            return shared
+        return new_run_folder(os.path.join(os.path.dirname(__file__), 'html_reports', 'runs'))
     @staticmethod
-    def generate_dashboard_html(runs_base_dir: str):
-        import os
-        import json
-        from datetime import datetime
-        import logging
-
-        dashboard_path = os.path.join(runs_base_dir, "..", "dashboard.html")
-        run_dirs = sorted(
-            [d for d in os.listdir(runs_base_dir) if d.startswith("run_")],
-            reverse=True
-        )
-
-        run_data_js_entries = []
-        select_html_entries = []
-
-        for i, run_dir in enumerate(run_dirs):
-            json_path = os.path.join(runs_base_dir, run_dir, "run_data.json")
-            if not os.path.exists(json_path):
-                continue
-
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                run_data_js_entries.append(f'"{run_dir}": {json.dumps(data, ensure_ascii=False)}')
-
-                total = len(data)
-                failed = sum(1 for t in data if t.get("status") == "FAILED")
-                passed = total - failed
-                mobile = sum(1 for t in data if t.get("test_type") == "mobile")
-                desktop = sum(1 for t in data if t.get("test_type") == "desktop")
-
-                run_timestamp_str = run_dir.replace("run_", "")  # e.g., '2025-06-17_14-33-12'
-                run_datetime = datetime.strptime(run_timestamp_str, "%Y-%m-%d_%H-%M-%S")
-                day_label = run_datetime.strftime("%A")
-                datetime_label = run_datetime.strftime("%Y-%m-%d %H:%M:%S")
-
-                label = f"{day_label} {datetime_label} | {total} tests | ✅ {passed} | ❌ {failed}"
-                if mobile:
-                    label += f" | 📱 {mobile}"
-                if desktop:
-                    label += f" | 💻 {desktop}"
-
-                selected = "selected" if i == 0 else ""
-                select_html_entries.append(f'<option value="{run_dir}" {selected}>{label}</option>')
-
-        run_data_js = "{\n" + ",\n".join(run_data_js_entries) + "\n}"
-        select_html = "\n".join(select_html_entries)
-
-        script = f"""
-        <script>
-        const runData = {run_data_js};
-
-        function populateRun(runId) {{
-            const container = document.getElementById("results");
-            container.innerHTML = "";
-            const showPassed = document.getElementById("filterPassed").checked;
-            const showFailed = document.getElementById("filterFailed").checked;
-            const data = runData[runId] || [];
-            data.forEach(test => {{
-                if ((test.status === "PASSED" && !showPassed) || (test.status === "FAILED" && !showFailed)) return;
-
-                const div = document.createElement("div");
-                div.classList.add("test-entry");
-
-                // Robust log path logic for working links:
-                const logPath = test.log || "";
-                let logHref = "#";
-                if (logPath) {{
-                  let parts = logPath.replace(/\\\\/g, '/').split('/');
-                  if (parts.length >= 2) {{
-                    logHref = "../" + parts.slice(-2).join('/');
-                  }} else {{
-                    logHref = logPath;
-                  }}
-                }}
-
-                const screenshots = ["room_selection", "payment_stage", test.status === "FAILED" ? "error_screenshot" : "confirmation_screenshot"]
-                  .map(label => {{
-                      const path = test[label] || "";
-                      if (!path) return "";
-                      const short = path.split(/[/\\\\]/).pop();
-                      return `<div><strong>${{label}}:</strong><br><img src="../Screenshots/${{short}}" style="max-height:120px;cursor:pointer;" onclick="openModal(this.src)" /></div>`;
-                  }}).join("");
-
-                div.innerHTML = `
-                  <h3>${{test.name}} — <span style="color:${{test.status === 'PASSED' ? 'green' : 'red'}}">${{test.status}}</span></h3>
-                  <p><strong>Description:</strong> ${{test.description || "—"}}</p>
-                  <p><strong>Timestamp:</strong> ${{test.timestamp}} | <strong>Duration:</strong> ${{test.duration}}</p>
-                  <p><strong>Guest:</strong> ${{test.full_name}} | <strong>Email:</strong> ${{test.email}}</p>
-                  <p><strong>Order #:</strong> ${{test.order_number}} | <strong>ID:</strong> ${{test.id_number}}</p>
-                  <p><strong>Log:</strong> <a href="${{logHref}}" target="_blank">${{logPath.split(/[\\\\/]/).pop()}}</a></p>
-                  ${{test.error ? `<p style='color:red'><strong>Error:</strong> ${{test.error}}</p>` : ""}}
-                  <div class="screenshot-grid">${{screenshots}}</div>
-                  <hr>`;
-                container.appendChild(div);
-            }});
-        }}
-
-        function openModal(src) {{
-            const modal = document.getElementById("screenshotModal");
-            const modalImg = document.getElementById("modalImage");
-            modal.style.display = "block";
-            modalImg.src = src;
-        }}
-
-        function closeModal() {{
-            document.getElementById("screenshotModal").style.display = "none";
-        }}
-        </script>
-        """
-
-        html = f"""<!DOCTYPE html>
-    <html>
-    <head>
-      <meta charset="UTF-8">
-      <title>🧪 Fattal QA Automation Dashboard</title>
-      <style>
-        body {{
-          font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-          background-color: #f9f9f9;
-          margin: 20px;
-          color: #333;
-        }}
-        .dashboard-header {{
-          display: flex;
-          align-items: center;
-          justify-content: space-between;
-          margin-bottom: 10px;
-          gap: 24px;
-        }}
-        .dashboard-header h1 {{
-          margin: 0;
-          font-size: 1.8em;
-          display: flex;
-          align-items: center;
-          white-space: nowrap;
-        }}
-        .dashboard-header h1::before {{
-          content: '🧪';
-          margin-right: 10px;
-        }}
-        .header-logo {{
-          height: 60px;
-          max-width: 200px;
-          object-fit: contain;
-          border-radius: 8px;
-          background: #fff;
-          padding: 6px 12px;
-          box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        }}
-        @media (max-width: 700px) {{
-          .dashboard-header {{
-            flex-direction: column;
-            align-items: flex-start;
-            gap: 8px;
-          }}
-          .header-logo {{
-            margin-left: 0;
-            margin-top: 6px;
-            height: 44px;
-            max-width: 150px;
-          }}
-        }}
-        select {{
-          font-size: 14px;
-          padding: 5px;
-          margin-left: 10px;
-        }}
-        .test-entry {{
-          background: #fff;
-          border-radius: 6px;
-          padding: 15px;
-          margin-bottom: 20px;
-          box-shadow: 0 1px 4px rgba(0,0,0,0.1);
-          transition: background 0.3s ease;
-        }}
-        .test-entry:hover {{
-          background: #f0f8ff;
-        }}
-        .screenshot-grid {{
-          display: flex;
-          gap: 12px;
-          margin-top: 10px;
-          flex-wrap: wrap;
-        }}
-        .screenshot-grid img {{
-          border-radius: 4px;
-          border: 1px solid #ccc;
-        }}
-        .modal {{
-          display: none;
-          position: fixed;
-          z-index: 999;
-          left: 0; top: 0; width: 100%; height: 100%;
-          background-color: rgba(0,0,0,0.85);
-        }}
-        .modal-content {{
-          margin: 5% auto;
-          display: block;
-          max-width: 90vw;
-          max-height: 80vh;
-        }}
-        .close {{
-          position: absolute;
-          top: 15px;
-          right: 35px;
-          color: #fff;
-          font-size: 40px;
-          font-weight: bold;
-          cursor: pointer;
-        }}
-      </style>
-      {script}
-    </head>
-    <body onload="populateRun(document.getElementById('runSelect').value)">
-      <div class="dashboard-header">
-        <h1>Fattal QA Automation Dashboard</h1>
-        <img src="https://d2nyvxq412w7ra.cloudfront.net/_fcb5f25e78.png" alt="Fattal Logo" class="header-logo" />
-      </div>
-      <label>Choose Run:
-        <select id="runSelect" onchange="populateRun(this.value)">
-          {select_html}
-        </select>
-      </label>
-      <div style="margin-top: 10px;">
-        <label><input type="checkbox" id="filterPassed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Passed</label>
-        <label><input type="checkbox" id="filterFailed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Failed</label>
-      </div>
-      <div id="results" style="margin-top: 20px;"></div>
-      <div id="screenshotModal" class="modal" onclick="closeModal()">
-        <span class="close">&times;</span>
-        <img class="modal-content" id="modalImage">
-      </div>
-    </body>
-    </html>"""
-
-        os.makedirs(os.path.dirname(dashboard_path), exist_ok=True)
-        with open(dashboard_path, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        logging.info(f"✅ Dashboard generated at: {dashboard_path}")
+    def generate_dashboard_html(runs_base_dir: str, run_folder: str = None):
+        # Rewrites only run_folder's data and manifest entry (see Fattal_Utils/Dashboard.py)
+        update_dashboard(runs_base_dir, run_folder)
 
     def soft_assert(self, condition, msg, errors_list):
         """
@@ -499,8 +222,7 @@ class FattalMobileTests(unittest.TestCase):
         os.makedirs(logs_dir, exist_ok=True)
         log_file = os.path.join(logs_dir, f"{test_method}_{datetime.now():%Y-%m-%d_%H-%M-%S}.log")
         try:
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write(self.log_stream.getvalue())
+            log_file = save_log(self.log_stream.getvalue(), log_file)
         except Exception as e:
             logging.warning(f"[MOBILE] Could not write log file: {e}")
 
@@ -533,10 +255,18 @@ class FattalMobileTests(unittest.TestCase):
         status = "FAILED" if has_failed else "PASSED"
         info = {
             "name": test_method,
+            "test_id": self.id(),
             "description": getattr(self, "test_description", ""),
             "status": status,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "duration": f"{duration:.2f}s",
+            **self.lease.timing(),
+            **self.network_shaper.stats(),
+            **self.asset_cache.stats(),
+            **self.popup_watchdog.stats(),
+            **self.network_idle.stats(),
+            **payment_form_for(self.driver).stats(),
+            **wait_stats_for(self.driver).stats(),
             "browser": "Chrome",  # Could fetch from capabilities if needed
             "os": "windows",
             "full_name": f"{getattr(self, 'entered_first_name', '')} {getattr(self, 'entered_last_name', '')}".strip(),
@@ -562,92 +292,16 @@ class FattalMobileTests(unittest.TestCase):
         self.save_to_excel(info)
         self.save_test_result_to_run_json(info, self.run_folder)
 
-    def save_to_excel(self, info: dict):
-        SCREENSHOT_LABEL = "📷 Screenshot"
-        LOG_LABEL = "🧾 Log File"
-        parent_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        filename = os.path.join(parent_folder, "TestResults.xlsx")
-
         try:
-            if not os.path.exists(filename):
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Test Results"
-                ws.append([
-                    "Test Name", "Order Number", "ID Number", "Description", "Status", "Timestamp", "Duration",
-                    "Browser", "OS", "Full Name", "Email",
-                    "Room Screenshot", "Payment Screenshot", "Confirmation Screenshot", "Log File"
-                ])
-            else:
-                wb = load_workbook(filename)
-                ws = wb.active
-
-            status = "FAILED" if info.get("error") else "PASSED"
-
-            row = [
-                info.get("name", ""),
-                info.get("order_number", ""),
-                info.get("id_number", ""),
-                info.get("description", ""),
-                status,
-                info.get("timestamp", ""),
-                info.get("duration", ""),
-                info.get("browser", ""),
-                info.get("os", ""),
-                info.get("full_name", ""),
-                info.get("email", ""),
-                getattr(self, "screenshot_room_selection", ""),
-                getattr(self, "screenshot_payment_stage", ""),
-                info.get("error_screenshot" if info.get("status") == "FAILED" else "confirmation_screenshot", ""),
-                info.get("log", "")
-            ]
-            ws.append(row)
-            row_num = ws.max_row
-
-            # 🎨 Color row based on result
-            red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-            green_fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-            row_fill = red_fill if status == "FAILED" else green_fill
-
-            for col_idx in range(1, 16):  # Adjusted to match 15 columns
-                ws.cell(row=row_num, column=col_idx).fill = row_fill
-
-            # 📎 Add hyperlinks for screenshots (Room, Payment, Confirmation)
-            for col_idx in [12, 13, 14]:  # Screenshot columns
-                screenshot_path = row[col_idx - 1]
-                if screenshot_path and os.path.exists(screenshot_path):
-                    cell = ws.cell(row=row_num, column=col_idx)
-                    cell.value = SCREENSHOT_LABEL
-                    cell.hyperlink = f"file:///{screenshot_path.replace(os.sep, '/')}"
-                    cell.font = Font(color="0000EE", underline="single")
-
-            # 📎 Add hyperlink for log file
-            log_path = info.get("log", "")
-            if log_path and os.path.exists(log_path):
-                cell = ws.cell(row=row_num, column=15)
-                cell.value = LOG_LABEL
-                cell.hyperlink = f"file:///{log_path.replace(os.sep, '/')}"
-                cell.font = Font(color="0000EE", underline="single")
-
-            # ↔️ Auto-fit column widths
-            for col in ws.columns:
-                max_length = 0
-                col_letter = get_column_letter(col[0].column)
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except Exception as e:
-                        logging.warning(f"Column resize error: {e}")
-                ws.column_dimensions[col_letter].width = max_length + 5
-
-            wb.save(filename)
-            logging.info(f"Excel file saved at: {filename}")
-
-        except PermissionError as e:
-            logging.warning(f"Excel file is open or locked: {e}")
+            results_store().record(info, self.run_id, log_text=self.log_stream.getvalue(), run_folder=self.run_folder)
         except Exception as e:
-            logging.error(f"Failed to save Excel file: {e}")
+            logging.warning(f"⚠️ Could not write the result to the results database: {e}")
+
+    def save_to_excel(self, info: dict):
+        # Buffered; written to TestResults_<month>.xlsx once, in tearDownClass (see Fattal_Utils/Excel_Exporter.py)
+        excel_exporter().add(
+            info, getattr(self, "screenshot_room_selection", ""), getattr(self, "screenshot_payment_stage", "")
+        )
 
     def save_to_html(self, info: dict):
         import time
@@ -660,9 +314,10 @@ class FattalMobileTests(unittest.TestCase):
         dashboard_path = os.path.join(html_dir, "TestDashboard.html")
 
         def image_tag(path):
-            if path and os.path.exists(path):
+            if screenshot_exists(path):
                 rel_path = os.path.relpath(path, start=html_dir).replace(os.sep, '/')
-                return f'<img src="{rel_path}" onclick="openModal(this.src)" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
+                thumb_path = os.path.relpath(thumbnail_path(path), start=html_dir).replace(os.sep, '/')
+                return f'<img src="{thumb_path}" onerror="this.onerror=null;this.src=\'{rel_path}\'" onclick="openModal(\'{rel_path}\')" style="max-height:120px; border:1px solid #ccc; margin:5px; cursor: pointer;" />'
             return "<em>No screenshot</em>"
 
         room_img = image_tag(getattr(self, 'screenshot_room_selection', ''))
@@ -880,7 +535,8 @@ class FattalMobileTests(unittest.TestCase):
     def is_no_results_displayed(self):
         try:
             # Customize selector according to your "No results" element!
-            return self.driver.find_element(By.XPATH, "//div[contains(text(), 'לא נמצאו תוצאות')]").is_displayed()
+            banners = FattalWaitPolicy(self.driver).probe(By.XPATH, "//div[contains(text(), 'לא נמצאו תוצאות')]")
+            return bool(banners) and banners[0].is_displayed()
         except Exception:
             return False
 
@@ -904,14 +560,14 @@ class FattalMobileTests(unittest.TestCase):
 
         try:
             # Find email field and scroll into view
-            email_input = WebDriverWait(self.driver, 10).until(
+            email_input = FattalWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "checkout-form-field-input_email"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", email_input)
             time.sleep(0.5)  # Short pause after scroll
 
             # Wait until clickable
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "checkout-form-field-input_email"))
             )
             logging.info("✅ Email field is ready for input.")
@@ -920,10 +576,7 @@ class FattalMobileTests(unittest.TestCase):
             raise Exception("❌ Email input not clickable after timeout.")
 
         # Fill the fields
-        self.mobile_order_page.set_email(email)
-        self.mobile_order_page.set_phone(phone)
-        self.mobile_order_page.set_first_name(first_name)
-        self.mobile_order_page.set_last_name(last_name)
+        self.mobile_order_page.fill_guest_form(email=email, phone=phone, first_name=first_name, last_name=last_name)
 
         # For logging/export
         self.entered_email = email
@@ -934,62 +587,14 @@ class FattalMobileTests(unittest.TestCase):
         """
         Fills payment details using the credit card information from config.json
         """
-        try:
-            cardholder_name = self.payment_card["cardholder_name"]
-            card_number = self.payment_card["card_number"]
-            expiry_month = self.payment_card["expiry_month"]
-            expiry_year = self.payment_card["expiry_year"]
-            cvv = self.payment_card["cvv"]
-            id_number = self.payment_card["id_number"]
-
-            logging.info("Using credit card details from config.json")
-
-            # Find and switch to the iframe
-            iframe = self.driver.find_element(By.ID, "paymentIframe")
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", iframe)
-            self.driver.switch_to.frame(iframe)
-            # Fill Cardholder Name
-            cardholder_input = self.driver.find_element(By.ID, "card_holder_name_input")
-            cardholder_input.clear()
-            cardholder_input.send_keys(cardholder_name)
-            # Fill Card Number
-            card_number_input = self.driver.find_element(By.ID, "credit_card_number_input")
-            card_number_input.clear()
-            card_number_input.send_keys(card_number)
-
-            # Select Expiry Month
-            month_select = Select(self.driver.find_element(By.ID, "date_month_input"))
-            month_select.select_by_visible_text(expiry_month)
-
-            # Select Expiry Year
-            year_select = Select(self.driver.find_element(By.ID, "date_year_input"))
-            year_select.select_by_visible_text(expiry_year)
-
-            # Fill CVV
-            cvv_input = self.driver.find_element(By.ID, "cvv_input")
-            cvv_input.clear()
-            cvv_input.send_keys(cvv)
-
-            # Fill ID Number
-            id_input = self.driver.find_element(By.ID, "id_number_input")
-            id_input.clear()
-            id_input.send_keys(id_number)
-
-            logging.info("Credit card details from config applied successfully")
-
-        except Exception as e:
-            logging.error(f"Failed to apply credit card details from config: {e}")
-            raise
-        finally:
-            # Switch back to default content
-            self.driver.switch_to.default_content()
+        logging.info("Using credit card details from config.json")
+        report = self.mobile_order_page.fill_payment_card(self.payment_card)
+        logging.info("Credit card details from config applied successfully")
+        return report
 
     def take_confirmation_screenshot(self, test_method, status):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
         try:
             # Locate the element you want to anchor the screenshot from
@@ -1001,12 +606,12 @@ class FattalMobileTests(unittest.TestCase):
 
             time.sleep(1)  # Let rendering stabilize
 
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f" Screenshot anchored with manual scroll saved at: {filename}")
         except Exception as e:
             logging.warning(f" Could not scroll to confirmation element: {e}")
             try:
-                self.driver.save_screenshot(filename)
+                filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
                 logging.info(f" Screenshot (fallback full view) saved at: {filename}")
             except Exception as inner_e:
                 logging.error(f" Screenshot failed: {inner_e}")
@@ -1015,11 +620,8 @@ class FattalMobileTests(unittest.TestCase):
         return filename
 
     def take_confirmation_screenshot_renew_membership(self, test_method, status):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"confirmation_{status}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
         try:
             # Scroll to the container div for the confirmation message
@@ -1031,12 +633,12 @@ class FattalMobileTests(unittest.TestCase):
 
             time.sleep(1)  # Allow time for scroll and render
 
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f" Screenshot anchored to confirmation container saved at: {filename}")
         except Exception as e:
             logging.warning(f" Could not scroll to confirmation container: {e}")
             try:
-                self.driver.save_screenshot(filename)
+                filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
                 logging.info(f" Screenshot (fallback full view) saved at: {filename}")
             except Exception as inner_e:
                 logging.error(f" Screenshot failed: {inner_e}")
@@ -1050,22 +652,16 @@ class FattalMobileTests(unittest.TestCase):
 
     def take_screenshot(self, test_method_name):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{test_method_name}_{timestamp}.png"
-        )
-        self.driver.save_screenshot(filename)
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{test_method_name}_{timestamp}"
+        filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
         logging.error(f" Screenshot taken: {filename}")
 
     def take_stage_screenshot(self, label: str):
-        screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        filename = os.path.join(
-            screenshot_dir, f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-        )
+        screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+        name = f"{label}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
         try:
-            self.driver.save_screenshot(filename)
+            filename = screenshot_service_for(self.driver).capture(screenshot_dir, name)
             logging.info(f"📸 Screenshot '{label}' saved at: {filename}")
             setattr(self, f"screenshot_{label}", filename)  # Dynamically set
         except Exception as e:
@@ -1118,7 +714,7 @@ class FattalMobileTests(unittest.TestCase):
 
             logging.info("Fattal Club form filled and validated successfully.")
             self.mobile_club_join_page.click_accept_terms_checkbox()
-            sleep(15)
+            self.mobile_order_page.wait_for_payment_iframe_ready()
 
             # Step 5: Payment
             self.fill_payment_details_from_config()
@@ -1134,10 +730,8 @@ class FattalMobileTests(unittest.TestCase):
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot_dir = os.path.join(self.base_dir, "Screenshots")
-            os.makedirs(screenshot_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshot_dir, f"join_club_test_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
+            screenshot_path = screenshot_service_for(self.driver).capture(screenshot_dir, f"join_club_test_fail_{timestamp}")
             logging.exception(f"Join Fattal Club test failed. Screenshot saved: {screenshot_path}")
             raise
 
@@ -1200,7 +794,7 @@ class FattalMobileTests(unittest.TestCase):
     #
     #     except Exception as e:
     #         timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-    #         screenshot_dir = os.path.join(self.base_dir, "Screenshots")
+    #         screenshot_dir = worker_dir(os.path.join(self.base_dir, "Screenshots"))
     #         os.makedirs(screenshot_dir, exist_ok=True)
     #         screenshot_path = os.path.join(
     #             screenshot_dir, f"test_failure_{timestamp}.png"
@@ -1227,12 +821,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -1269,7 +858,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.wait_until_personal_form_ready()
         self.take_stage_screenshot("payment_stage")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1331,7 +920,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_id_number = random_id  # Save for logging/export
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1392,7 +981,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_id_number(random_id)
         self.entered_id_number = random_id  # Save for logging/export
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1422,12 +1011,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -1471,7 +1055,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.wait_until_personal_form_ready()
         self.take_stage_screenshot("payment_stage")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
         self.mobile_order_page.click_payment_submit_button()
@@ -1523,7 +1107,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_id_number(random_id)
         self.entered_id_number = random_id  # Save for logging/export
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1635,7 +1219,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_id_number(random_id)
         self.entered_id_number = random_id  # Save for logging/export
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         gift_code = os.getenv("GIFT4", "").strip()
         assert gift_code and gift_code.isdigit(), "GIFT4 is missing or invalid in environment config"
@@ -1678,12 +1262,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup_expired()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup_expired)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(
@@ -1718,7 +1297,7 @@ class FattalMobileTests(unittest.TestCase):
         self.take_stage_screenshot("payment_stage")
         self.mobile_order_page.click_join_club_checkbox()
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
@@ -1753,12 +1332,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup_expired()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup_expired)
 
             logging.info("Logged in successfully.")
         except Exception as e:
@@ -1793,7 +1367,7 @@ class FattalMobileTests(unittest.TestCase):
         self.take_stage_screenshot("payment_stage")
         #self.mobile_order_page.click_join_club_checkbox()
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
@@ -1828,12 +1402,7 @@ class FattalMobileTests(unittest.TestCase):
         }
 
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup_expired()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup_expired)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -1851,7 +1420,7 @@ class FattalMobileTests(unittest.TestCase):
 
         # Step 2: Agreement & Payment
         self.mobile_order_page.click_user_agreement_checkbox_by_label_id()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         self.take_stage_screenshot("payment_stage")
         self.fill_payment_details_from_config()
 
@@ -1861,7 +1430,7 @@ class FattalMobileTests(unittest.TestCase):
         # Step 4: Verify price
         try:
             logging.info("Waiting for confirmation price element...")
-            price_element = WebDriverWait(self.driver, 10).until(
+            price_element = FattalWait(self.driver, 10).until(
                 EC.visibility_of_element_located((By.ID, "club-checkout-order-details-price"))
             )
             price_text = price_element.text.strip().replace('\u200f', '').replace('\xa0', ' ')
@@ -1905,12 +1474,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -1946,7 +1510,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.wait_until_personal_form_ready()
         self.take_stage_screenshot("payment_stage")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -1975,12 +1539,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -2002,7 +1561,7 @@ class FattalMobileTests(unittest.TestCase):
         # Step 6 : Order Page (for club, skip email + id)
         self.mobile_order_page.click_user_agreement_checkbox()
         self.take_stage_screenshot("payment_stage")
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -2064,7 +1623,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_id_number(random_id)
         self.entered_id_number = random_id  # Save for logging/export
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -2130,14 +1689,16 @@ class FattalMobileTests(unittest.TestCase):
         self.take_stage_screenshot("payment_stage")
 
         # ✅ Fill in guest details
-        self.mobile_order_page.set_email(user["email"])
-        self.mobile_order_page.set_phone(user["phone"])
+        self.mobile_order_page.fill_fields({
+            self.mobile_order_page.GUEST_FIELDS["email"]: user["email"],
+            self.mobile_order_page.GUEST_FIELDS["phone"]: user["phone"],
+        })
         self.entered_id_number = user["id"]
         # ✅ Save for export/logging
         self.entered_email = user["email"]
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         # Step 8: Fill payment iframe
         self.fill_payment_details_from_config()
@@ -2197,7 +1758,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_id_number(random_id)
         self.entered_id_number = random_id  # Save for logging/export
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
 
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
@@ -2231,12 +1792,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -2276,7 +1832,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_first_name("Chen")
         self.mobile_order_page.set_last_name("Test")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -2309,12 +1865,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -2355,7 +1906,7 @@ class FattalMobileTests(unittest.TestCase):
         self.mobile_order_page.set_first_name("Chen")
         self.mobile_order_page.set_last_name("Test")
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -2417,12 +1968,7 @@ class FattalMobileTests(unittest.TestCase):
             "email": os.getenv("DEFAULT_EMAIL")
         }
         try:
-            self.mobile_toolbar.open_login_menu()
-            self.mobile_toolbar.click_login_with_email_button()
-            self.mobile_toolbar.user_id_input().send_keys(user["id"])
-            self.mobile_toolbar.user_password_input().send_keys(user["password"])
-            self.mobile_toolbar.click_login_button()
-            self.mobile_toolbar.close_post_login_popup()
+            self.mobile_toolbar.club_login(user["id"], user["password"], post_login=self.mobile_toolbar.close_post_login_popup)
             logging.info("Logged in successfully.")
         except Exception as e:
             logging.warning(f"Login failed or already logged in: {e}")
@@ -2433,7 +1979,7 @@ class FattalMobileTests(unittest.TestCase):
         self.entered_email = user["email"]
 
         self.mobile_order_page.click_user_agreement_checkbox()
-        sleep(15)
+        self.mobile_order_page.wait_for_payment_iframe_ready()
         # Step 7: Fill the iframe using config.json
         self.fill_payment_details_from_config()
 
@@ -2535,9 +2081,17 @@ class FattalMobileTests(unittest.TestCase):
     #        logging.error("Soft assertions encountered:\n" + "\n".join(self.soft_assert_errors))
     @classmethod
     def tearDownClass(cls):
+        cls.session_pool.close()
+        wait_for_screenshots()
+        excel_exporter().flush()
+        try:
+            result_sink_for(cls.run_folder).compact()
+            compact_orders(os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders_to_cancel.json"))
+        except Exception as e:
+            logging.warning(f"⚠️ Failed to compact run results: {e}")
         try:
             runs_base_dir = os.path.join(os.path.dirname(__file__), "html_reports", "runs")
-            cls.generate_dashboard_html(runs_base_dir)
+            cls.generate_dashboard_html(runs_base_dir, cls.run_folder)
             logging.info("✅ Mobile dashboard generated at the end of test suite.")
         except Exception as e:
             logging.warning(f"⚠️ Failed to generate mobile dashboard: {e}")
@@ -2561,18 +2115,10 @@ class FattalMobileTests(unittest.TestCase):
                     if order_number:
                         self.save_order_for_cancellation(order_number)
 
-                # ✅ NEW: Generate HTML dashboard
-                self.generate_dashboard_html(os.path.join(self.base_dir, "html_reports", "runs"))
-
             except Exception as e:
                 logging.warning(f"Logging failed during tearDown: {e}")
             finally:
-                logging.info("Waiting 2 seconds before closing browser...")
-                sleep(2)
-                try:
-                    self.driver.quit()
-                except Exception as e:
-                    logging.warning(f"Browser quit failed: {e}")
+                self.__class__.session_pool.release(self.driver)
 
     if __name__ == "__main__":
         import unittest
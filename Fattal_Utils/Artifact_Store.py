@@ -0,0 +1,263 @@
+"""
+Content-addressed store for test artifacts (screenshots and logs) under Fattal_Tests/Artifacts.
+
+    python -m Fattal_Utils.Artifact_Store stats
+    python -m Fattal_Utils.Artifact_Store gc --dry-run
+
+Every artifact is saved once, as <first two hex digits>/<sha256><ext>, so a page captured
+identically by many tests (or many runs) is one file that every result points to. Screenshots
+are hashed on the captured pixels; with ARTIFACT_PHASH_DISTANCE > 0 a capture whose perceptual
+hash is within that many bits of a stored one reuses it as well. Test results reference
+artifacts by path in run_data.json and in results.db; "gc" deletes the artifacts none of them
+references. ARTIFACT_STORE=0 turns the store off (named files in Screenshots/ and logs/ again),
+ARTIFACT_DIR moves it.
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from PIL import Image
+
+from Fattal_Utils.Result_Sink import append_record, file_lock, has_results, load_run, read_records
+from Fattal_Utils.Results_Store import ARTIFACT_KEYS, DEFAULT_DB, TESTS_DIR
+
+DEFAULT_ARTIFACTS_DIR = os.path.join(TESTS_DIR, "Artifacts")
+DEFAULT_RUNS_DIR = os.path.join(TESTS_DIR, "html_reports", "runs")
+INDEX = "index.jsonl"
+THUMBS_DIR = "thumbs"
+
+
+def artifact_store_enabled() -> bool:
+    return os.getenv("ARTIFACT_STORE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def perceptual_hash(png: bytes) -> int:
+    """64-bit difference hash: each bit says whether a pixel of a 9x8 grayscale copy is brighter than its right neighbour."""
+    with Image.open(io.BytesIO(png)) as image:
+        pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def _distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class FattalArtifactStore:
+    """
+    One copy of each artifact, addressed by content hash. index.jsonl records what each object
+    is (kind, size, perceptual hash); it is append-only, so parallel workers can add to it.
+    """
+
+    def __init__(self, root: str = DEFAULT_ARTIFACTS_DIR, phash_distance: int = 0):
+        self.root = root
+        self.phash_distance = phash_distance
+        self.index_path = os.path.join(root, INDEX)
+        self._index = None
+
+    def path_for(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}{ext}")
+
+    @property
+    def index(self) -> dict:
+        """Object file name ("<sha256><ext>") -> its index entry."""
+        if self._index is None:
+            self._index = {entry["object"]: entry for entry in read_records(self.index_path)}
+        return self._index
+
+    def find(self, digest: str, ext: str, phash: int = None) -> str:
+        """
+        Path of the stored copy of this content, or of a near-duplicate when phash is given; None if
+        there is none. The file may still be queued for writing by another thread.
+        """
+        path = self.path_for(digest, ext)
+        if os.path.basename(path) in self.index or os.path.exists(path):
+            return path
+        if phash is None or not self.phash_distance:
+            return None
+        for name, entry in self.index.items():
+            if entry.get("phash") is None or not name.endswith(ext):
+                continue
+            if _distance(phash, int(entry["phash"], 16)) <= self.phash_distance:
+                return self.path_for(name[:-len(ext)], ext)
+        return None
+
+    def add(self, digest: str, ext: str, kind: str, size: int = None, phash: int = None) -> str:
+        """Records an object in the index (the caller writes the file). Returns its path."""
+        path = self.path_for(digest, ext)
+        entry = {
+            "object": os.path.basename(path), "kind": kind, "size": size,
+            "phash": f"{phash:016x}" if phash is not None else None,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        append_record(self.index_path, entry)
+        self.index[entry["object"]] = entry
+        return path
+
+    def put(self, data: bytes, ext: str, kind: str) -> str:
+        """Stores data as-is unless the same content is already stored. Returns the artifact's path."""
+        digest = content_hash(data)
+        path = self.find(digest, ext)
+        if path and os.path.exists(path):
+            return path
+        path = self.add(digest, ext, kind, size=len(data))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return path
+
+    # ── Housekeeping ───────────────────────────────────
+
+    def objects(self) -> list:
+        return [
+            path for path in glob.glob(os.path.join(self.root, "??", "*"))
+            if os.path.isfile(path) and not path.endswith(".tmp")
+        ]
+
+    def referenced(self, runs_dir: str = DEFAULT_RUNS_DIR, db_path: str = None) -> dict:
+        """Object file name -> how many test results point to it, from every run_data and results.db."""
+        from_runs = []
+        for folder in sorted(glob.glob(os.path.join(runs_dir, "run_*"))):
+            if has_results(folder):
+                from_runs += [entry.get(key) for entry in load_run(folder) if isinstance(entry, dict) for key in ARTIFACT_KEYS]
+        from_db = []
+        db_path = db_path or os.getenv("RESULTS_DB") or DEFAULT_DB
+        if os.path.exists(db_path):
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                from_db = [row[0] for row in conn.execute("SELECT path FROM artifacts")]
+            finally:
+                conn.close()
+        # Most results are in both sources, so each source is counted on its own and the larger count kept
+        counts = {}
+        for paths in (from_runs, from_db):
+            source = {}
+            for path in filter(None, paths):
+                name = os.path.basename(str(path).replace("\\", "/"))
+                source[name] = source.get(name, 0) + 1
+            for name, count in source.items():
+                counts[name] = max(counts.get(name, 0), count)
+        return counts
+
+    def stats(self, references: dict = None) -> dict:
+        references = self.referenced() if references is None else references
+        objects = self.objects()
+        sizes = {os.path.basename(path): os.path.getsize(path) for path in objects}
+        thumbs = sum(os.path.getsize(path) for path in glob.glob(os.path.join(self.root, "??", THUMBS_DIR, "*")))
+        by_kind = {}
+        for name, size in sizes.items():
+            kind = self.index.get(name, {}).get("kind", "unknown")
+            count, total = by_kind.get(kind, (0, 0))
+            by_kind[kind] = (count + 1, total + size)
+        used = {name: references[name] for name in sizes if name in references}
+        return {
+            "objects": len(sizes),
+            "bytes": sum(sizes.values()),
+            "thumbnail_bytes": thumbs,
+            "by_kind": by_kind,
+            "references": sum(used.values()),
+            "unreferenced": len(sizes) - len(used),
+            # What the same references would take as one file each
+            "bytes_saved": sum(sizes[name] * (count - 1) for name, count in used.items()),
+        }
+
+    def collect_garbage(self, references: dict = None, grace_seconds: float = 3600, dry_run: bool = False) -> tuple:
+        """
+        Deletes objects (and their thumbnails) no result references. Objects newer than grace_seconds
+        are kept: a running session may have stored them before recording its result.
+        Returns (objects removed, bytes freed).
+        """
+        references = self.referenced() if references is None else references
+        cutoff = time.time() - grace_seconds
+        removed, freed = [], 0
+        with file_lock(self.index_path):
+            for path in self.objects():
+                name = os.path.basename(path)
+                if name in references or os.path.getmtime(path) > cutoff:
+                    continue
+                thumb = os.path.join(os.path.dirname(path), THUMBS_DIR, name)
+                for victim in (path, thumb):
+                    if os.path.exists(victim):
+                        freed += os.path.getsize(victim)
+                        if not dry_run:
+                            os.remove(victim)
+                removed.append(name)
+            if removed and not dry_run:
+                gone = set(removed)
+                kept = [entry for entry in read_records(self.index_path) if entry.get("object") not in gone]
+                tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in kept)
+                os.replace(tmp_path, self.index_path)
+                self._index = None
+        logging.info(f"🧹 {'Would remove' if dry_run else 'Removed'} {len(removed)} unreferenced artifacts ({freed / 1024 / 1024:.1f} MB)")
+        return len(removed), freed
+
+
+_store = None
+
+
+def artifact_store() -> FattalArtifactStore:
+    """One store per process, configured from ARTIFACT_DIR / ARTIFACT_PHASH_DISTANCE."""
+    global _store
+    if _store is None:
+        _store = FattalArtifactStore(
+            root=os.getenv("ARTIFACT_DIR", DEFAULT_ARTIFACTS_DIR),
+            phash_distance=int(os.getenv("ARTIFACT_PHASH_DISTANCE", "0")),
+        )
+    return _store
+
+
+def save_log(text: str, named_path: str) -> str:
+    """Saves a test's log in the store, or at named_path when the store is off. Returns where it went."""
+    if artifact_store_enabled():
+        return artifact_store().put(text.encode("utf-8"), ".log", "log")
+    with open(named_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return named_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs-dir", default=DEFAULT_RUNS_DIR, help="run folders whose run_data.json reference artifacts")
+    parser.add_argument("--db", help=f"results database whose artifacts table references artifacts (default: RESULTS_DB or {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="size of the store and how much deduplication saves")
+    gc = commands.add_parser("gc", help="delete artifacts no run or database result references")
+    gc.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    gc.add_argument("--grace-minutes", type=float, default=60, help="keep artifacts younger than this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = artifact_store()
+    references = store.referenced(args.runs_dir, args.db)
+    if args.command == "gc":
+        store.collect_garbage(references, args.grace_minutes * 60, args.dry_run)
+        return
+    stats = store.stats(references)
+    print(f"📦 {stats['objects']} artifacts, {stats['bytes'] / 1024 / 1024:.1f} MB "
+          f"(+{stats['thumbnail_bytes'] / 1024 / 1024:.1f} MB thumbnails) in {store.root}")
+    for kind, (count, size) in sorted(stats["by_kind"].items()):
+        print(f"   {kind:<11}{count:>7} files {size / 1024 / 1024:>9.1f} MB")
+    print(f"🔗 {stats['references']} references; deduplication saves {stats['bytes_saved'] / 1024 / 1024:.1f} MB")
+    print(f"🧹 {stats['unreferenced']} artifacts are not referenced by any result (see gc)")
+
+
+if __name__ == "__main__":
+    main()
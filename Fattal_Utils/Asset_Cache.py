@@ -0,0 +1,262 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import trio
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".asset_cache")
+
+# Requests paused by Fetch. Next.js serves everything under /_next/static/ with content-hashed names.
+INTERCEPT_PATTERNS = ["*/_next/static/*", "*.css*"]
+
+# Headers that describe the wire encoding, not the decoded body we hand back to Chrome
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def is_cacheable(url: str, headers: dict) -> bool:
+    """Only immutable static assets are cached — anything else could go stale between runs."""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return "/_next/static/" in url or "immutable" in cache_control
+
+
+class FattalAssetCache:
+    """
+    On-disk, content-addressed store for static assets.
+    Bodies live in blobs/<sha256> (identical bodies under different URLs are stored once),
+    the URL → blob index lives in SQLite so several processes can share the directory.
+    Least recently used entries are evicted once the total size passes max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, "index.sqlite")
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS assets (
+                    url TEXT PRIMARY KEY,
+                    sha TEXT NOT NULL,
+                    etag TEXT,
+                    headers TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_last_access ON assets(last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_sha ON assets(sha)")
+
+    def _connect(self):
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.blob_dir, sha[:2], sha)
+
+    def get(self, url: str):
+        """Returns (headers, body) for a cached URL, or None."""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT sha, headers FROM assets WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            sha, headers = row
+            try:
+                with open(self._blob_path(sha), "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                # Another process evicted the blob under us
+                conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+                return None
+            conn.execute("UPDATE assets SET last_access = ? WHERE url = ?", (time.time(), url))
+        return json.loads(headers), body
+
+    def put(self, url: str, headers: dict, body: bytes):
+        sha = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(sha)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, blob_path)
+
+        kept = {k: v for k, v in headers.items() if k not in _DROPPED_HEADERS}
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO assets (url, sha, etag, headers, size, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha, headers.get("etag"), json.dumps(kept), len(body), time.time()),
+            )
+        self.evict()
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        with closing(self._connect()) as conn, conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = conn.execute("SELECT url, sha, size FROM assets ORDER BY last_access").fetchall()
+            for url, sha, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+                total -= size
+                still_used = conn.execute("SELECT 1 FROM assets WHERE sha = ? LIMIT 1", (sha,)).fetchone()
+                if not still_used:
+                    try:
+                        os.remove(self._blob_path(sha))
+                    except FileNotFoundError:
+                        pass
+        logging.info(f"🧹 Asset cache trimmed to {total / 1024 / 1024:.1f} MB.")
+
+
+class FattalAssetInterceptor:
+    """
+    Serves cached static assets to one Chrome instance through CDP Fetch.
+    Fetch events need a live DevTools connection, so this runs Selenium's
+    bidi_connection() on a background trio thread for the driver's lifetime.
+    """
+
+    def __init__(self, driver, cache: FattalAssetCache):
+        self.driver = driver
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self._ready = threading.Event()
+        self._scope = None
+        self._token = None
+        self._thread = None
+
+    def start(self, timeout: float = 10):
+        self._thread = threading.Thread(target=self._run, name="asset-cache", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            logging.warning("⚠️ Asset cache interceptor did not start in time — continuing without it.")
+
+    def stop(self):
+        if self._scope is not None and self._token is not None:
+            try:
+                trio.from_thread.run_sync(self._scope.cancel, trio_token=self._token)
+            except (trio.RunFinishedError, RuntimeError):
+                pass
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    def stats(self) -> dict:
+        return {
+            "asset_cache_hits": self.hits,
+            "asset_cache_misses": self.misses,
+            "asset_cache_bytes_served": self.bytes_served,
+        }
+
+    def _run(self):
+        try:
+            trio.run(self._serve)
+        except Exception as e:
+            # The browser going away closes the DevTools socket — that is the normal way out
+            logging.debug(f"Asset cache interceptor stopped: {e}")
+        finally:
+            self._ready.set()
+
+    async def _serve(self):
+        self._token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as scope:
+            self._scope = scope
+            async with self.driver.bidi_connection() as conn:
+                fetch = conn.devtools.fetch
+                patterns = [
+                    fetch.RequestPattern(url_pattern=pattern, request_stage=stage)
+                    for pattern in INTERCEPT_PATTERNS
+                    for stage in (fetch.RequestStage.REQUEST, fetch.RequestStage.RESPONSE)
+                ]
+                await conn.session.execute(fetch.enable(patterns=patterns))
+                self._ready.set()
+                # One task per paused request, so a slow cache write doesn't hold up the others
+                async with trio.open_nursery() as nursery:
+                    async for event in conn.session.listen(fetch.RequestPaused, buffer_size=1000):
+                        nursery.start_soon(self._handle_or_continue, conn, event)
+
+    async def _handle_or_continue(self, conn, event):
+        """A paused request must always be released, or the page waits on it until the test times out."""
+        try:
+            await self._handle(conn, event)
+        except Exception as e:
+            logging.debug(f"Asset cache could not handle {event.request.url}: {e} — continuing it uncached.")
+            try:
+                await conn.session.execute(conn.devtools.fetch.continue_request(event.request_id))
+            except Exception as e:
+                logging.debug(f"Could not continue {event.request.url}: {e}")
+
+    async def _handle(self, conn, event):
+        fetch = conn.devtools.fetch
+        session = conn.session
+        url = event.request.url
+
+        if event.response_status_code is None and event.response_error_reason is None:
+            cached = await trio.to_thread.run_sync(self.cache.get, url)
+            if cached is None:
+                self.misses += 1
+                await session.execute(fetch.continue_request(event.request_id))
+                return
+            headers, body = cached
+            self.hits += 1
+            self.bytes_served += len(body)
+            await session.execute(fetch.fulfill_request(
+                event.request_id,
+                response_code=200,
+                response_headers=[fetch.HeaderEntry(name=k, value=v) for k, v in headers.items()],
+                body=base64.b64encode(body).decode("ascii"),
+            ))
+            return
+
+        headers = {h.name.lower(): h.value for h in (event.response_headers or [])}
+        if event.response_status_code == 200 and is_cacheable(url, headers):
+            body, is_base64 = await session.execute(fetch.get_response_body(event.request_id))
+            raw = base64.b64decode(body) if is_base64 else body.encode("utf-8")
+            await session.execute(fetch.continue_request(event.request_id))
+            try:
+                await trio.to_thread.run_sync(self.cache.put, url, headers, raw)
+            except Exception as e:
+                logging.debug(f"Asset cache could not store {url}: {e}")
+            return
+        await session.execute(fetch.continue_request(event.request_id))
+
+
+def asset_cache_enabled() -> bool:
+    return os.getenv("ASSET_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+_shared_cache = None
+
+
+def shared_asset_cache() -> FattalAssetCache:
+    """One FattalAssetCache per process, configured from ASSET_CACHE_DIR / ASSET_CACHE_MAX_MB."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = FattalAssetCache(
+            cache_dir=os.getenv("ASSET_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(os.getenv("ASSET_CACHE_MAX_MB", "500")) * 1024 * 1024,
+        )
+    return _shared_cache
+
+
+def asset_interceptor_for(driver) -> FattalAssetInterceptor:
+    interceptor = getattr(driver, "_fattal_asset_interceptor", None)
+    if interceptor is None:
+        interceptor = FattalAssetInterceptor(driver, shared_asset_cache())
+        driver._fattal_asset_interceptor = interceptor
+        if asset_cache_enabled():
+            interceptor.start()
+    return interceptor
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: WebDriverWait polling vs. FattalDomWait (MutationObserver) on a local fixture.
+
+    python -m Fattal_Utils.Benchmarks.Dom_Wait_Benchmark --runs 10
+
+For every delay the fixture renders a button after that many milliseconds and both engines
+wait for it. "Overshoot" is how long after the button appeared the wait returned,
+"round trips" is the number of WebDriver commands the wait issued.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.Driver_Factory import PROFILES, build_options
+
+FIXTURE_URL = Path(__file__).with_name("dom_wait_fixture.html").resolve().as_uri()
+TARGET = (By.ID, "target")
+DELAYS_MS = (100, 350, 800, 1500)
+
+ENGINES = {
+    "WebDriverWait": lambda driver, ec, dc: WebDriverWait(driver, 10).until(ec(TARGET)),
+    "FattalDomWait": lambda driver, ec, dc: FattalDomWait(driver, 10).until(dc(TARGET)),
+}
+CONDITIONS = {
+    # mode: (EC condition, DOM condition)
+    "insert": (EC.presence_of_element_located, DC.presence_of_element_located),
+    "reveal": (EC.visibility_of_element_located, DC.visibility_of_element_located),
+}
+
+
+def count_round_trips(driver) -> dict:
+    """Counts every WebDriver command sent through driver.execute."""
+    counter = {"commands": 0}
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        counter["commands"] += 1
+        return original(driver_command, params)
+
+    driver.execute = execute
+    return counter
+
+
+def measure(driver, counter, engine, mode, delay_ms):
+    ec, dc = CONDITIONS[mode]
+    driver.execute_script("window.scheduleTarget(arguments[0], arguments[1]);", delay_ms, mode)
+    start = time.monotonic()
+    counter["commands"] = 0
+    ENGINES[engine](driver, ec, dc)
+    elapsed_ms = (time.monotonic() - start) * 1000
+    return max(elapsed_ms - delay_ms, 0), counter["commands"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="repetitions per delay and engine")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args()
+
+    driver = webdriver.Chrome(options=build_options(PROFILES["desktop"], headless=not args.headed))
+    try:
+        driver.get(FIXTURE_URL)
+        counter = count_round_trips(driver)
+        print(f"{'mode':<8}{'delay':>7}  {'engine':<15}{'overshoot p50':>15}{'overshoot max':>15}{'round trips':>13}")
+        for mode in CONDITIONS:
+            for delay_ms in DELAYS_MS:
+                for engine in ENGINES:
+                    samples = [measure(driver, counter, engine, mode, delay_ms) for _ in range(args.runs)]
+                    overshoots = [s[0] for s in samples]
+                    trips = [s[1] for s in samples]
+                    print(
+                        f"{mode:<8}{delay_ms:>5}ms  {engine:<15}"
+                        f"{statistics.median(overshoots):>13.0f}ms{max(overshoots):>13.0f}ms"
+                        f"{statistics.mean(trips):>13.1f}"
+                    )
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
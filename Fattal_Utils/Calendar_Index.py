@@ -0,0 +1,180 @@
+import calendar
+import logging
+import random
+import re
+import time
+from collections import namedtuple
+from datetime import date
+
+# Date pickers whose tile ids carry the date (search-engine-date-picker-tile-inner2025-11-03)
+_DATED_ID = re.compile(r"(\d{4})-(\d{2})-(\d{2})$")
+
+# react-calendar aria-labels: "3 בנובמבר 2025" on the Hebrew site, "November 3, 2025" on the English one
+_HEBREW_MONTHS = ["ינואר", "פברואר", "מרץ", "אפריל", "מאי", "יוני",
+                  "יולי", "אוגוסט", "ספטמבר", "אוקטובר", "נובמבר", "דצמבר"]
+_MONTHS = {name: i + 1 for i, name in enumerate(_HEBREW_MONTHS)}
+_MONTHS.update({calendar.month_name[i].lower(): i for i in range(1, 13)})
+_DAY_MONTH_YEAR = re.compile(r"(\d{1,2})\s+ב?(\S+)\s+(\d{4})")
+_MONTH_DAY_YEAR = re.compile(r"([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})")
+
+CalendarTile = namedtuple("CalendarTile", "index id label date month disabled neighboring rect")
+
+# Every tile of the calendar in one call: id, label, month container, disabled/neighbouring
+# flags and its rect. Tiles are numbered in document order, the position click() finds them by.
+_SNAPSHOT_JS = """
+const [tileSelector, monthSelector] = arguments;
+const containers = [];
+return Array.from(document.querySelectorAll(tileSelector)).map(el => {
+    let month = -1;
+    const container = monthSelector ? el.closest(monthSelector) : null;
+    if (container) {
+        month = containers.indexOf(container);
+        if (month < 0) month = containers.push(container) - 1;
+    }
+    const abbr = el.querySelector('abbr[aria-label]');
+    const cls = el.getAttribute('class') || '';
+    const r = el.getBoundingClientRect();
+    return {
+        id: el.id || '',
+        label: el.getAttribute('aria-label') || (abbr && abbr.getAttribute('aria-label')) || el.innerText.trim(),
+        month: month,
+        disabled: el.disabled === true || el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true'
+            || cls.includes('tile--disabled'),
+        neighboring: cls.includes('neighboringMonth'),
+        rect: [r.x, r.y, r.width, r.height],
+    };
+});
+"""
+
+# Scrolls the tile into view and clicks it with the pointer/mouse events a real tap sends
+_CLICK_JS = """
+const [tileSelector, index, id] = arguments;
+let el = document.querySelectorAll(tileSelector)[index];
+if (!el || (id && el.id !== id)) el = id ? document.getElementById(id) : null;
+if (!el) return false;
+el.scrollIntoView({block: 'center'});
+const r = el.getBoundingClientRect();
+const init = {bubbles: true, cancelable: true, view: window, clientX: r.x + r.width / 2, clientY: r.y + r.height / 2};
+el.dispatchEvent(new PointerEvent('pointerdown', init));
+el.dispatchEvent(new MouseEvent('mousedown', init));
+el.dispatchEvent(new PointerEvent('pointerup', init));
+el.dispatchEvent(new MouseEvent('mouseup', init));
+el.click();
+return true;
+"""
+
+
+class FattalCalendarIndex:
+    """
+    In-Python index of a date picker, built from a single script call instead of a
+    find_elements + get_attribute round trip per day tile. Range queries run locally;
+    only the final clicks go back to the browser.
+
+    month: the 0-based month container the tile sits in (-1 when month_selector is not given),
+    date: a datetime.date parsed from the tile id or its aria-label, else None.
+    """
+
+    def __init__(self, driver, tile_selector: str, month_selector: str = None, months: int = 0, timeout: float = 0):
+        self.driver = driver
+        self.tile_selector = tile_selector
+        self.month_selector = month_selector
+        self.tiles = []
+        self.refresh(months, timeout)
+
+    def refresh(self, months: int = 0, timeout: float = 0):
+        """
+        Re-reads every tile. With months, keeps re-reading for up to timeout seconds until that
+        many month containers hold tiles — the picker renders its months after it opens.
+        """
+        start = time.monotonic()
+        while True:
+            raw = self.driver.execute_script(_SNAPSHOT_JS, self.tile_selector, self.month_selector) or []
+            self.tiles = [
+                CalendarTile(i, t["id"], t["label"], self._parse_date(t["id"], t["label"]), t["month"],
+                             t["disabled"], t["neighboring"], tuple(t["rect"]))
+                for i, t in enumerate(raw)
+            ]
+            if self.month_count() >= months or time.monotonic() - start >= timeout:
+                break
+            time.sleep(0.25)
+        logging.info(
+            f"🗓 Indexed {len(self.tiles)} calendar tiles ({len(self.available())} available, "
+            f"{self.month_count()} months) in {(time.monotonic() - start) * 1000:.0f} ms."
+        )
+        return self
+
+    @staticmethod
+    def _parse_date(tile_id: str, label: str = ""):
+        try:
+            match = _DATED_ID.search(tile_id or "")
+            if match:
+                return date(*map(int, match.groups()))
+            match = _DAY_MONTH_YEAR.search(label or "")
+            if match and match.group(2) in _MONTHS:
+                return date(int(match.group(3)), _MONTHS[match.group(2)], int(match.group(1)))
+            match = _MONTH_DAY_YEAR.search(label or "")
+            if match and match.group(1).lower() in _MONTHS:
+                return date(int(match.group(3)), _MONTHS[match.group(1).lower()], int(match.group(2)))
+        except ValueError:
+            pass
+        return None
+
+    def month_count(self) -> int:
+        return len({t.month for t in self.tiles if t.month >= 0})
+
+    def available(self, month=None) -> list:
+        """
+        Enabled, rendered tiles of the shown month, in calendar order.
+        month: a month container position (int), a (year, month) tuple matched against tile
+        dates, or None for all months.
+        """
+        def in_month(tile):
+            if month is None:
+                return True
+            if isinstance(month, tuple):
+                return tile.date is not None and (tile.date.year, tile.date.month) == month
+            return tile.month == month
+
+        return [
+            t for t in self.tiles
+            if not t.disabled and not t.neighboring and t.rect[2] > 0 and t.rect[3] > 0 and in_month(t)
+        ]
+
+    def find(self, label_text: str, month=None):
+        """The first available tile whose label contains label_text, or None."""
+        return next((t for t in self.available(month) if label_text in t.label), None)
+
+    def by_date(self, day: date):
+        """The available tile for `day`, or None."""
+        return next((t for t in self.available() if t.date == day), None)
+
+    def _ranges(self, nights: int, month=None) -> list:
+        tiles = self.available(month)
+        ranges = []
+        for i in range(len(tiles) - nights):
+            check_in, check_out = tiles[i], tiles[i + nights]
+            # With dated tiles a range must be N calendar days; otherwise N available tiles apart
+            if check_in.date and check_out.date and (check_out.date - check_in.date).days != nights:
+                continue
+            ranges.append((check_in, check_out))
+        return ranges
+
+    def first_range(self, nights: int, month=None):
+        """The earliest (check_in, check_out) pair `nights` apart in `month`, or None."""
+        ranges = self._ranges(nights, month)
+        return ranges[0] if ranges else None
+
+    def random_range(self, min_nights: int, max_nights: int = None, month=None):
+        """A random (check_in, check_out, nights) with min_nights..max_nights nights, or None."""
+        nights_options = list(range(min_nights, (max_nights or min_nights) + 1))
+        random.shuffle(nights_options)
+        for nights in nights_options:
+            ranges = self._ranges(nights, month)
+            if ranges:
+                check_in, check_out = random.choice(ranges)
+                return check_in, check_out, nights
+        return None
+
+    def click(self, tile: CalendarTile):
+        if not self.driver.execute_script(_CLICK_JS, self.tile_selector, tile.index, tile.id):
+            raise Exception(f"Calendar tile '{tile.label}' is no longer in the DOM")
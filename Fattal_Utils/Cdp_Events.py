@@ -0,0 +1,52 @@
+import json
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+
+class FattalCdpEventLog:
+    """
+    Reads CDP events out of Chrome's performance log and hands them to listeners.
+    The performance log is drained on every read, so all consumers of one driver
+    must share a single instance — use event_log_for(driver).
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """callback(method, params, timestamp_ms) is called for every event pumped."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def pump(self) -> int:
+        """Drains the performance log and dispatches the events. Returns the event count."""
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException as e:
+            logging.debug(f"Performance log unavailable: {e}")
+            return 0
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method", "")
+            params = message.get("params", {})
+            for callback in list(self._listeners):
+                callback(method, params, entry.get("timestamp", 0))
+        return len(entries)
+
+
+def event_log_for(driver) -> FattalCdpEventLog:
+    event_log = getattr(driver, "_fattal_event_log", None)
+    if event_log is None:
+        event_log = FattalCdpEventLog(driver)
+        driver._fattal_event_log = event_log
+    return event_log
@@ -0,0 +1,323 @@
+import json
+import logging
+import os
+from datetime import datetime
+
+from Fattal_Utils.Result_Sink import SEGMENTS_DIR, RUN_DATA, file_lock, has_results, load_run, write_json_atomic
+
+MANIFEST = "manifest.json"
+# The page is opened from disk (file://), where fetch() is blocked, so the manifest and each
+# run's data are also written as small scripts the page loads with <script src>
+MANIFEST_JS = "manifest.js"
+RUN_DATA_JS = "dashboard_data.js"
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <title>🧪 Fattal QA Automation Dashboard</title>
+  <style>
+    body {
+      font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+      background-color: #f9f9f9;
+      margin: 20px;
+      color: #333;
+    }
+    .dashboard-header {
+      display: flex;
+      align-items: center;
+      justify-content: space-between;
+      margin-bottom: 10px;
+      gap: 24px;
+    }
+    .dashboard-header h1 {
+      margin: 0;
+      font-size: 1.8em;
+      display: flex;
+      align-items: center;
+      white-space: nowrap;
+    }
+    .dashboard-header h1::before {
+      content: '🧪';
+      margin-right: 10px;
+    }
+    .header-logo {
+      height: 60px;
+      max-width: 200px;
+      object-fit: contain;
+      border-radius: 8px;
+      background: #fff;
+      padding: 6px 12px;
+      box-shadow: 0 2px 8px rgba(0,0,0,0.04);
+    }
+    @media (max-width: 700px) {
+      .dashboard-header {
+        flex-direction: column;
+        align-items: flex-start;
+        gap: 8px;
+      }
+      .header-logo {
+        margin-left: 0;
+        margin-top: 6px;
+        height: 44px;
+        max-width: 150px;
+      }
+    }
+    select {
+      font-size: 14px;
+      padding: 5px;
+      margin-left: 10px;
+    }
+    .test-entry {
+      background: #fff;
+      border-radius: 6px;
+      padding: 15px;
+      margin-bottom: 20px;
+      box-shadow: 0 1px 4px rgba(0,0,0,0.1);
+      transition: background 0.3s ease;
+    }
+    .test-entry:hover {
+      background: #f0f8ff;
+    }
+    .screenshot-grid {
+      display: flex;
+      gap: 12px;
+      margin-top: 10px;
+      flex-wrap: wrap;
+    }
+    .screenshot-grid img {
+      border-radius: 4px;
+      border: 1px solid #ccc;
+    }
+    .modal {
+      display: none;
+      position: fixed;
+      z-index: 999;
+      left: 0; top: 0; width: 100%; height: 100%;
+      background-color: rgba(0,0,0,0.85);
+    }
+    .modal-content {
+      margin: 5% auto;
+      display: block;
+      max-width: 90vw;
+      max-height: 80vh;
+    }
+    .close {
+      position: absolute;
+      top: 15px;
+      right: 35px;
+      color: #fff;
+      font-size: 40px;
+      font-weight: bold;
+      cursor: pointer;
+    }
+  </style>
+  <script src="runs/manifest.js"></script>
+  <script>
+    // Filled run by run: runs/<run>/dashboard_data.js calls fattalRunLoaded when its <script> loads
+    const runData = {};
+    window.fattalRunLoaded = (runId, tests) => { runData[runId] = tests; };
+
+    function loadRun(runId, done) {
+        if (runData[runId]) return done();
+        const entry = (window.FATTAL_RUNS || []).find(run => run.run_id === runId) || {};
+        const script = document.createElement("script");
+        script.src = `runs/${runId}/dashboard_data.js?v=${entry.updated || ""}`;
+        script.onload = done;
+        script.onerror = () => { runData[runId] = []; done(); };
+        document.head.appendChild(script);
+    }
+
+    // Artifact paths are absolute on the machine that ran the test; link them relative to Fattal_Tests
+    function reportHref(path) {
+        const normalized = path.replace(/\\\\/g, '/');
+        for (const folder of ["/Artifacts/", "/Screenshots/"]) {
+            if (normalized.includes(folder)) return ".." + folder + normalized.split(folder).pop();
+        }
+        const parts = normalized.split('/');
+        return parts.length >= 2 ? "../" + parts.slice(-2).join('/') : normalized;
+    }
+
+    function fillRunSelect() {
+        const select = document.getElementById("runSelect");
+        (window.FATTAL_RUNS || []).forEach((run, i) => {
+            const option = document.createElement("option");
+            option.value = run.run_id;
+            option.textContent = run.label;
+            option.selected = i === 0;
+            select.appendChild(option);
+        });
+        populateRun(select.value);
+    }
+
+    function populateRun(runId) {
+        if (!runId) return;
+        loadRun(runId, () => renderRun(runId));
+    }
+
+    function renderRun(runId) {
+        const container = document.getElementById("results");
+        container.innerHTML = "";
+        const showPassed = document.getElementById("filterPassed").checked;
+        const showFailed = document.getElementById("filterFailed").checked;
+        const data = runData[runId] || [];
+        data.forEach(test => {
+            if ((test.status === "PASSED" && !showPassed) || (test.status === "FAILED" && !showFailed)) return;
+
+            const div = document.createElement("div");
+            div.classList.add("test-entry");
+
+            const logPath = test.log || "";
+            const logHref = logPath ? reportHref(logPath) : "#";
+
+            const screenshots = ["room_selection", "payment_stage", test.status === "FAILED" ? "error_screenshot" : "confirmation_screenshot"]
+              .map(label => {
+                  const path = test[label] || "";
+                  if (!path) return "";
+                  const full = reportHref(path);
+                  // Thumbnails sit in thumbs/ next to the screenshot; older runs only have the full PNG
+                  const thumb = full.replace(/([^/]*)$/, "thumbs/$1");
+                  return `<div><strong>${label}:</strong><br><img src="${thumb}" loading="lazy" onerror="this.onerror=null;this.src='${full}'" style="max-height:120px;cursor:pointer;" onclick="openModal('${full}')" /></div>`;
+              }).join("");
+
+            div.innerHTML = `
+              <h3>${test.name} — <span style="color:${test.status === 'PASSED' ? 'green' : 'red'}">${test.status}</span></h3>
+              <p><strong>Description:</strong> ${test.description || "—"}</p>
+              <p><strong>Timestamp:</strong> ${test.timestamp} | <strong>Duration:</strong> ${test.duration}</p>
+              <p><strong>Guest:</strong> ${test.full_name} | <strong>Email:</strong> ${test.email}</p>
+              <p><strong>Order #:</strong> ${test.order_number} | <strong>ID:</strong> ${test.id_number}</p>
+              <p><strong>Log:</strong> <a href="${logHref}" target="_blank">${logPath.split(/[\\\\/]/).pop()}</a></p>
+              ${test.error ? `<p style='color:red'><strong>Error:</strong> ${test.error}</p>` : ""}
+              <div class="screenshot-grid">${screenshots}</div>
+              <hr>`;
+            container.appendChild(div);
+        });
+    }
+
+    function openModal(src) {
+        const modal = document.getElementById("screenshotModal");
+        const modalImg = document.getElementById("modalImage");
+        modal.style.display = "block";
+        modalImg.src = src;
+    }
+
+    function closeModal() {
+        document.getElementById("screenshotModal").style.display = "none";
+    }
+  </script>
+</head>
+<body onload="fillRunSelect()">
+  <div class="dashboard-header">
+    <h1>Fattal QA Automation Dashboard</h1>
+    <img src="https://d2nyvxq412w7ra.cloudfront.net/_fcb5f25e78.png" alt="Fattal Logo" class="header-logo" />
+  </div>
+  <label>Choose Run:
+    <select id="runSelect" onchange="populateRun(this.value)"></select>
+  </label>
+  <div style="margin-top: 10px;">
+    <label><input type="checkbox" id="filterPassed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Passed</label>
+    <label><input type="checkbox" id="filterFailed" checked onchange="populateRun(document.getElementById('runSelect').value)"> Show Failed</label>
+  </div>
+  <div id="results" style="margin-top: 20px;"></div>
+  <div id="screenshotModal" class="modal" onclick="closeModal()">
+    <span class="close">&times;</span>
+    <img class="modal-content" id="modalImage">
+  </div>
+</body>
+</html>
+"""
+
+
+def _source_mtime(run_folder: str) -> float:
+    """Last change to a run's results, compacted or not."""
+    paths = [os.path.join(run_folder, RUN_DATA)]
+    segments_dir = os.path.join(run_folder, SEGMENTS_DIR)
+    if os.path.isdir(segments_dir):
+        paths += [os.path.join(segments_dir, name) for name in os.listdir(segments_dir) if name.endswith(".jsonl")]
+    return max((os.path.getmtime(path) for path in paths if os.path.exists(path)), default=0.0)
+
+
+def _write_text(path: str, text: str):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _run_entry(run_folder: str) -> dict:
+    """Writes the run's dashboard_data.js and returns its manifest entry."""
+    run_id = os.path.basename(os.path.normpath(run_folder))
+    data = load_run(run_folder)
+    _write_text(
+        os.path.join(run_folder, RUN_DATA_JS),
+        f"fattalRunLoaded({json.dumps(run_id)}, {json.dumps(data, ensure_ascii=False)});\n",
+    )
+
+    total = len(data)
+    failed = sum(1 for t in data if t.get("status") == "FAILED")
+    passed = total - failed
+    mobile = sum(1 for t in data if t.get("test_type") == "mobile")
+    desktop = sum(1 for t in data if t.get("test_type") == "desktop")
+
+    try:
+        run_datetime = datetime.strptime(run_id.replace("run_", ""), "%Y-%m-%d_%H-%M-%S")
+        label = f"{run_datetime:%A} {run_datetime:%Y-%m-%d %H:%M:%S}"
+    except ValueError:
+        label = run_id
+    label += f" | {total} tests | ✅ {passed} | ❌ {failed}"
+    if mobile:
+        label += f" | 📱 {mobile}"
+    if desktop:
+        label += f" | 💻 {desktop}"
+    return {"run_id": run_id, "label": label, "updated": _source_mtime(run_folder)}
+
+
+def update_dashboard(runs_base_dir: str, run_folder: str = None) -> str:
+    """
+    Brings html_reports/dashboard.html up to date. With run_folder, only that run's data file and
+    manifest entry are rewritten; without it, every run whose results changed since its entry was
+    written (all runs, the first time). The page itself is a fixed shell that loads the manifest
+    and then one run at a time, so it stays the same size however many runs there are.
+    """
+    dashboard_path = os.path.join(runs_base_dir, "..", "dashboard.html")
+    manifest_path = os.path.join(runs_base_dir, MANIFEST)
+    os.makedirs(runs_base_dir, exist_ok=True)
+
+    with file_lock(manifest_path):
+        entries = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                entries = {entry["run_id"]: entry for entry in json.load(f)}
+
+        if run_folder and entries:
+            folders = [run_folder]
+        else:
+            folders = [
+                os.path.join(runs_base_dir, d) for d in os.listdir(runs_base_dir)
+                if d.startswith("run_") and os.path.isdir(os.path.join(runs_base_dir, d))
+            ]
+        for folder in folders:
+            run_id = os.path.basename(os.path.normpath(folder))
+            if not has_results(folder):
+                continue
+            known = entries.get(run_id)
+            if known and folder != run_folder and known["updated"] >= _source_mtime(folder):
+                continue
+            entries[run_id] = _run_entry(folder)
+
+        manifest = sorted(entries.values(), key=lambda entry: entry["run_id"], reverse=True)
+        write_json_atomic(manifest_path, manifest)
+        _write_text(
+            os.path.join(runs_base_dir, MANIFEST_JS),
+            f"window.FATTAL_RUNS = {json.dumps(manifest, ensure_ascii=False)};\n",
+        )
+
+    current = None
+    if os.path.exists(dashboard_path):
+        with open(dashboard_path, "r", encoding="utf-8") as f:
+            current = f.read()
+    if current != _PAGE:
+        _write_text(dashboard_path, _PAGE)
+
+    logging.info(f"✅ Dashboard updated at: {dashboard_path} ({len(folders)} run(s) checked)")
+    return dashboard_path
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import random
+from datetime import date, timedelta
+from urllib.parse import quote
+
+from selenium.webdriver.common.by import By
+
+from Fattal_Utils.Wait_Policy import FattalWaitPolicy
+
+WIDGET = "widget"
+DEEP_LINK = "deep_link"
+
+# Site hotel ids, keyed by the name typed into the search widget. The same id goes into the
+# search/chooseRoom deep links and into orders_to_cancel.json, so every suite reads it from here.
+HOTEL_IDS = {
+    "לאונרדו נגב, באר שבע": "10048",
+    "לאונרדו פלאזה אילת": "10038",
+}
+
+# {check_in}/{check_out} are dates, so templates pick their own format ({check_in:%d/%m/%Y});
+# {rooms} is the occupancy as compact JSON, {adults}/{children}/{infants} are the totals.
+URL_TEMPLATES = {
+    "search": "{base}/search?hotelId={hotel_id}&checkIn={check_in:%Y-%m-%d}&checkOut={check_out:%Y-%m-%d}&rooms={rooms}",
+    "chooseRoom": "{base}/chooseRoom/{hotel_id}?checkIn={check_in:%Y-%m-%d}&checkOut={check_out:%Y-%m-%d}&rooms={rooms}",
+}
+
+# One read of what a results page shows, used to compare two ways of getting there
+_RESULT_SET_JS = """
+const paths = Array.from(document.querySelectorAll("a[href*='/chooseRoom/']"))
+    .map(a => new URL(a.href, location.href).pathname);
+const priceButtons = Array.from(document.querySelectorAll('button')).filter(b =>
+    (b.id || '').startsWith('room-price-button') || ['הצג מחירים', 'להזמנת חדר'].includes(b.textContent.trim()));
+return {
+    url: location.href,
+    choose_room: Array.from(new Set(paths)).sort(),
+    price_buttons: priceButtons.length,
+    no_results: !!document.getElementById('search-engine-no-search-results-title')
+        || !!document.getElementById('search-page-no-search-results-title'),
+};
+"""
+
+_RESULTS_LOCATORS = {
+    "fallback": (By.CSS_SELECTOR, "div.sc-32916819-1"),
+    "results": (By.XPATH, "//button[starts-with(@id, 'room-price-button') or normalize-space()='הצג מחירים' or normalize-space()='להזמנת חדר']"),
+}
+
+
+def search_entry() -> str:
+    """How booking tests reach the results page: SEARCH_ENTRY=widget (default) or deep_link."""
+    entry = os.getenv("SEARCH_ENTRY", WIDGET).strip().lower()
+    return entry if entry in (WIDGET, DEEP_LINK) else WIDGET
+
+
+def hotel_id(hotel_name: str):
+    return HOTEL_IDS.get(hotel_name)
+
+
+def stay_months_ahead(months_ahead: int, nights: int, today: date = None) -> tuple:
+    """A random (check_in, check_out) inside the calendar month `months_ahead` from today."""
+    today = today or date.today()
+    month_index = today.month - 1 + months_ahead
+    first = date(today.year + month_index // 12, month_index % 12 + 1, 1)
+    next_first = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+    last_start = (next_first - first).days - 1 - nights
+    check_in = first + timedelta(days=random.randint(0, max(last_start, 0)))
+    return check_in, check_in + timedelta(days=nights)
+
+
+def build_url(hotel_name: str, check_in: date, check_out: date, rooms: list, kind: str = "search", base: str = None) -> str:
+    """
+    Deep link to the results (kind="search") or room selection (kind="chooseRoom") page.
+    rooms: [{"adults": 2, "children": 1, "infants": 0}, ...]
+    Override the templates with DEEP_LINK_SEARCH_URL / DEEP_LINK_CHOOSEROOM_URL.
+    """
+    hid = hotel_id(hotel_name)
+    if hid is None:
+        raise KeyError(f"No hotel id for '{hotel_name}' — add it to HOTEL_IDS to deep-link it.")
+    template = os.getenv(f"DEEP_LINK_{kind.upper()}_URL") or URL_TEMPLATES[kind]
+    rooms = [{g: int(room.get(g, 0)) for g in ("adults", "children", "infants")} for room in rooms]
+    return template.format(
+        base=(base or os.getenv("ENV_ACTIVE", "")).rstrip("/"),
+        hotel_id=hid,
+        check_in=check_in,
+        check_out=check_out,
+        rooms=quote(json.dumps(rooms, separators=(",", ":"))),
+        adults=sum(r["adults"] for r in rooms),
+        children=sum(r["children"] for r in rooms),
+        infants=sum(r["infants"] for r in rooms),
+    )
+
+
+def result_set(driver, name: str = "search_results") -> dict:
+    """Waits for a results page (or its no-results fallback) and reads what it lists in one call."""
+    FattalWaitPolicy(driver).first_of(_RESULTS_LOCATORS, name)
+    return driver.execute_script(_RESULT_SET_JS)
+
+
+def same_results(widget: dict, deep_link: dict) -> list:
+    """Differences between two result_set() reads; empty when both paths landed on the same results."""
+    return [
+        f"{key}: widget={widget[key]} deep_link={deep_link[key]}"
+        for key in ("choose_room", "price_buttons", "no_results")
+        if widget[key] != deep_link[key]
+    ]
+
+
+def log_contract(widget: dict, deep_link: dict) -> list:
+    differences = same_results(widget, deep_link)
+    logging.info(f"🔗 Widget landed on {widget['url']}")
+    logging.info(f"🔗 Deep link landed on {deep_link['url']}")
+    if differences:
+        logging.error("❌ Deep link and search widget disagree — " + "; ".join(differences))
+    else:
+        logging.info(f"✅ Deep link matches the search widget ({deep_link['price_buttons']} priced rooms).")
+    return differences
@@ -0,0 +1,88 @@
+from selenium.webdriver.common.by import By
+
+# Evaluated inside the page. Returns the condition's result, or null while it is not met.
+CHECK_JS = """
+function (how, what, kind, arg) {
+    let nodes;
+    if (how === 'xpath') {
+        const snapshot = document.evaluate(what, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+    } else {
+        nodes = Array.from(document.querySelectorAll(what));
+    }
+    const visible = el => {
+        const style = window.getComputedStyle(el);
+        return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+    };
+    switch (kind) {
+        case 'present': return nodes.length ? nodes[0] : null;
+        case 'visible': return nodes.find(visible) || null;
+        case 'text': return nodes.length && (nodes[0].innerText || nodes[0].textContent || '').includes(arg) ? true : null;
+        case 'count': return nodes.length >= arg ? nodes : null;
+    }
+    return null;
+}
+"""
+
+
+def _dom_selector(locator):
+    """Turns a Selenium (By, value) locator into something the page can evaluate itself."""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR or by == By.TAG_NAME:
+        return "css", value
+    if by == By.ID:
+        return "css", '[id="{}"]'.format(value.replace('"', '\\"'))
+    if by == By.NAME:
+        return "css", '[name="{}"]'.format(value.replace('"', '\\"'))
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    raise ValueError(f"Locator strategy {by!r} is not supported by DOM conditions")
+
+
+class DomCondition:
+    """
+    A condition evaluated inside the page. FattalDomWait resolves it with a MutationObserver;
+    calling it directly (e.g. from WebDriverWait) checks it once, like the EC equivalent.
+    """
+
+    def __init__(self, kind: str, locator, arg=None):
+        self.kind = kind
+        self.locator = locator
+        self.how, self.what = _dom_selector(locator)
+        self.arg = arg
+
+    def script_args(self):
+        return [self.how, self.what, self.kind, self.arg]
+
+    def __call__(self, driver):
+        result = driver.execute_script(f"return ({CHECK_JS}).apply(null, arguments);", *self.script_args())
+        return result if result is not None else False
+
+    def __repr__(self):
+        return f"{self.kind}{self.locator}"
+
+
+# Drop-in counterparts of the selenium expected_conditions used across the page objects
+
+def presence_of_element_located(locator) -> DomCondition:
+    return DomCondition("present", locator)
+
+
+def visibility_of_element_located(locator) -> DomCondition:
+    """Resolves with the first matching element that is displayed (not just the first match)."""
+    return DomCondition("visible", locator)
+
+
+def text_to_be_present_in_element(locator, text: str) -> DomCondition:
+    return DomCondition("text", locator, text)
+
+
+def presence_of_all_elements_located(locator) -> DomCondition:
+    return DomCondition("count", locator, 1)
+
+
+def number_of_elements_at_least(locator, count: int) -> DomCondition:
+    return DomCondition("count", locator, count)
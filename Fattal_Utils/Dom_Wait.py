@@ -0,0 +1,81 @@
+import logging
+import time
+
+from selenium.common import JavascriptException, StaleElementReferenceException, TimeoutException, WebDriverException
+
+from Fattal_Utils.Dom_Conditions import CHECK_JS
+from Fattal_Utils.Wait_Policy import FattalWait
+
+# Kept below Selenium's default 30s script timeout; longer waits run in several slices
+MAX_SLICE_SECONDS = 20
+
+_OBSERVE_JS = f"""
+const check = {CHECK_JS};
+const [how, what, kind, arg, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const evaluate = () => check(how, what, kind, arg);
+
+const initial = evaluate();
+if (initial !== null) return done(initial);
+
+let finished = false, observer = null, tick = null, timer = null;
+const finish = value => {{
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(tick);
+    clearTimeout(timer);
+    done(value);
+}};
+const recheck = () => {{
+    const value = evaluate();
+    if (value !== null) finish(value);
+}};
+observer = new MutationObserver(recheck);
+observer.observe(document.documentElement, {{childList: true, subtree: true, attributes: true, characterData: true}});
+// Visibility can also change through CSS transitions and layout, which produce no mutations
+tick = setInterval(recheck, 100);
+timer = setTimeout(() => finish(null), timeoutMs);
+"""
+
+
+class FattalDomWait:
+    """
+    Waits for a Dom_Conditions condition inside the page: a MutationObserver injected with
+    execute_async_script resolves the moment the DOM matches, so a wait costs one WebDriver
+    round trip instead of one per 500ms poll.
+    If the page navigates while observing (the script is torn down with the document),
+    the rest of the wait falls back to regular WebDriverWait polling.
+    """
+
+    def __init__(self, driver, timeout: float = 10, poll_frequency: float = 0.5):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def until(self, condition, message: str = ""):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = self.driver.execute_async_script(
+                    _OBSERVE_JS, *condition.script_args(), int(min(remaining, MAX_SLICE_SECONDS) * 1000)
+                )
+            except WebDriverException as e:
+                logging.debug(f"DOM observer for {condition!r} interrupted ({e.msg}) — polling instead.")
+                return self._poll(condition, deadline, message)
+            if result is not None:
+                return result
+        raise TimeoutException(message or f"{condition!r} not met within {self.timeout}s")
+
+    def _poll(self, condition, deadline: float, message: str):
+        remaining = max(deadline - time.monotonic(), self.poll_frequency)
+        return FattalWait(
+            self.driver, remaining, poll_frequency=self.poll_frequency,
+            # The next document may still be unloading when the first polls run
+            ignored_exceptions=(JavascriptException, StaleElementReferenceException),
+        ).until(
+            condition, message or f"{condition!r} not met within {self.timeout}s"
+        )
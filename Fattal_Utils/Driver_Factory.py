@@ -0,0 +1,188 @@
+import logging
+import os
+from dataclasses import dataclass
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from Fattal_Utils.Asset_Cache import asset_interceptor_for
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Network_Idle import network_idle_for
+from Fattal_Utils.Network_Shaping import network_shaper_for
+from Fattal_Utils.Wait_Policy import ExplicitWaitMixin
+from Fattal_Utils.Worker_Env import next_ports, worker_dir, worker_id
+
+
+class FattalChrome(ExplicitWaitMixin, webdriver.Chrome):
+    """Chrome with the explicit-only wait policy (no implicit waits)."""
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """Everything needed to bring up Chrome the same way in headed and headless mode."""
+    name: str
+    width: int
+    height: int
+    window_width: int
+    window_height: int
+    pixel_ratio: float = 1.0
+    user_agent: str = ""
+    mobile: bool = False
+
+
+PROFILES = {
+    "android": DeviceProfile(
+        name="android",
+        width=411,
+        height=850,
+        window_width=411,
+        window_height=950,
+        pixel_ratio=1.0,
+        user_agent=(
+            "Mozilla/5.0 (Linux; Android 10; Pixel 2 XL) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Mobile Safari/537.36"
+        ),
+        mobile=True,
+    ),
+    "ios": DeviceProfile(
+        name="ios",
+        width=390,
+        height=844,
+        window_width=411,
+        window_height=950,
+        pixel_ratio=3.0,
+        user_agent=(
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 15_2 like Mac OS X) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.2 Mobile/15E148 Safari/604.1"
+        ),
+        mobile=True,
+    ),
+    "desktop": DeviceProfile(
+        name="desktop",
+        width=1920,
+        height=1080,
+        window_width=1920,
+        window_height=1080,
+        pixel_ratio=0.75,
+        mobile=False,
+    ),
+}
+
+
+def is_headless() -> bool:
+    return os.getenv("HEADLESS", "").strip().lower() in ("1", "true", "yes")
+
+
+def resolve_profile(default: str) -> DeviceProfile:
+    """
+    Picks the profile named by DRIVER_PROFILE, falling back to the suite default.
+    A suite written for mobile pages never gets a desktop browser (and vice versa),
+    so a mismatching DRIVER_PROFILE is ignored with a warning.
+    """
+    suite_profile = PROFILES[default]
+    requested = os.getenv("DRIVER_PROFILE", "").strip().lower()
+    if not requested:
+        return suite_profile
+
+    profile = PROFILES.get(requested)
+    if profile is None:
+        logging.warning(f"⚠️ Unknown DRIVER_PROFILE '{requested}' — using '{default}'.")
+        return suite_profile
+    if profile.mobile != suite_profile.mobile:
+        logging.warning(f"⚠️ DRIVER_PROFILE '{requested}' does not fit a '{default}' suite — using '{default}'.")
+        return suite_profile
+    return profile
+
+
+def build_options(profile: DeviceProfile, headless: bool) -> webdriver.ChromeOptions:
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # CDP events (network shaping/idle tracking) are read back from the performance log
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    if profile.mobile:
+        options.add_experimental_option("mobileEmulation", {
+            "deviceMetrics": {"width": profile.width, "height": profile.height, "pixelRatio": profile.pixel_ratio},
+            "userAgent": profile.user_agent,
+        })
+        options.add_argument("--force-device-scale-factor=1")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-popup-blocking")
+    else:
+        options.add_argument(f"--force-device-scale-factor={profile.pixel_ratio}")
+
+    options.add_argument(f"--window-size={profile.window_width},{profile.window_height}")
+
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+
+    if worker_id():
+        # Parallel workers never share a download folder
+        downloads = worker_dir(os.path.join(os.path.dirname(os.path.dirname(__file__)), "Fattal_Tests", "Downloads"))
+        os.makedirs(downloads, exist_ok=True)
+        options.add_experimental_option("prefs", {
+            "download.default_directory": downloads,
+            "download.prompt_for_download": False,
+        })
+    return options
+
+
+def apply_emulation(driver, profile: DeviceProfile, headless: bool):
+    """Re-applies viewport, DPR and touch so headless renders exactly like the headed window."""
+    if profile.mobile:
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": profile.width,
+            "height": profile.height,
+            "deviceScaleFactor": profile.pixel_ratio,
+            "mobile": True,
+        })
+        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {
+            "enabled": True,
+            "configuration": "mobile"
+        })
+    elif headless:
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": profile.width,
+            "height": profile.height,
+            "deviceScaleFactor": profile.pixel_ratio,
+            "mobile": False,
+        })
+
+
+def create_driver(default_profile: str):
+    """
+    Builds a configured Chrome driver for the profile picked by resolve_profile().
+    HEADLESS=1 runs the same profile in headless Chrome (no xvfb needed).
+    Under Parallel_Runner, chromedriver and devtools listen on the worker's own ports.
+    """
+    profile = resolve_profile(default_profile)
+    headless = is_headless()
+    options = build_options(profile, headless)
+    driver_port, devtools_port = next_ports()
+    if driver_port:
+        options.add_argument(f"--remote-debugging-port={devtools_port}")
+        driver = FattalChrome(options=options, service=Service(port=driver_port))
+    else:
+        driver = FattalChrome(options=options)
+
+    if profile.mobile:
+        # Set the window size again to force Chrome to correct physical size
+        driver.set_window_rect(x=0, y=0, width=profile.window_width, height=profile.window_height)
+    elif not headless:
+        driver.maximize_window()
+
+    apply_emulation(driver, profile, headless)
+    network_shaper_for(driver).apply()
+    asset_interceptor_for(driver)
+    popup_watchdog_for(driver)
+    network_idle_for(driver)
+
+    logging.info(
+        f"🖥️ Chrome started with profile '{profile.name}'{' (headless)' if headless else ''}"
+        f"{f' for worker {worker_id()} on port {driver_port}' if driver_port else ''}."
+    )
+    return driver
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+
+# Locator strategies the page script can resolve itself; anything else is rejected up front
+_CSS_FOR = {
+    By.ID: lambda value: f'[id="{value}"]',
+    By.NAME: lambda value: f'[name="{value}"]',
+    By.CLASS_NAME: lambda value: f".{value}",
+    By.TAG_NAME: lambda value: value,
+    By.CSS_SELECTOR: lambda value: value,
+}
+
+# Resolves every locator and reads each match's state in one evaluation. The matched
+# elements come back as element references, so callers can act on them without a re-find.
+_SNAPSHOT_JS = """
+const [queries, everyMatch] = arguments;
+const resolve = q => {
+    if (q.kind === 'css') return Array.from(document.querySelectorAll(q.value));
+    const found = document.evaluate(q.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i)).filter(n => n.nodeType === 1);
+};
+const visible = (el, r) => r.width > 0 && r.height > 0 &&
+    (typeof el.checkVisibility === 'function' ? el.checkVisibility({visibilityProperty: true}) : true);
+const state = el => {
+    const r = el.getBoundingClientRect();
+    return {
+        element: el,
+        visible: visible(el, r),
+        enabled: !(el.disabled || el.getAttribute('aria-disabled') === 'true'),
+        text: (el.innerText || '').trim(),
+        value: 'value' in el ? String(el.value) : null,
+        id: el.id || '',
+        rect: [r.x, r.y, r.width, r.height],
+    };
+};
+return queries.map(q => {
+    const states = resolve(q).map(state);
+    if (everyMatch) return states;
+    const best = states.find(s => s.visible) || states[0] || null;
+    return {count: states.length, best: best};
+});
+"""
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """What one locator matched at snapshot time (the first visible match, else the first match)."""
+    name: str
+    present: bool
+    count: int = 0
+    visible: bool = False
+    enabled: bool = False
+    text: str = ""
+    value: Optional[str] = None
+    id: str = ""
+    rect: Optional[tuple] = None
+    element: object = None
+
+    @property
+    def clickable(self) -> bool:
+        return self.visible and self.enabled
+
+
+def _query(locator) -> dict:
+    by, value = locator
+    if by == By.XPATH:
+        return {"kind": "xpath", "value": value}
+    if by not in _CSS_FOR:
+        raise ValueError(f"Element snapshots don't support locator strategy '{by}'")
+    return {"kind": "css", "value": _CSS_FOR[by](value)}
+
+
+def _state(name: str, raw: dict, count: int) -> ElementState:
+    return ElementState(
+        name=name,
+        present=True,
+        count=count,
+        visible=raw["visible"],
+        enabled=raw["enabled"],
+        text=raw["text"],
+        value=raw["value"],
+        id=raw["id"],
+        rect=tuple(raw["rect"]),
+        element=raw["element"],
+    )
+
+
+def snapshot(driver, locators: dict) -> dict:
+    """
+    Presence, visibility, enabled state, text, value and rect for every named locator,
+    in a single execute_script call.
+
+    locators: name -> (By, value)
+    Returns name -> ElementState
+    """
+    names = list(locators)
+    results = driver.execute_script(_SNAPSHOT_JS, [_query(locators[name]) for name in names], False)
+    return {
+        name: _state(name, result["best"], result["count"]) if result["best"] else ElementState(name, present=False)
+        for name, result in zip(names, results)
+    }
+
+
+def snapshot_all(driver, locator, name: str = "") -> list:
+    """ElementState for every match of one locator, in document order, in a single call."""
+    matches = driver.execute_script(_SNAPSHOT_JS, [_query(locator)], True)[0]
+    return [_state(name, raw, len(matches)) for raw in matches]
@@ -0,0 +1,163 @@
+import logging
+import os
+from datetime import datetime
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from Fattal_Utils.Result_Sink import append_record, file_lock, read_records
+from Fattal_Utils.Screenshot_Service import screenshot_exists
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEADERS = [
+    "Test Name", "Order Number", "ID Number", "Description", "Status", "Timestamp", "Duration",
+    "Browser", "OS", "Full Name", "Email",
+    "Room Screenshot", "Payment Screenshot", "Confirmation Screenshot", "Log File"
+]
+SCREENSHOT_COLUMNS = (12, 13, 14)
+LOG_COLUMN = 15
+SCREENSHOT_LABEL = "📷 Screenshot"
+LOG_LABEL = "🧾 Log File"
+
+RED_FILL = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+GREEN_FILL = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
+LINK_FONT = Font(color="0000EE", underline="single")
+
+
+def _link(path: str) -> str:
+    return f"file:///{path.replace(os.sep, '/')}" if screenshot_exists(path) else ""
+
+
+def excel_record(info: dict, room_screenshot: str = "", payment_screenshot: str = "") -> dict:
+    """One TestResults row: the cell values, the hyperlinks behind the screenshot/log cells and the status."""
+    status = "FAILED" if info.get("error") else "PASSED"
+    row = [
+        info.get("name", ""),
+        info.get("order_number", ""),
+        info.get("id_number", ""),
+        info.get("description", ""),
+        status,
+        info.get("timestamp", ""),
+        info.get("duration", ""),
+        info.get("browser", ""),
+        info.get("os", ""),
+        info.get("full_name", ""),
+        info.get("email", ""),
+        room_screenshot,
+        payment_screenshot,
+        info.get("error_screenshot" if info.get("status") == "FAILED" else "confirmation_screenshot", ""),
+        info.get("log", "")
+    ]
+    links = {}
+    for column in (*SCREENSHOT_COLUMNS, LOG_COLUMN):
+        link = _link(row[column - 1])
+        if link:
+            links[str(column)] = link
+            row[column - 1] = LOG_LABEL if column == LOG_COLUMN else SCREENSHOT_LABEL
+    return {"row": row, "links": links, "status": status}
+
+
+class FattalExcelExporter:
+    """
+    Collects TestResults rows during the session and writes them once, at the end (flush()).
+    Rows go to one workbook per month, TestResults_<YYYY-MM>.xlsx, so none grows without limit.
+    Each month's rows are also kept in TestResults_<YYYY-MM>.jsonl: flush() appends the new rows
+    there and streams the whole month into a fresh write-only workbook, sizing the columns from
+    running maxima as it goes. A workbook that is open in Excel can't be replaced; its rows stay
+    in the .jsonl and are in the next workbook written for that month.
+    """
+
+    def __init__(self, folder: str = PROJECT_ROOT, prefix: str = "TestResults"):
+        self.folder = folder
+        self.prefix = prefix
+        self.pending = []
+
+    def add(self, info: dict, room_screenshot: str = "", payment_screenshot: str = ""):
+        self.pending.append(excel_record(info, room_screenshot, payment_screenshot))
+
+    def paths(self, month: str) -> tuple:
+        """(workbook, row log) of a month ("YYYY-MM")."""
+        base = os.path.join(self.folder, f"{self.prefix}_{month}")
+        return f"{base}.xlsx", f"{base}.jsonl"
+
+    @staticmethod
+    def _month(record: dict) -> str:
+        timestamp = str(record["row"][5] or "")
+        try:
+            return datetime.strptime(timestamp[:7], "%Y-%m").strftime("%Y-%m")
+        except ValueError:
+            return datetime.now().strftime("%Y-%m")
+
+    def flush(self) -> list:
+        """Writes the pending rows. Returns the workbooks written."""
+        by_month = {}
+        for record in self.pending:
+            by_month.setdefault(self._month(record), []).append(record)
+        self.pending = []
+
+        written = []
+        for month, records in sorted(by_month.items()):
+            workbook_path, rows_path = self.paths(month)
+            try:
+                for record in records:
+                    append_record(rows_path, record)
+                with file_lock(workbook_path):
+                    self._write_workbook(workbook_path, read_records(rows_path))
+                written.append(workbook_path)
+                logging.info(f"Excel file saved at: {workbook_path} ({len(records)} new rows)")
+            except PermissionError as e:
+                logging.warning(f"Excel file is open or locked: {e} — its rows are kept in {rows_path}")
+            except Exception as e:
+                logging.error(f"Failed to save Excel file: {e}")
+        return written
+
+    @staticmethod
+    def _write_workbook(path: str, records: list):
+        widths = [len(header) for header in HEADERS]
+        for record in records:
+            for i, value in enumerate(record["row"]):
+                if value:
+                    widths[i] = max(widths[i], len(str(value)))
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Test Results")
+        # Write-only sheets emit their column widths before the first row
+        for i, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = width + 5
+        ws.append(HEADERS)
+        for record in records:
+            fill = RED_FILL if record.get("status") == "FAILED" else GREEN_FILL
+            links = record.get("links", {})
+            cells = []
+            for column, value in enumerate(record["row"], 1):
+                cell = WriteOnlyCell(ws, value=value)
+                cell.fill = fill
+                if str(column) in links:
+                    cell.hyperlink = links[str(column)]
+                    cell.font = LINK_FONT
+                cells.append(cell)
+            ws.append(cells)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        wb.save(tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_exporters = {}
+
+
+def excel_exporter(folder: str = PROJECT_ROOT) -> FattalExcelExporter:
+    """One exporter (and row buffer) per folder per process, shared by every suite in the session."""
+    key = os.path.abspath(folder)
+    exporter = _exporters.get(key)
+    if exporter is None:
+        exporter = FattalExcelExporter(folder)
+        _exporters[key] = exporter
+    return exporter
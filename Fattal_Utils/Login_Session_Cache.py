@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from selenium.common import TimeoutException
+from Fattal_Utils.Wait_Policy import FattalWait
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".login_cache", "sessions.json"
+)
+
+# Keys accepted by CDP Network.setCookies (Network.getAllCookies returns a few extra ones)
+_COOKIE_PARAM_KEYS = {
+    "name", "value", "domain", "path", "secure", "httpOnly", "sameSite",
+    "expires", "priority", "sourceScheme", "sourcePort", "partitionKey",
+}
+
+
+def _account_key(account_id: str) -> str:
+    # IDs are personal data — never written to disk as-is
+    return hashlib.sha256(str(account_id).encode("utf-8")).hexdigest()[:16]
+
+
+def _masked(account_id: str) -> str:
+    account_id = str(account_id or "")
+    return f"***{account_id[-3:]}" if account_id else "<no id>"
+
+
+class FattalLoginSessionCache:
+    """
+    Stores authenticated club sessions (cookies + localStorage) per account with a TTL,
+    so a test can restore a login instead of driving the login UI every time.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, ttl_seconds: int = None):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("LOGIN_CACHE_TTL_MIN", "30")) * 60
+        self._lock = threading.Lock()
+
+    def _read_all(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_all(self, data: dict):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def load(self, account_id: str):
+        entry = self._read_all().get(_account_key(account_id))
+        if not entry:
+            return None
+        if time.time() - entry.get("saved_at", 0) > self.ttl_seconds:
+            self.invalidate(account_id)
+            return None
+        return entry
+
+    def save(self, account_id: str, entry: dict):
+        with self._lock:
+            data = self._read_all()
+            data[_account_key(account_id)] = {**entry, "saved_at": time.time()}
+            self._write_all(data)
+
+    def invalidate(self, account_id: str):
+        with self._lock:
+            data = self._read_all()
+            if data.pop(_account_key(account_id), None) is not None:
+                self._write_all(data)
+
+    @staticmethod
+    def capture(driver) -> dict:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        local_storage = driver.execute_script("""
+            const out = {};
+            for (let i = 0; i < window.localStorage.length; i++) {
+                const key = window.localStorage.key(i);
+                out[key] = window.localStorage.getItem(key);
+            }
+            return out;
+        """)
+        return {"cookies": cookies, "local_storage": local_storage or {}}
+
+    @staticmethod
+    def restore(driver, entry: dict):
+        cookies = []
+        for cookie in entry.get("cookies", []):
+            param = {k: v for k, v in cookie.items() if k in _COOKIE_PARAM_KEYS}
+            if cookie.get("session") or param.get("expires", -1) < 0:
+                param.pop("expires", None)
+            cookies.append(param)
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        driver.execute_script("""
+            const items = arguments[0];
+            for (const key of Object.keys(items)) {
+                window.localStorage.setItem(key, items[key]);
+            }
+        """, entry.get("local_storage", {}))
+        driver.refresh()
+
+
+_shared_cache = None
+
+
+def shared_login_cache() -> FattalLoginSessionCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = FattalLoginSessionCache(cache_path=os.getenv("LOGIN_CACHE_PATH", DEFAULT_CACHE_PATH))
+    return _shared_cache
+
+
+def login_cache_enabled() -> bool:
+    return os.getenv("LOGIN_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _wait_for_marker(driver, login_marker, expected: str, timeout: float) -> bool:
+    try:
+        FattalWait(driver, timeout, poll_frequency=0.2).until(lambda d: login_marker() == expected)
+        return True
+    except TimeoutException:
+        return False
+
+
+def login_with_session_cache(driver, account_id: str, ui_login, login_marker, timeout: float = 5) -> bool:
+    """
+    Logs `account_id` in, restoring a cached session when one is available.
+
+    ui_login:     callable that performs the full UI login (including post-login popups)
+    login_marker: callable returning the header's user-area text, which differs
+                  between logged-out and logged-in states and is used to validate
+                  a restored session
+    Returns True on a cache hit, False when the UI login ran.
+    """
+    cache = shared_login_cache()
+    if login_cache_enabled():
+        entry = cache.load(account_id)
+        if entry:
+            cache.restore(driver, entry)
+            if _wait_for_marker(driver, login_marker, entry["logged_in_marker"], timeout):
+                logging.info(f"🔑 Login session cache HIT for account {_masked(account_id)} — UI login skipped.")
+                return True
+            logging.warning(f"🔑 Login session cache REJECTED for account {_masked(account_id)} — falling back to UI login.")
+            cache.invalidate(account_id)
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear();")
+            driver.refresh()
+        else:
+            logging.info(f"🔑 Login session cache MISS for account {_masked(account_id)} — logging in through the UI.")
+
+    logged_out_marker = login_marker()
+    ui_login()
+    if not login_cache_enabled():
+        return False
+
+    def changed_marker(_driver):
+        marker = login_marker()
+        return marker if marker and marker != logged_out_marker else False
+
+    try:
+        logged_in_marker = FattalWait(driver, timeout, poll_frequency=0.2).until(changed_marker)
+    except TimeoutException:
+        logged_in_marker = None
+    if not logged_in_marker:
+        # Without a visible difference a restored session could never be validated
+        logging.info("🔑 Header shows no logged-in state — session not cached.")
+        return False
+    cache.save(account_id, {**cache.capture(driver), "logged_in_marker": logged_in_marker})
+    logging.info(f"🔑 Cached login session for account {_masked(account_id)}.")
+    return False
@@ -0,0 +1,161 @@
+import fnmatch
+import logging
+import os
+import time
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from Fattal_Utils.Cdp_Events import event_log_for
+from Fattal_Utils.Wait_Policy import explicit_wait
+
+# XHR/fetch URLs that carry search and pricing data. Override with NETWORK_IDLE_PATTERNS (comma separated).
+DEFAULT_PATTERNS = ["*/api/*", "*graphql*", "*availability*", "*price*", "*pricing*", "*search*", "*rooms*"]
+# The subset that returns room prices; only these may end a price wait early. Override with NETWORK_IDLE_PRICING_PATTERNS.
+DEFAULT_PRICING_PATTERNS = ["*availability*", "*price*", "*pricing*"]
+TRACKED_TYPES = {"XHR", "Fetch"}
+
+
+def _patterns(variable: str, default: list) -> list:
+    raw = os.getenv(variable, "").strip()
+    return [p.strip() for p in raw.split(",") if p.strip()] if raw else default
+
+
+def tracked_patterns():
+    return _patterns("NETWORK_IDLE_PATTERNS", DEFAULT_PATTERNS)
+
+
+def pricing_patterns():
+    return _patterns("NETWORK_IDLE_PRICING_PATTERNS", DEFAULT_PRICING_PATTERNS)
+
+
+def quiet_window() -> float:
+    return int(os.getenv("NETWORK_IDLE_QUIET_MS", "500")) / 1000
+
+
+class FattalNetworkIdle:
+    """
+    Tracks in-flight XHR/fetch requests to the search and pricing APIs from the CDP
+    Network events in the performance log. Waits end when no tracked request has been
+    in flight for a quiet window, or at a hard cap, and every wait leaves a report of
+    which requests held it open.
+    """
+
+    def __init__(self, driver, patterns=None, pricing=None):
+        self.driver = driver
+        self.patterns = patterns or tracked_patterns()
+        self.pricing = pricing or pricing_patterns()
+        self.events = event_log_for(driver)
+        self.events.subscribe(self._on_event)
+        self._in_flight = {}
+        self._finished = []
+        self._last_change = time.monotonic()
+        self._last_pricing_change = time.monotonic()
+        self.reports = []
+
+    @staticmethod
+    def _matches(url: str, patterns) -> bool:
+        return any(fnmatch.fnmatchcase(url, p) for p in patterns)
+
+    def _on_event(self, method, params, timestamp):
+        if method == "Network.requestWillBeSent" and params.get("type") in TRACKED_TYPES:
+            url = params.get("request", {}).get("url", "")
+            pricing = self._matches(url, self.pricing)
+            if pricing or self._matches(url, self.patterns):
+                self._in_flight[params["requestId"]] = {"url": url, "started": params.get("timestamp", 0), "pricing": pricing}
+                self._touch(pricing)
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            request = self._in_flight.pop(params.get("requestId"), None)
+            if request:
+                seconds = max(params.get("timestamp", 0) - request["started"], 0)
+                self._finished.append({"url": request["url"], "seconds": round(seconds, 2), "pricing": request["pricing"]})
+                self._touch(request["pricing"])
+        elif method == "Page.frameNavigated" and not params.get("frame", {}).get("parentId"):
+            # Requests of the previous document never report back once it is gone
+            self._in_flight.clear()
+
+    def _touch(self, pricing: bool):
+        self._last_change = time.monotonic()
+        if pricing:
+            self._last_pricing_change = self._last_change
+
+    def reset(self):
+        self.events.pump()
+        self._in_flight.clear()
+        self._finished = []
+        self.reports = []
+
+    def wait_for_idle(self, quiet: float = None, cap: float = 30, label: str = "") -> dict:
+        """Waits until no tracked request has been in flight for `quiet` seconds (at most `cap`)."""
+        quiet = quiet_window() if quiet is None else quiet
+        start = time.monotonic()
+        mark = len(self._finished)
+        while True:
+            self.events.pump()
+            now = time.monotonic()
+            if not self._in_flight and now - self._last_change >= quiet:
+                return self._report(label, start, mark, idle=True)
+            if now - start >= cap:
+                return self._report(label, start, mark, idle=False)
+            time.sleep(0.1)
+
+    def until(self, condition, cap: float, settle: float = 10, label: str = ""):
+        """
+        Like FattalWait(driver, cap).until(condition), but gives up early once the pricing
+        requests started during the wait have all finished and `settle` seconds passed
+        without the condition coming true — the prices are in, waiting longer won't help.
+        Other tracked traffic never ends the wait; it only shows up in the report.
+        With no pricing traffic at all it behaves exactly like the capped wait.
+        """
+        start = time.monotonic()
+        mark = len(self._finished)
+        while True:
+            try:
+                with explicit_wait(self.driver):
+                    value = condition(self.driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = None
+            self.events.pump()
+            if value:
+                self._report(label, start, mark, idle=not self._in_flight)
+                return value
+            now = time.monotonic()
+            pricing_done = (
+                any(r["pricing"] for r in self._finished[mark:])
+                and not any(r["pricing"] for r in self._in_flight.values())
+            )
+            if pricing_done and now - self._last_pricing_change >= settle:
+                report = self._report(label, start, mark, idle=not self._in_flight)
+                raise TimeoutException(
+                    f"{label or 'condition'} not met {settle:g}s after its pricing requests finished "
+                    f"({len(report['held_by'])} requests, {report['waited']})"
+                )
+            if now - start >= cap:
+                self._report(label, start, mark, idle=False)
+                raise TimeoutException(f"{label or 'condition'} not met within {cap:.0f}s")
+            time.sleep(0.25)
+
+    def _report(self, label, start, mark, idle) -> dict:
+        held_by = sorted(self._finished[mark:], key=lambda r: r["seconds"], reverse=True)
+        report = {
+            "label": label,
+            "idle": idle,
+            "waited": f"{time.monotonic() - start:.2f}s",
+            "held_by": held_by[:5],
+            "in_flight": [r["url"] for r in self._in_flight.values()],
+        }
+        self.reports.append(report)
+        slowest = f", slowest {held_by[0]['url']} ({held_by[0]['seconds']}s)" if held_by else ""
+        state = "idle" if idle else f"still busy ({len(report['in_flight'])} in flight)"
+        logging.info(f"📡 {label or 'Network'}: {state} after {report['waited']} — {len(held_by)} requests{slowest}")
+        return report
+
+    def stats(self) -> dict:
+        return {"network_idle_waits": list(self.reports)}
+
+
+def network_idle_for(driver) -> FattalNetworkIdle:
+    tracker = getattr(driver, "_fattal_network_idle", None)
+    if tracker is None:
+        tracker = FattalNetworkIdle(driver)
+        driver._fattal_network_idle = tracker
+    return tracker
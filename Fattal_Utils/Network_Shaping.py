@@ -0,0 +1,144 @@
+import fnmatch
+import logging
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+from Fattal_Utils.Cdp_Events import event_log_for
+
+# URL classes the booking flows never need. Patterns use the Network.setBlockedURLs wildcard syntax.
+BLOCK_CLASSES = {
+    "images": [
+        "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.ico",
+        "*.jpg?*", "*.jpeg?*", "*.png?*", "*.gif?*", "*.webp?*", "*.avif?*",
+    ],
+    "fonts": [
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        "*.woff?*", "*.woff2?*", "*.ttf?*", "*.otf?*", "*.eot?*",
+    ],
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*analytics.google.com*",
+        "*doubleclick.net*", "*googleadservices.com*", "*googlesyndication.com*",
+        "*hotjar.com*", "*clarity.ms*", "*bat.bing.com*",
+    ],
+    "third_party": [
+        "*connect.facebook.net*", "*facebook.com/tr*", "*analytics.tiktok.com*",
+        "*taboola.com*", "*outbrain.com*", "*criteo.com*", "*criteo.net*",
+        "*snap.licdn.com*", "*static.ads-twitter.com*", "*adnxs.com*",
+    ],
+}
+
+# Blocked unless NETWORK_BLOCK says otherwise. Images and fonts stay on: the suites screenshot every stage.
+DEFAULT_BLOCK = ["analytics", "third_party"]
+
+# Fallback size per class for blocked URLs we never saw load unblocked.
+ESTIMATED_BYTES = {
+    "images": 80_000,
+    "fonts": 40_000,
+    "analytics": 60_000,
+    "third_party": 50_000,
+}
+
+# Sizes learned from unblocked loads, shared by every shaper in the process.
+_known_sizes = {}
+
+
+def allow_network(*classes):
+    """Test-method decorator: lets the given URL classes through for that test only."""
+    def decorator(func):
+        func.network_allow = tuple(classes)
+        return func
+    return decorator
+
+
+def enabled_classes():
+    """Classes blocked by default, from NETWORK_BLOCK (comma separated, 'none' disables)."""
+    raw = os.getenv("NETWORK_BLOCK", ",".join(DEFAULT_BLOCK)).strip().lower()
+    if raw in ("", "none", "0", "off"):
+        return []
+    return [c.strip() for c in raw.split(",") if c.strip() in BLOCK_CLASSES]
+
+
+class FattalNetworkShaper:
+    """
+    Blocks configurable URL classes through CDP Network.setBlockedURLs and counts
+    what was blocked. Byte savings use the size seen the last time the same URL
+    loaded unblocked, or a per-class estimate otherwise.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.events = event_log_for(driver)
+        self.blocked_classes = []
+        self._requests = {}
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_class = {}
+
+    def apply(self, allow=(), reset: bool = True):
+        """Starts blocking every enabled class that is not in `allow`."""
+        self.blocked_classes = [c for c in enabled_classes() if c not in allow]
+        patterns = [p for c in self.blocked_classes for p in BLOCK_CLASSES[c]]
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not apply network blocking: {e}")
+            return
+
+        # Events from before this point belong to the previous test
+        self.events.subscribe(self._on_event)
+        self.events.pump()
+        if reset:
+            self.reset_counters()
+        if self.blocked_classes:
+            logging.info(f"🚫 Blocking network classes: {', '.join(self.blocked_classes)}")
+
+    def allow(self, *classes):
+        """Lets more classes through mid-test (e.g. images before a stage screenshot)."""
+        self.apply(allow=tuple(c for c in BLOCK_CLASSES if c not in self.blocked_classes) + classes, reset=False)
+
+    def reset_counters(self):
+        self._requests.clear()
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_class = {}
+
+    def classify(self, url: str):
+        for name in self.blocked_classes:
+            if any(fnmatch.fnmatchcase(url, pattern) for pattern in BLOCK_CLASSES[name]):
+                return name
+        return None
+
+    def _on_event(self, method, params, timestamp):
+        if method == "Network.requestWillBeSent":
+            self._requests[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFinished":
+            url = self._requests.get(params.get("requestId"))
+            if url:
+                _known_sizes[url] = int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            url = self._requests.get(params.get("requestId"), "")
+            name = self.classify(url) or "other"
+            self.blocked_requests += 1
+            self.blocked_by_class[name] = self.blocked_by_class.get(name, 0) + 1
+            self.bytes_saved += _known_sizes.get(url, ESTIMATED_BYTES.get(name, 0))
+
+    def stats(self) -> dict:
+        self.events.pump()
+        return {
+            "network_blocked_requests": self.blocked_requests,
+            "network_bytes_saved": self.bytes_saved,
+            "network_blocked_by_class": dict(self.blocked_by_class),
+        }
+
+    def close(self):
+        self.events.unsubscribe(self._on_event)
+
+
+def network_shaper_for(driver) -> FattalNetworkShaper:
+    shaper = getattr(driver, "_fattal_network_shaper", None)
+    if shaper is None:
+        shaper = FattalNetworkShaper(driver)
+        driver._fattal_network_shaper = shaper
+    return shaper
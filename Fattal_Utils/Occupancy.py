@@ -0,0 +1,118 @@
+import logging
+import time
+
+GROUPS = ("adults", "children", "infants")
+
+# Ids of the mobile room builder; {group} is one of GROUPS, {room} the 0-based room index
+MOBILE_ROOM_IDS = {
+    "room": "search-engine-build-room-mobile-room-container{room}",
+    "count": "search-engine-build-room-mobile-count-{group}{room}",
+    "plus": "search-engine-build-room-mobile-wrapper-{group}{room}",
+    "minus": "search-engine-build-room-mobile-wrapper-{group}-remove{room}",
+    "add_room": "search-engine-build-room-mobile-add-room-button",
+}
+
+_READ_JS = """
+const read = (ids, groups) => {
+    const fill = (template, group, room) => template.replace('{group}', group).replace('{room}', room);
+    const rooms = [];
+    for (let room = 0; document.getElementById(fill(ids.room, '', room)); room++) {
+        const counts = {};
+        for (const group of groups) {
+            const el = document.getElementById(fill(ids.count, group, room));
+            counts[group] = el ? parseInt(el.textContent.trim(), 10) : null;
+        }
+        rooms.push(counts);
+    }
+    return rooms;
+};
+"""
+
+# Runs the whole click plan in the page, letting React re-render between clicks, and stops
+# a counter early when its button turns disabled. Ends with one read of every counter.
+_APPLY_JS = _READ_JS + """
+const [ids, groups, ops, gapMs, done] = arguments;
+const pause = () => new Promise(resolve => setTimeout(resolve, gapMs));
+const disabled = el => el.disabled || el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true';
+(async () => {
+    const blocked = [];
+    for (const op of ops) {
+        for (let i = 0; i < op.times; i++) {
+            const el = document.getElementById(op.id);
+            if (!el || disabled(el)) {
+                blocked.push({id: op.id, missing: !el, remaining: op.times - i});
+                break;
+            }
+            el.click();
+            await pause();
+        }
+    }
+    done({rooms: read(ids, groups), blocked: blocked});
+})().catch(e => done({error: String(e)}));
+"""
+
+
+class FattalOccupancy:
+    """
+    Sets room occupants from one read of every counter: the +/- clicks each counter needs
+    are computed in Python and run as one in-page batch, which returns the final counts,
+    instead of a read/click/sleep/read loop per counter.
+    """
+
+    def __init__(self, driver, ids: dict = None, click_gap_ms: int = 60):
+        self.driver = driver
+        self.ids = ids or MOBILE_ROOM_IDS
+        self.click_gap_ms = click_gap_ms
+
+    def _id(self, kind: str, group: str = "", room: int = 0) -> str:
+        return self.ids[kind].format(group=group, room=room)
+
+    def read(self) -> list:
+        """[{"adults": n, "children": n, "infants": n}, ...] for every room shown."""
+        return self.driver.execute_script(_READ_JS + "return read(arguments[0], arguments[1]);", self.ids, GROUPS)
+
+    def _run(self, ops: list) -> dict:
+        result = self.driver.execute_async_script(_APPLY_JS, self.ids, GROUPS, ops, self.click_gap_ms)
+        if result.get("error"):
+            raise Exception(f"Occupancy click plan failed in page: {result['error']}")
+        for blocked in result["blocked"]:
+            state = "missing" if blocked["missing"] else "disabled"
+            logging.warning(f"⚠️ {blocked['id']} {state} — {blocked['remaining']} clicks not applied.")
+        return result
+
+    def set_rooms(self, rooms: list) -> list:
+        """
+        rooms: one dict per room, e.g. [{"adults": 2, "children": 1}, {"adults": 2}];
+        groups left out (or an empty dict) keep their current count.
+        Adds rooms through the add-room button when fewer are shown. Returns the final counts.
+        """
+        start = time.monotonic()
+        current = self.read()
+        if len(current) < len(rooms):
+            current = self._run([{"id": self._id("add_room"), "times": len(rooms) - len(current)}])["rooms"]
+            if len(current) < len(rooms):
+                raise Exception(f"Only {len(current)} of {len(rooms)} rooms could be added.")
+
+        ops = []
+        for room, wanted in enumerate(rooms):
+            for group, target in wanted.items():
+                have = current[room].get(group)
+                if have is None:
+                    raise Exception(f"No {group} counter for room {room + 1}.")
+                if target != have:
+                    kind = "plus" if target > have else "minus"
+                    ops.append({"id": self._id(kind, group, room), "times": abs(target - have)})
+
+        final = self._run(ops)["rooms"] if ops else current
+        mismatches = [
+            f"room {room + 1} {group}: {final[room].get(group)} (wanted {target})"
+            for room, wanted in enumerate(rooms) for group, target in wanted.items()
+            if final[room].get(group) != target
+        ]
+        for mismatch in mismatches:
+            logging.warning(f"⚠️ Occupancy not reached — {mismatch}")
+        logging.info(
+            f"👥 Occupancy set for {len(rooms)} room(s) with {sum(op['times'] for op in ops)} clicks "
+            f"in {time.monotonic() - start:.2f}s: {final[:len(rooms)]}"
+        )
+        return final
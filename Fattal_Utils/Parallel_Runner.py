@@ -0,0 +1,184 @@
+"""
+Runs the Fattal_Tests suites across N worker processes, each a pytest run over its shard of test ids.
+
+    python -m Fattal_Utils.Parallel_Runner -n 8 -- -m mobile --maxfail=3
+
+Shards are built longest-processing-time first from the durations in earlier runs' run_data.json
+(see Test_Scheduler); --schedule round_robin deals them out in collection order instead.
+Everything after "--" goes to the collection run, so paths, node ids and -k/-m filters pick the tests;
+workers get only its options, since a path next to their shard's ids would make each run all of it.
+All workers write into one html_reports/runs/run_<timestamp> folder; each gets its own Chrome,
+Screenshots/worker_<id> and Downloads/worker_<id> folders and a block of ports (see Worker_Env).
+Worker output goes to <run folder>/workers/worker_<id>.log.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from Fattal_Utils.Dashboard import update_dashboard
+from Fattal_Utils.Result_Sink import load_run, result_sink_for
+from Fattal_Utils.Test_Scheduler import FattalScheduler, load_history, predicted_seconds, unittest_id
+from Fattal_Utils.Worker_Env import PORT_BASE_ENV, PORT_BLOCK, RUN_FOLDER_ENV, WORKER_ID_ENV, new_run_folder
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RUNS_DIR = PROJECT_ROOT / "Fattal_Tests" / "html_reports" / "runs"
+
+# pytest options whose value is the next argument, so it isn't mistaken for a path
+VALUE_OPTIONS = {
+    "-k", "-m", "-p", "-c", "-o", "-r", "-W", "--maxfail", "--deselect", "--ignore", "--ignore-glob",
+    "--rootdir", "--tb", "--durations", "--junitxml", "--basetemp", "--confcutdir", "--log-level", "--capture",
+}
+
+
+def split_args(pytest_args: list) -> tuple:
+    """(paths and node ids, options) of a pytest command line."""
+    paths, options = [], []
+    takes_value = False
+    for arg in pytest_args:
+        if takes_value or arg.startswith("-"):
+            options.append(arg)
+            takes_value = not takes_value and arg in VALUE_OPTIONS
+        else:
+            paths.append(arg)
+    return paths, options
+
+
+def collect(pytest_args: list) -> list:
+    """Test ids ("path::Class::test") pytest would run with these args, in collection order."""
+    result = subprocess.run(
+        # --verbosity last, so a -q among pytest_args can't switch it to per-file counts
+        [sys.executable, "-m", "pytest", "--collect-only", *pytest_args, "--verbosity=-1"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    test_ids = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+    if result.returncode not in (0, 5) and not test_ids:
+        raise SystemExit(f"❌ Test collection failed:\n{result.stdout}{result.stderr}")
+    return test_ids
+
+
+def shard(test_ids: list, workers: int) -> list:
+    """Deals test ids round-robin over `workers` shards, so every class is spread across workers."""
+    shards = [[] for _ in range(workers)]
+    for i, test_id in enumerate(test_ids):
+        shards[i % workers].append(test_id)
+    return [s for s in shards if s]
+
+
+def worker_env(worker: int, run_folder: str, port_base: int) -> dict:
+    env = dict(os.environ)
+    env[WORKER_ID_ENV] = str(worker)
+    env[RUN_FOLDER_ENV] = run_folder
+    env[PORT_BASE_ENV] = str(port_base + worker * PORT_BLOCK)
+    # A worker runs one test at a time, so one pooled Chrome is all it needs
+    env.setdefault("DRIVER_POOL_SIZE", "1")
+    return env
+
+
+def launch(shards: list, run_folder: str, port_base: int, pytest_args: list) -> list:
+    logs_dir = Path(run_folder) / "workers"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    workers = []
+    for worker, test_ids in enumerate(shards):
+        log_path = logs_dir / f"worker_{worker}.log"
+        log = open(log_path, "w", encoding="utf-8")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pytest", *pytest_args, *test_ids],
+            cwd=PROJECT_ROOT, env=worker_env(worker, run_folder, port_base),
+            stdout=log, stderr=subprocess.STDOUT,
+        )
+        workers.append({"id": worker, "tests": len(test_ids), "process": process, "log": log,
+                        "log_path": log_path, "start": time.monotonic(), "seconds": None})
+        print(f"🚀 Worker {worker}: {len(test_ids)} tests (pid {process.pid}, log {log_path})")
+    return workers
+
+
+def wait_for(workers: list):
+    pending = list(workers)
+    while pending:
+        for worker in list(pending):
+            if worker["process"].poll() is not None:
+                worker["seconds"] = time.monotonic() - worker["start"]
+                worker["log"].close()
+                pending.remove(worker)
+                print(f"🏁 Worker {worker['id']} finished in {worker['seconds']:.0f}s — {last_line(worker['log_path'])}")
+        time.sleep(0.5)
+
+
+def actual_seconds(run_folder: str) -> dict:
+    """unittest id -> duration of every test this run recorded."""
+    return {
+        entry["test_id"]: float(str(entry.get("duration", "0")).rstrip("s") or 0)
+        for entry in load_run(run_folder) if isinstance(entry, dict) and entry.get("test_id")
+    }
+
+
+def report(workers: list, shards: list, costs: dict, run_folder: str, wall: float):
+    """Predicted against actual time, per worker and for the whole run."""
+    recorded = actual_seconds(run_folder)
+    print(f"{'worker':<8}{'tests':>6}{'predicted':>11}{'p90':>8}{'recorded':>10}{'wall':>8}")
+    for worker, shard in zip(workers, shards):
+        median, p90 = predicted_seconds(shard, costs)
+        tests = sum(recorded.get(unittest_id(n), 0) for n in shard)
+        print(f"{worker['id']:<8}{len(shard):>6}{median:>10.0f}s{p90:>7.0f}s{tests:>9.0f}s{worker['seconds']:>7.0f}s")
+    makespan = max(predicted_seconds(shard, costs)[0] for shard in shards)
+    print(f"⏱ Predicted wall time {makespan:.0f}s, actual {wall:.0f}s.")
+    new = sum(1 for cost in costs.values() if cost.source != "history")
+    if new:
+        print(f"ℹ️ {new} of {len(costs)} tests had no history of their own; they were estimated from other tests or the default cost.")
+
+
+def last_line(log_path: Path) -> str:
+    lines = [line.strip() for line in log_path.read_text(encoding="utf-8", errors="replace").splitlines() if line.strip()]
+    return lines[-1] if lines else "no output"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--port-base", type=int, default=41000, help=f"first port; worker N owns the {PORT_BLOCK} ports from base + N*{PORT_BLOCK}")
+    parser.add_argument("--schedule", choices=("lpt", "round_robin"), default="lpt", help="how tests are assigned to workers")
+    parser.add_argument("--history-runs", type=int, default=30, help="earlier runs the lpt schedule learns durations from")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER, help="pytest arguments; paths and node ids only select the tests, options go to every worker")
+    args = parser.parse_args()
+    pytest_args = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+
+    test_ids = collect(pytest_args)
+    _, worker_args = split_args(pytest_args)
+    if not test_ids:
+        print("⚠️ No tests collected.")
+        return 5
+    workers_count = max(1, min(args.workers, len(test_ids)))
+    scheduler = FattalScheduler(load_history(str(RUNS_DIR), args.history_runs))
+    if args.schedule == "lpt":
+        shards, costs = scheduler.assign(test_ids, workers_count)
+    else:
+        shards, costs = shard(test_ids, workers_count), scheduler.estimate(test_ids)
+    run_folder, run_id = new_run_folder(str(RUNS_DIR))
+    print(f"🗂 {len(test_ids)} tests over {len(shards)} workers into {run_id}")
+
+    start = time.monotonic()
+    workers = launch(shards, run_folder, args.port_base, worker_args)
+    try:
+        wait_for(workers)
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker["process"].terminate()
+        raise
+
+    wall = time.monotonic() - start
+    result_sink_for(run_folder).compact()
+    update_dashboard(str(RUNS_DIR), run_folder)
+    busy = sum(worker["seconds"] for worker in workers)
+    report(workers, shards, costs, run_folder, wall)
+    print(f"⏱ {busy:.0f}s of worker time in {wall:.0f}s ({busy / wall:.1f}x speedup over serial).")
+    failed = [worker for worker in workers if worker["process"].returncode != 0]
+    for worker in failed:
+        print(f"❌ Worker {worker['id']} exited with {worker['process'].returncode} — see {worker['log_path']}")
+    return failed[0]["process"].returncode if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
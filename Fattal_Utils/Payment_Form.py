@@ -0,0 +1,162 @@
+import logging
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
+
+from Fattal_Utils.React_Forms import normalized_value
+from Fattal_Utils.Typing import REALISTIC, typer_for
+from Fattal_Utils.Wait_Policy import FattalWait, timeout
+
+# payment_card key -> field id inside paymentIframe
+CARD_FIELDS = {
+    "cardholder_name": "card_holder_name_input",
+    "card_number": "credit_card_number_input",
+    "expiry_month": "date_month_input",
+    "expiry_year": "date_year_input",
+    "cvv": "cvv_input",
+    "id_number": "id_number_input",
+}
+
+# Sets every input through the native value setter (rewinding _valueTracker in case the
+# frame is React) and every select by its visible option text, firing the events the
+# card form validates on, then reads all values back once the whole form is set.
+_FILL_JS = """
+const entries = arguments[0];
+const inputSetter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+const selectSetter = Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set;
+const fire = (el, types) => types.forEach(type => el.dispatchEvent(new Event(type, {bubbles: true})));
+const elements = entries.map(entry => document.getElementById(entry.id));
+
+entries.forEach((entry, i) => {
+    const el = elements[i];
+    if (!el || el.disabled || el.readOnly) return;
+    if (el.tagName === 'SELECT') {
+        const options = Array.from(el.options);
+        const option = options.find(o => o.text.trim() === entry.value) || options.find(o => o.value === entry.value);
+        if (!option) return;
+        selectSetter.call(el, option.value);
+        fire(el, ['input', 'change']);
+        return;
+    }
+    el.focus();
+    const lastValue = el.value;
+    inputSetter.call(el, entry.value);
+    const tracker = el._valueTracker;
+    if (tracker) tracker.setValue(lastValue);
+    fire(el, ['input', 'change']);
+    el.dispatchEvent(new KeyboardEvent('keyup', {bubbles: true}));
+    el.blur();
+});
+
+return elements.map(el => {
+    if (!el) return null;
+    const value = el.tagName === 'SELECT'
+        ? (el.selectedIndex >= 0 ? el.options[el.selectedIndex].text.trim() : '')
+        : el.value;
+    return {value: value, select: el.tagName === 'SELECT', disabled: el.disabled || el.readOnly};
+});
+"""
+
+
+class FattalPaymentForm:
+    """
+    Fills the card form in paymentIframe with one frame switch and one execute_script
+    call that sets and verifies all six fields, instead of ~14 find/clear/send_keys/Select
+    commands. Fields the script could not set are retyped one by one while still in the frame.
+    Each fill leaves a timing and validation report.
+    """
+
+    def __init__(self, driver, iframe_locator=(By.ID, "paymentIframe")):
+        self.driver = driver
+        self.iframe_locator = iframe_locator
+        self.reports = []
+
+    def fill(self, card: dict, label: str = "payment") -> dict:
+        """
+        card: payment_card dict (cardholder_name, card_number, expiry_month, expiry_year, cvv, id_number)
+        Returns {"label", "seconds", "ok", "retyped": [keys], "fields": {key: {"value", "ok"}}}
+        Raises when a field still doesn't hold its value after the retry.
+        """
+        values = {key: str(card[key]) for key in CARD_FIELDS if card.get(key) is not None}
+        if "expiry_month" in values:
+            values["expiry_month"] = values["expiry_month"].zfill(2)
+        start = time.monotonic()
+
+        iframe = FattalWait(self.driver, timeout("payment")).until(
+            EC.presence_of_element_located(self.iframe_locator)
+        )
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", iframe)
+        self.driver.switch_to.frame(iframe)
+        try:
+            fields = self._fill_in_frame(values)
+            retyped = [key for key, field in fields.items() if not field["ok"]]
+            if retyped:
+                logging.warning(f"⚠️ Payment fields not accepted by the scripted fill: {', '.join(retyped)} — retyping.")
+                for key in retyped:
+                    fields[key] = self._retype(key, values[key], fields[key])
+        finally:
+            self.driver.switch_to.default_content()
+
+        report = {
+            "label": label,
+            "seconds": round(time.monotonic() - start, 2),
+            "ok": all(field["ok"] for field in fields.values()),
+            "retyped": retyped,
+            "fields": {key: {"value": field["value"], "ok": field["ok"]} for key, field in fields.items()},
+        }
+        self.reports.append(report)
+        logging.info(
+            f"💳 Payment form filled in {report['seconds']:.2f}s — "
+            f"{sum(f['ok'] for f in fields.values())}/{len(fields)} fields verified"
+            + (f", retyped: {', '.join(retyped)}" if retyped else "")
+        )
+        if not report["ok"]:
+            failed = [key for key, field in fields.items() if not field["ok"]]
+            raise AssertionError(f"❌ Payment fields rejected: {', '.join(failed)}")
+        return report
+
+    def _fill_in_frame(self, values: dict) -> dict:
+        keys = list(values)
+        entries = [{"id": CARD_FIELDS[key], "value": values[key]} for key in keys]
+        results = self.driver.execute_script(_FILL_JS, entries)
+        fields = {}
+        for key, result in zip(keys, results):
+            if result is None:
+                fields[key] = {"value": None, "ok": False, "select": False}
+                continue
+            ok = not result["disabled"] and normalized_value(result["value"]) == normalized_value(values[key])
+            fields[key] = {"value": result["value"], "ok": ok, "select": result["select"]}
+        return fields
+
+    def _retype(self, key: str, value: str, field: dict) -> dict:
+        try:
+            element = self.driver.find_element(By.ID, CARD_FIELDS[key])
+            if field["select"] or element.tag_name.lower() == "select":
+                select = Select(element)
+                select.select_by_visible_text(value)
+                actual = select.first_selected_option.text.strip()
+            else:
+                actual = typer_for(self.driver).type(element, value, mode=REALISTIC, label=key, char_delay=0)
+        except WebDriverException as e:
+            logging.error(f"❌ Could not retype payment field '{key}': {e.msg}")
+            return {"value": field["value"], "ok": False, "select": field["select"]}
+        return {"value": actual, "ok": normalized_value(actual) == normalized_value(value), "select": field["select"]}
+
+    def reset(self):
+        self.reports = []
+
+    def stats(self) -> dict:
+        return {"payment_fills": [
+            {"seconds": r["seconds"], "ok": r["ok"], "retyped": r["retyped"]} for r in self.reports
+        ]}
+
+
+def payment_form_for(driver) -> FattalPaymentForm:
+    form = getattr(driver, "_fattal_payment_form", None)
+    if form is None:
+        form = FattalPaymentForm(driver)
+        driver._fattal_payment_form = form
+    return form
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+# Popups the watchdog dismisses on sight: name -> close-button selectors, tried in order.
+# The membership renewal dialog is not here — answering it changes the booking flow,
+# so handle_membership_renewal_popup still decides that explicitly.
+POPUP_RULES = {
+    "war": ["#ex-popup-modal-close-btn", "a.u-close-button", "#war-popup-close-button"],
+    "post_login": [
+        "[data-testid='popup-close-button']",
+        ".sc-e8baa4cf-3.exmeUH",
+        ".sc-60b5ebd3-3.gMhFjt",
+    ],
+    "club": ["div.sc-c18678ea-3.iOzwib", "div[class^='sc-c18678ea-3']"],
+}
+
+# Survives navigations within the tab (same origin), unlike a window variable
+_LOG_KEY = "__fattal_popup_log"
+
+_WATCHDOG_JS = """
+(function (rules, logKey) {
+    if (window.__fattalPopupWatchdog) return;
+    window.__fattalPopupWatchdog = true;
+
+    const clicked = new WeakSet();
+    const visible = el => {
+        const style = window.getComputedStyle(el);
+        return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.pointerEvents !== 'none';
+    };
+    const record = (name, selector) => {
+        try {
+            const log = JSON.parse(sessionStorage.getItem(logKey) || '[]');
+            log.push({popup: name, selector: selector, url: location.href, at: Date.now()});
+            sessionStorage.setItem(logKey, JSON.stringify(log));
+        } catch (e) { /* storage blocked on this origin */ }
+    };
+    const sweep = () => {
+        for (const [name, selectors] of Object.entries(rules)) {
+            for (const selector of selectors) {
+                const el = Array.from(document.querySelectorAll(selector)).find(e => !clicked.has(e) && visible(e));
+                if (!el) continue;
+                clicked.add(el);
+                if (typeof el.click === 'function') el.click();
+                else el.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true, view: window}));
+                record(name, selector);
+                break;
+            }
+        }
+    };
+
+    let scheduled = false;
+    const schedule = () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; sweep(); });
+    };
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style', 'hidden'],
+        });
+        // Popups that fade in change visibility without a DOM mutation
+        setInterval(sweep, 500);
+        sweep();
+    };
+    if (document.documentElement) start();
+    else document.addEventListener('readystatechange', start, {once: true});
+})(%s, %s);
+"""
+
+
+def popup_watchdog_enabled() -> bool:
+    return os.getenv("POPUP_WATCHDOG", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class FattalPopupWatchdog:
+    """
+    Page-resident popup dismisser. The script is registered once per driver through
+    CDP Page.addScriptToEvaluateOnNewDocument, so every document the test opens closes
+    the registered popups itself the moment they become visible — no timed probes.
+    Each dismissal is logged in sessionStorage; dismissals() reads the log.
+    """
+
+    def __init__(self, driver, rules: dict = None):
+        self.driver = driver
+        self.rules = rules or POPUP_RULES
+        self.installed = False
+        self._script_id = None
+
+    def install(self):
+        source = _WATCHDOG_JS % (json.dumps(self.rules), json.dumps(_LOG_KEY))
+        try:
+            result = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            self._script_id = result.get("identifier")
+            # The current document was created before the registration
+            self.driver.execute_script(source)
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not install popup watchdog — falling back to per-popup probes: {e}")
+            return
+        self.installed = True
+        logging.info(f"🛡️ Popup watchdog installed for: {', '.join(self.rules)}")
+
+    def dismissals(self) -> list:
+        try:
+            return json.loads(self.driver.execute_script(f"return sessionStorage.getItem('{_LOG_KEY}') || '[]';"))
+        except (WebDriverException, ValueError):
+            return []
+
+    def handles(self, name: str) -> bool:
+        """True when the watchdog takes care of `name`, so the caller can skip its own probe."""
+        if not self.installed or name not in self.rules:
+            return False
+        closed = [d for d in self.dismissals() if d.get("popup") == name]
+        if closed:
+            logging.info(f"🛡️ {name} popup already dismissed by the watchdog ({len(closed)}x).")
+        else:
+            logging.info(f"🛡️ No {name} popup so far — the watchdog will dismiss it if it appears.")
+        return True
+
+    def reset(self):
+        try:
+            self.driver.execute_script(f"sessionStorage.removeItem('{_LOG_KEY}');")
+        except WebDriverException:
+            pass
+
+    def stats(self) -> dict:
+        by_popup = {}
+        for dismissal in self.dismissals():
+            by_popup[dismissal.get("popup")] = by_popup.get(dismissal.get("popup"), 0) + 1
+        return {"popups_dismissed": by_popup}
+
+
+def popup_watchdog_for(driver) -> FattalPopupWatchdog:
+    watchdog = getattr(driver, "_fattal_popup_watchdog", None)
+    if watchdog is None:
+        watchdog = FattalPopupWatchdog(driver)
+        driver._fattal_popup_watchdog = watchdog
+        if popup_watchdog_enabled():
+            watchdog.install()
+    return watchdog
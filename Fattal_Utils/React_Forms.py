@@ -0,0 +1,63 @@
+import logging
+import re
+import time
+
+# Sets every field through the native value setter and rewinds React's _valueTracker,
+# so React sees a real change, then reads all values back once every field is set
+# (a change in one field can re-render its siblings).
+_FILL_JS = """
+const entries = arguments[0];
+const nativeSetter = el => Object.getOwnPropertyDescriptor(
+    el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype, 'value'
+).set;
+const elements = entries.map(entry => entry.ids.map(id => document.getElementById(id)).find(Boolean) || null);
+
+entries.forEach((entry, i) => {
+    const el = elements[i];
+    if (!el || el.disabled || el.readOnly) return;
+    const lastValue = el.value;
+    nativeSetter(el).call(el, entry.value);
+    const tracker = el._valueTracker;
+    if (tracker) tracker.setValue(lastValue);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+});
+
+return elements.map(el => el ? {id: el.id, value: el.value, disabled: el.disabled || el.readOnly} : null);
+"""
+
+
+def normalized_value(value) -> str:
+    # Masks on the checkout form add dashes/spaces to phone numbers
+    return re.sub(r"[\s\-]", "", str(value))
+
+
+def fill_react_fields(driver, fields: dict) -> dict:
+    """
+    Fills React-controlled inputs in one execute_script call and verifies them in the same call.
+
+    fields: field id (or a tuple of alternative ids, first one present wins) -> value
+    Returns {key: {"id": matched id or None, "value": value read back, "ok": bool, "disabled": bool}}
+    Disabled/read-only fields (e.g. a logged-in member's email) are left untouched.
+    """
+    keys = list(fields)
+    entries = [
+        {"ids": list(key) if isinstance(key, tuple) else [key], "value": str(fields[key])}
+        for key in keys
+    ]
+    start = time.monotonic()
+    results = driver.execute_script(_FILL_JS, entries)
+    elapsed_ms = (time.monotonic() - start) * 1000
+
+    report = {}
+    for key, entry, result in zip(keys, entries, results):
+        if result is None:
+            report[key] = {"id": None, "value": None, "ok": False, "disabled": False}
+            continue
+        ok = not result["disabled"] and normalized_value(result["value"]) == normalized_value(entry["value"])
+        report[key] = {"id": result["id"], "value": result["value"], "ok": ok, "disabled": result["disabled"]}
+
+    ok_count = sum(1 for r in report.values() if r["ok"])
+    logging.info(f"📝 Filled {ok_count}/{len(report)} fields in one call ({elapsed_ms:.0f} ms).")
+    return report
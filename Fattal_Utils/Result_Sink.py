@@ -0,0 +1,174 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from Fattal_Utils.Worker_Env import worker_id
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+RUN_DATA = "run_data.json"
+SEGMENTS_DIR = "results"
+
+_thread_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive lock on <path>.lock, held across threads and processes (flock / msvcrt)."""
+    with _thread_lock, open(f"{path}.lock", "a+b") as handle:
+        if fcntl:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def append_record(path: str, record: dict):
+    """Appends one JSON line in a single locked write, so concurrent writers never interleave."""
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with file_lock(path), open(path, "ab") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_records(path: str) -> list:
+    """Every complete record in a JSON Lines file; a torn last line (writer killed mid-write) is skipped."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logging.warning(f"⚠️ Skipping unreadable line {number} of {path}")
+    return records
+
+
+def write_json_atomic(path: str, data):
+    """Writes to a temp file and renames it over path, so readers never see a half-written file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class FattalResultSink:
+    """
+    Test results of one run folder. Every process appends to its own JSON Lines segment
+    (results/<worker>_<pid>.jsonl), so a test costs one locked append instead of rereading
+    and rewriting run_data.json. compact() rebuilds run_data.json from all segments in the
+    shape the dashboard reads; it is idempotent, so every worker can call it at session end.
+    """
+
+    def __init__(self, run_folder: str):
+        self.run_folder = run_folder
+        self.segments_dir = os.path.join(run_folder, SEGMENTS_DIR)
+        self.segment = os.path.join(self.segments_dir, f"{worker_id() or 'main'}_{os.getpid()}.jsonl")
+        self.run_data = os.path.join(run_folder, RUN_DATA)
+
+    def append(self, info: dict):
+        os.makedirs(self.segments_dir, exist_ok=True)
+        append_record(self.segment, info)
+
+    def segments(self) -> list:
+        return sorted(glob.glob(os.path.join(self.segments_dir, "*.jsonl")))
+
+    def records(self) -> list:
+        """All results of the run in timestamp order, including segments not compacted yet."""
+        segments = self.segments()
+        if not segments:
+            if not os.path.exists(self.run_data):
+                return []
+            with open(self.run_data, "r", encoding="utf-8") as f:
+                return json.load(f)
+        records = [record for segment in segments for record in read_records(segment)]
+        return sorted(records, key=lambda record: record.get("timestamp", ""))
+
+    def compact(self) -> str:
+        """Writes run_data.json from every segment. Returns its path."""
+        if not self.segments():
+            return self.run_data
+        with file_lock(self.run_data):
+            records = self.records()
+            write_json_atomic(self.run_data, records)
+        logging.info(f"📄 Compacted {len(records)} results into {self.run_data}")
+        return self.run_data
+
+
+_sinks = {}
+
+
+def result_sink_for(run_folder: str) -> FattalResultSink:
+    key = os.path.abspath(run_folder)
+    sink = _sinks.get(key)
+    if sink is None:
+        sink = FattalResultSink(run_folder)
+        _sinks[key] = sink
+    return sink
+
+
+def has_results(run_folder: str) -> bool:
+    return os.path.exists(os.path.join(run_folder, RUN_DATA)) or bool(result_sink_for(run_folder).segments())
+
+
+def load_run(run_folder: str) -> list:
+    """A run's results as run_data.json holds them, whether or not the run has been compacted."""
+    return result_sink_for(run_folder).records()
+
+
+def append_order(cancel_file: str, order: dict):
+    """Queues an order for cancellation in <cancel_file>l (JSON Lines) until compact_orders() runs."""
+    append_record(f"{cancel_file}l", order)
+
+
+def compact_orders(cancel_file: str) -> int:
+    """
+    Moves queued orders into cancel_file (the JSON list Cancel_Order_Automation reads) and empties
+    the queue. Returns how many were moved.
+    """
+    queue_path = f"{cancel_file}l"
+    with file_lock(queue_path):
+        queued = read_records(queue_path)
+        if not queued:
+            return 0
+        orders = []
+        if os.path.exists(cancel_file):
+            try:
+                with open(cancel_file, "r", encoding="utf-8") as f:
+                    orders = json.load(f)
+            except ValueError as e:
+                logging.warning(f"⚠️ {cancel_file} is invalid — starting a new list. ({e})")
+            if not isinstance(orders, list):
+                logging.warning(f"⚠️ {cancel_file} does not contain a list. Resetting it.")
+                orders = []
+        write_json_atomic(cancel_file, orders + queued)
+        open(queue_path, "w").close()
+    logging.info(f"🗑 {len(queued)} order(s) added to {cancel_file} for cancellation.")
+    return len(queued)
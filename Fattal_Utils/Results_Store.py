@@ -0,0 +1,283 @@
+"""
+SQLite store of every test result: runs, results, log steps, artifacts and booked orders.
+
+    python -m Fattal_Utils.Results_Store import
+    python -m Fattal_Utils.Results_Store history test_mobile_booking_club_member_11night --days 30
+
+"import" backfills html_reports/runs/run_*/run_data.json and the logs/ and logs_mobile/ folders
+(log files no run_data entry points to become results with status UNKNOWN); re-importing is a no-op.
+The suites write each result here from post_test_logging. RESULTS_DB overrides the database path.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+from Fattal_Utils.Result_Sink import has_results, load_run
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Fattal_Tests")
+DEFAULT_DB = os.path.join(TESTS_DIR, "html_reports", "results.db")
+
+# info keys that hold artifact paths, and what kind of artifact each is
+ARTIFACT_KEYS = {
+    "log": "log",
+    "room_selection": "screenshot",
+    "payment_stage": "screenshot",
+    "confirmation_screenshot": "screenshot",
+    "error_screenshot": "screenshot",
+}
+
+# Log folder -> test_type of the suites writing into it
+LOG_DIRS = {"logs_mobile": "mobile", "logs": "desktop"}
+
+_LOG_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:,\d+)? - (\w+) - (.*)$")
+_LOG_NAME = re.compile(r"^(?P<name>.+)_(?P<stamp>\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.log$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  TEXT,
+    folder      TEXT
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    id          INTEGER PRIMARY KEY,
+    result_key  TEXT NOT NULL UNIQUE,
+    run_id      TEXT REFERENCES runs(run_id),
+    test_id     TEXT,
+    name        TEXT NOT NULL,
+    test_type   TEXT,
+    status      TEXT,
+    recorded_at TEXT,
+    duration    REAL,
+    description TEXT,
+    error       TEXT,
+    data        TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    result_id   INTEGER NOT NULL REFERENCES test_results(id) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    logged_at   TEXT,
+    level       TEXT,
+    message     TEXT,
+    PRIMARY KEY (result_id, seq)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    result_id   INTEGER NOT NULL REFERENCES test_results(id) ON DELETE CASCADE,
+    label       TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    PRIMARY KEY (result_id, label)
+);
+CREATE TABLE IF NOT EXISTS orders (
+    order_number TEXT PRIMARY KEY,
+    result_id    INTEGER REFERENCES test_results(id) ON DELETE SET NULL,
+    email        TEXT,
+    full_name    TEXT,
+    recorded_at  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_name ON test_results(name, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_status ON test_results(status, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_date ON test_results(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_type ON test_results(test_type, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON test_results(run_id);
+CREATE INDEX IF NOT EXISTS idx_orders_result ON orders(result_id);
+"""
+
+
+def _seconds(duration):
+    try:
+        return float(str(duration).rstrip("s"))
+    except ValueError:
+        return None
+
+
+def parse_steps(log_text: str) -> list:
+    """(logged_at, level, message) per log record; continuation lines (tracebacks) join the record above."""
+    steps = []
+    for line in log_text.splitlines():
+        match = _LOG_LINE.match(line)
+        if match:
+            steps.append(list(match.groups()))
+        elif steps and line.strip():
+            steps[-1][2] += "\n" + line
+    return [tuple(step) for step in steps]
+
+
+class FattalResultsStore:
+    """
+    Test history in one SQLite file (WAL mode, so parallel workers can write while the
+    dashboard or a query reads). Results are keyed by run, test and timestamp, so
+    recording the same result twice — or re-running the importer — changes nothing.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("RESULTS_DB") or DEFAULT_DB
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ── Writing ────────────────────────────────────────
+
+    def record(self, info: dict, run_id: str = None, log_text: str = None, run_folder: str = None):
+        """
+        Stores one post_test_logging info dict with its artifacts, order and log steps
+        (log_text, else the file at info["log"]). Returns the result id, or None if it was already stored.
+        """
+        recorded_at = info.get("timestamp", "")
+        key = f"{run_id or ''}|{info.get('test_id') or info.get('name')}|{recorded_at}"
+        with self.conn:
+            if run_id:
+                started = datetime.strptime(run_id, "run_%Y-%m-%d_%H-%M-%S").strftime("%Y-%m-%d %H:%M:%S") \
+                    if run_id.startswith("run_") else None
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, started_at, folder) VALUES (?, ?, ?)",
+                    (run_id, started, run_folder),
+                )
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO test_results (result_key, run_id, test_id, name, test_type, status, "
+                "recorded_at, duration, description, error, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, run_id, info.get("test_id"), info.get("name", ""), info.get("test_type"), info.get("status"),
+                 recorded_at, _seconds(info.get("duration", "")), info.get("description"), info.get("error"),
+                 json.dumps(info, ensure_ascii=False)),
+            )
+            if not cursor.rowcount:
+                return None
+            result_id = cursor.lastrowid
+
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO artifacts (result_id, label, kind, path) VALUES (?, ?, ?, ?)",
+                [(result_id, label, kind, info[label]) for label, kind in ARTIFACT_KEYS.items() if info.get(label)],
+            )
+            if info.get("order_number"):
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO orders (order_number, result_id, email, full_name, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (str(info["order_number"]), result_id, info.get("email"), info.get("full_name"), recorded_at),
+                )
+            if log_text is None and info.get("log") and os.path.exists(info["log"]):
+                with open(info["log"], "r", encoding="utf-8", errors="replace") as f:
+                    log_text = f.read()
+            if log_text:
+                self.conn.executemany(
+                    "INSERT INTO steps (result_id, seq, logged_at, level, message) VALUES (?, ?, ?, ?, ?)",
+                    [(result_id, seq, *step) for seq, step in enumerate(parse_steps(log_text))],
+                )
+        return result_id
+
+    def import_history(self, runs_dir: str = None, tests_dir: str = TESTS_DIR) -> dict:
+        """Backfills every run folder and every log file not referenced by an imported result."""
+        runs_dir = runs_dir or os.path.join(tests_dir, "html_reports", "runs")
+        counts = {"runs": 0, "results": 0, "logs": 0}
+        for folder in sorted(glob.glob(os.path.join(runs_dir, "run_*"))):
+            if not has_results(folder):
+                continue
+            counts["runs"] += 1
+            run_id = os.path.basename(folder)
+            for info in load_run(folder):
+                if isinstance(info, dict) and self.record(info, run_id, run_folder=folder):
+                    counts["results"] += 1
+
+        known_logs = {
+            os.path.basename(row["path"].replace("\\", "/"))
+            for row in self.conn.execute("SELECT path FROM artifacts WHERE kind = 'log'")
+        }
+        for log_dir, test_type in LOG_DIRS.items():
+            for path in sorted(glob.glob(os.path.join(tests_dir, log_dir, "*.log"))):
+                match = _LOG_NAME.match(os.path.basename(path))
+                if not match or os.path.basename(path) in known_logs:
+                    continue
+                stamp = datetime.strptime(match.group("stamp"), "%Y-%m-%d_%H-%M-%S")
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    log_text = f.read()
+                info = {
+                    "name": match.group("name"),
+                    "status": "UNKNOWN",
+                    "timestamp": stamp.strftime("%Y-%m-%d %H:%M:%S"),
+                    "test_type": test_type,
+                    "log": path,
+                }
+                steps = parse_steps(log_text)
+                if steps:
+                    # The log spans the test, so its first and last records bound the duration
+                    first, last = (datetime.strptime(steps[i][0], "%Y-%m-%d %H:%M:%S") for i in (0, -1))
+                    info["duration"] = f"{(last - first).total_seconds():.2f}s"
+                if self.record(info, log_text=log_text):
+                    counts["logs"] += 1
+        logging.info(f"🗄 Imported {counts['results']} results from {counts['runs']} runs and {counts['logs']} log files.")
+        return counts
+
+    # ── Queries ────────────────────────────────────────
+
+    def history(self, name: str, days: int = 30) -> list:
+        """Every result of one test over the last `days` days, newest first."""
+        since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        return self.conn.execute(
+            "SELECT run_id, test_type, status, recorded_at, duration, error FROM test_results "
+            "WHERE name = ? AND recorded_at >= ? ORDER BY recorded_at DESC",
+            (name, since),
+        ).fetchall()
+
+    def summary(self, name: str, days: int = 30) -> dict:
+        since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS runs, SUM(status = 'PASSED') AS passed, SUM(status = 'FAILED') AS failed, "
+            "AVG(duration) AS avg_duration, MAX(duration) AS max_duration, MAX(recorded_at) AS last_run "
+            "FROM test_results WHERE name = ? AND recorded_at >= ?",
+            (name, since),
+        ).fetchone()
+        return dict(row)
+
+    def steps(self, result_id: int) -> list:
+        return self.conn.execute(
+            "SELECT logged_at, level, message FROM steps WHERE result_id = ? ORDER BY seq", (result_id,)
+        ).fetchall()
+
+
+_stores = {}
+
+
+def results_store(path: str = None) -> FattalResultsStore:
+    """One store (and SQLite connection) per database path per process."""
+    path = os.path.abspath(path or os.getenv("RESULTS_DB") or DEFAULT_DB)
+    store = _stores.get(path)
+    if store is None:
+        store = FattalResultsStore(path)
+        _stores[path] = store
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help=f"database path (default: RESULTS_DB or {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("import", help="backfill run_data.json files and log files")
+    history = commands.add_parser("history", help="one test's results over the last days")
+    history.add_argument("name")
+    history.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = results_store(args.db)
+    if args.command == "import":
+        store.import_history()
+        return
+    summary = store.summary(args.name, args.days)
+    print(f"{args.name}: {summary['runs']} runs in {args.days} days, ✅ {summary['passed'] or 0} "
+          f"❌ {summary['failed'] or 0}, avg {summary['avg_duration'] or 0:.0f}s, max {summary['max_duration'] or 0:.0f}s")
+    for row in store.history(args.name, args.days):
+        duration = f"{row['duration']:.0f}s" if row["duration"] is not None else "-"
+        print(f"{row['recorded_at']}  {row['status']:<8}{duration:>7}  {row['run_id'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
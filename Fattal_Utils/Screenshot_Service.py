@@ -0,0 +1,151 @@
+import atexit
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from PIL import Image
+
+from Fattal_Utils.Artifact_Store import artifact_store, artifact_store_enabled, content_hash, perceptual_hash
+
+# Pillow format and file extension per SCREENSHOT_FORMAT
+FORMATS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg"), "png": ("PNG", ".png")}
+THUMBS_DIR = "thumbs"
+# The dashboards show screenshots at max-height:120px; twice that stays sharp on HiDPI screens
+THUMB_SIZE = (480, 240)
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = {}  # path -> Future, until the file is written
+
+
+def screenshot_format() -> str:
+    fmt = os.getenv("SCREENSHOT_FORMAT", "webp").strip().lower()
+    return "jpeg" if fmt == "jpg" else fmt if fmt in FORMATS else "webp"
+
+
+def screenshot_quality() -> int:
+    return max(1, min(100, int(os.getenv("SCREENSHOT_QUALITY", "80"))))
+
+
+def thumbnail_path(path: str) -> str:
+    """Screenshots/worker_1/x.webp -> Screenshots/worker_1/thumbs/x.webp"""
+    return os.path.join(os.path.dirname(path), THUMBS_DIR, os.path.basename(path))
+
+
+def screenshot_exists(path: str) -> bool:
+    """True once a screenshot is written, and while it is still queued for encoding."""
+    return bool(path) and (path in _pending or os.path.exists(path))
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SCREENSHOT_WORKERS", "2")), thread_name_prefix="screenshot"
+            )
+    return _pool
+
+
+def _save(image: Image.Image, path: str, fmt: str, quality: int):
+    pil_format = FORMATS[fmt][0]
+    if pil_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    options = {"optimize": True} if pil_format == "PNG" else {"quality": quality}
+    tmp_path = f"{path}.tmp"
+    image.save(tmp_path, pil_format, **options)
+    os.replace(tmp_path, path)
+
+
+def _encode(png: bytes, path: str, fmt: str, quality: int):
+    try:
+        with Image.open(io.BytesIO(png)) as image:
+            image.load()
+            _save(image, path, fmt, quality)
+            image.thumbnail(THUMB_SIZE)
+            os.makedirs(os.path.dirname(thumbnail_path(path)), exist_ok=True)
+            _save(image, thumbnail_path(path), fmt, quality)
+    except Exception as e:
+        logging.warning(f"⚠️ Could not encode screenshot {path}: {e}")
+
+
+def wait_for_screenshots(timeout: float = 60) -> int:
+    """Blocks until queued screenshots are on disk (or timeout). Returns how many are still pending."""
+    futures = list(_pending.values())
+    if futures:
+        wait(futures, timeout=timeout)
+    return len(_pending)
+
+
+atexit.register(wait_for_screenshots)
+
+
+class FattalScreenshotService:
+    """
+    Takes screenshots without writing them on the test thread. capture() grabs the PNG bytes from
+    the driver and returns the final path at once; a shared thread pool re-encodes them as
+    SCREENSHOT_FORMAT (webp, jpeg or png) at SCREENSHOT_QUALITY and writes a small copy to
+    thumbs/ next to it for the dashboards. A capture whose pixels are already stored (the
+    confirmation page is shot twice, for instance) returns the earlier path instead of writing
+    another file.
+    """
+
+    def __init__(self, driver, recent: int = 32):
+        self.driver = driver
+        self.recent = recent
+        self._by_digest = OrderedDict()
+        self.captured = 0
+        self.collapsed = 0
+
+    def capture(self, directory: str, name: str) -> str:
+        """
+        Screenshot of the current viewport. Returns its path: the artifact store's copy of these pixels
+        (see Artifact_Store), or <directory>/<name>.<ext> when ARTIFACT_STORE=0.
+        """
+        png = self.driver.get_screenshot_as_png()
+        digest = content_hash(png)
+        earlier = self._by_digest.get(digest)
+        if earlier and screenshot_exists(earlier):
+            self._by_digest.move_to_end(digest)
+            self.collapsed += 1
+            logging.info(f"📸 Page unchanged since {os.path.basename(earlier)} — reusing that screenshot")
+            return earlier
+
+        fmt = screenshot_format()
+        ext = FORMATS[fmt][1]
+        if artifact_store_enabled():
+            store = artifact_store()
+            phash = perceptual_hash(png) if store.phash_distance else None
+            stored = store.find(digest, ext, phash)
+            if stored and screenshot_exists(stored):
+                self._remember(digest, stored)
+                self.collapsed += 1
+                logging.info(f"📸 '{name}' is already stored as {os.path.basename(stored)} — reusing it")
+                return stored
+            path = store.add(digest, ext, "screenshot", phash=phash)
+        else:
+            path = os.path.join(directory, f"{name}{ext}")
+            os.makedirs(directory, exist_ok=True)
+        future = _executor().submit(_encode, png, path, fmt, screenshot_quality())
+        _pending[path] = future
+        # Runs at once if encoding already finished
+        future.add_done_callback(lambda done: _pending.pop(path, None) if _pending.get(path) is done else None)
+        self._remember(digest, path)
+        self.captured += 1
+        return path
+
+    def _remember(self, digest: str, path: str):
+        self._by_digest[digest] = path
+        if len(self._by_digest) > self.recent:
+            self._by_digest.popitem(last=False)
+
+
+def screenshot_service_for(driver) -> FattalScreenshotService:
+    service = getattr(driver, "_fattal_screenshot_service", None)
+    if service is None:
+        service = FattalScreenshotService(driver)
+        driver._fattal_screenshot_service = service
+    return service
@@ -0,0 +1,170 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+
+@dataclass
+class SessionLease:
+    """A driver handed out by FattalSessionPool plus what it cost to get it."""
+    driver: object
+    launch_seconds: float = 0.0
+    reset_seconds: float = 0.0
+    relaunched: bool = False
+
+    def timing(self) -> dict:
+        return {
+            "driver_launch": f"{self.launch_seconds:.2f}s",
+            "driver_reset": f"{self.reset_seconds:.2f}s",
+        }
+
+
+class FattalSessionPool:
+    """
+    Keeps N pre-launched Chrome drivers and hands them out one test at a time.
+    Between tests the browser state is wiped (cookies, local/session storage,
+    origin data via CDP Storage.clearDataForOrigin) and the driver is sent back
+    to the start URL. A driver is only relaunched when it crashed or fails the
+    health check, so a suite pays the cold-launch cost once instead of per test.
+    """
+
+    def __init__(self, driver_builder, size: int = 1, start_url: str = None):
+        self.driver_builder = driver_builder
+        self.size = max(1, int(size))
+        self.start_url = start_url
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._all_drivers = []
+        self.launch_count = 0
+        self.total_launch_seconds = 0.0
+        self.total_reset_seconds = 0.0
+
+    def warm_up(self):
+        """Launches drivers until the pool holds `size` of them."""
+        while len(self._all_drivers) < self.size:
+            driver, seconds = self._launch()
+            if self.start_url:
+                driver.get(self.start_url)
+            self._idle.put(driver)
+        logging.info(f"🔥 Session pool warmed up with {self.size} driver(s).")
+
+    def acquire(self, timeout: float = 300) -> SessionLease:
+        """Leases a healthy, freshly reset driver. Blocks while all drivers are leased."""
+        with self._lock:
+            if self._idle.empty() and len(self._all_drivers) < self.size:
+                driver, seconds = self._launch()
+                if self.start_url:
+                    driver.get(self.start_url)
+                return SessionLease(driver=driver, launch_seconds=seconds)
+
+        driver = self._idle.get(timeout=timeout)
+        lease = SessionLease(driver=driver)
+
+        if not self._is_healthy(driver):
+            logging.warning("⚠️ Pooled driver failed health check — relaunching.")
+            self._discard(driver)
+            lease.driver, lease.launch_seconds = self._launch()
+            lease.relaunched = True
+
+        reset_start = time.perf_counter()
+        try:
+            self._reset(lease.driver)
+            lease.reset_seconds = time.perf_counter() - reset_start
+        except WebDriverException as e:
+            lease.reset_seconds = time.perf_counter() - reset_start
+            logging.warning(f"⚠️ Driver reset failed ({e.__class__.__name__}) — relaunching.")
+            self._discard(lease.driver)
+            lease.driver, seconds = self._launch()
+            lease.launch_seconds += seconds
+            lease.relaunched = True
+            if self.start_url:
+                lease.driver.get(self.start_url)
+        self.total_reset_seconds += lease.reset_seconds
+
+        logging.info(
+            f"🚗 Leased pooled driver (launch {lease.launch_seconds:.2f}s, reset {lease.reset_seconds:.2f}s)."
+        )
+        return lease
+
+    def release(self, driver, discard: bool = False):
+        """Returns a driver to the pool. Pass discard=True to quit it instead."""
+        if driver is None:
+            return
+        if discard:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def close(self):
+        """Quits every driver the pool ever launched and logs the launch/reset totals."""
+        with self._lock:
+            for driver in list(self._all_drivers):
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logging.warning(f"Browser quit failed: {e}")
+            self._all_drivers.clear()
+            while not self._idle.empty():
+                self._idle.get_nowait()
+        logging.info(
+            f"🏁 Session pool closed — {self.launch_count} launch(es) "
+            f"({self.total_launch_seconds:.2f}s), resets took {self.total_reset_seconds:.2f}s in total."
+        )
+
+    def _launch(self):
+        start = time.perf_counter()
+        driver = self.driver_builder()
+        seconds = time.perf_counter() - start
+        self._all_drivers.append(driver)
+        self.launch_count += 1
+        self.total_launch_seconds += seconds
+        logging.info(f"🚀 Launched Chrome driver in {seconds:.2f}s.")
+        return driver, seconds
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if driver in self._all_drivers:
+            self._all_drivers.remove(driver)
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    @staticmethod
+    def _origin(url: str):
+        parsed = urlparse(url or "")
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return None
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank and error pages have no storage
+
+        origins = {self._origin(driver.current_url), self._origin(self.start_url)}
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in filter(None, origins):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+        if self.start_url:
+            driver.get(self.start_url)
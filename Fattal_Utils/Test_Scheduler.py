@@ -0,0 +1,135 @@
+import glob
+import logging
+import os
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+
+from Fattal_Utils.Result_Sink import has_results, load_run
+
+# Cost assumed for a test when neither it nor anything in its module has history yet
+DEFAULT_SECONDS = 180.0
+
+
+@dataclass(frozen=True)
+class TestCost:
+    """
+    What history says one test costs.
+    source: "history", "module" (median of its module's tests), "suite" (median of all known tests) or "default".
+    """
+    test_id: str
+    median: float
+    p90: float
+    runs: int = 0
+    fail_rate: float = 0.0
+    source: str = "history"
+
+
+def unittest_id(node_id: str) -> str:
+    """Fattal_Tests/test_x.py::Class::test_y -> Fattal_Tests.test_x.Class.test_y (what TestCase.id() returns)."""
+    path, _, rest = node_id.partition("::")
+    module = os.path.splitext(path)[0].replace("\\", "/").replace("/", ".")
+    return f"{module}.{rest.replace('::', '.')}" if rest else module
+
+
+def _seconds(duration) -> float:
+    try:
+        return float(str(duration).rstrip("s"))
+    except ValueError:
+        return None
+
+
+def _p90(samples: list) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, -(-len(ordered) * 9 // 10) - 1)]
+
+
+def load_history(runs_dir: str, max_runs: int = 30) -> dict:
+    """
+    Durations and outcomes of the last `max_runs` runs under html_reports/runs.
+    Returns key -> [(seconds, failed), ...], keyed by "test_id" when an entry has one, else by its "name".
+    """
+    history = defaultdict(list)
+    run_folders = [folder for folder in sorted(glob.glob(os.path.join(runs_dir, "run_*"))) if has_results(folder)]
+    for folder in run_folders[-max_runs:]:
+        try:
+            entries = load_run(folder)
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Skipping unreadable run history {folder}: {e}")
+            continue
+        for entry in entries if isinstance(entries, list) else []:
+            seconds = _seconds(entry.get("duration", ""))
+            key = entry.get("test_id") or entry.get("name")
+            if seconds is not None and key:
+                history[key].append((seconds, entry.get("status") == "FAILED"))
+    return dict(history)
+
+
+class FattalScheduler:
+    """
+    Assigns tests to parallel workers longest-processing-time first: tests are taken in order
+    of decreasing median duration and each goes to the worker with the least predicted work.
+    Inside a worker, tests stay grouped by class (so setUpClass runs once per class) and
+    historically failing classes and tests run first, so their failures surface early.
+    """
+
+    def __init__(self, history: dict, default_seconds: float = DEFAULT_SECONDS):
+        self.history = history
+        self.default_seconds = default_seconds
+
+    def _samples(self, node_id: str) -> list:
+        # Entries written before run_data carried test_id only know the method name
+        return self.history.get(unittest_id(node_id)) or self.history.get(node_id.rsplit("::", 1)[-1], [])
+
+    def estimate(self, node_ids: list) -> dict:
+        costs = {}
+        by_module = defaultdict(list)
+        for node_id in node_ids:
+            samples = self._samples(node_id)
+            if samples:
+                durations = [seconds for seconds, _ in samples]
+                costs[node_id] = TestCost(
+                    node_id, statistics.median(durations), _p90(durations), len(samples),
+                    sum(failed for _, failed in samples) / len(samples),
+                )
+                by_module[node_id.split("::")[0]].append(costs[node_id].median)
+
+        known = [cost.median for cost in costs.values()]
+        for node_id in node_ids:
+            if node_id in costs:
+                continue
+            module = by_module.get(node_id.split("::")[0])
+            if module:
+                seconds, source = statistics.median(module), "module"
+            elif known:
+                seconds, source = statistics.median(known), "suite"
+            else:
+                seconds, source = self.default_seconds, "default"
+            costs[node_id] = TestCost(node_id, seconds, seconds, source=source)
+        return costs
+
+    def assign(self, node_ids: list, workers: int) -> tuple:
+        """Returns (shards, costs): one ordered list of node ids per worker, and node id -> TestCost."""
+        costs = self.estimate(node_ids)
+        loads = [0.0] * workers
+        buckets = [[] for _ in range(workers)]
+        for node_id in sorted(node_ids, key=lambda n: costs[n].median, reverse=True):
+            worker = loads.index(min(loads))
+            buckets[worker].append(node_id)
+            loads[worker] += costs[node_id].median
+        return [self._order(bucket, costs) for bucket in buckets if bucket], costs
+
+    @staticmethod
+    def _order(bucket: list, costs: dict) -> list:
+        classes = defaultdict(list)
+        for node_id in bucket:
+            classes[node_id.rsplit("::", 1)[0]].append(node_id)
+        for tests in classes.values():
+            tests.sort(key=lambda n: (-costs[n].fail_rate, -costs[n].median))
+        ordered = sorted(classes.values(), key=lambda tests: -max(costs[n].fail_rate for n in tests))
+        return [node_id for tests in ordered for node_id in tests]
+
+
+def predicted_seconds(shard: list, costs: dict) -> tuple:
+    """(median, p90) predicted run time of one worker's shard."""
+    return sum(costs[n].median for n in shard), sum(costs[n].p90 for n in shard)
@@ -0,0 +1,87 @@
+import logging
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+from Fattal_Utils.React_Forms import normalized_value
+
+FAST = "fast"
+REALISTIC = "realistic"
+
+# Focuses the field and empties it with select-all + one delete. execCommand goes through
+# the browser's editing path, so React receives a genuine input event for the deletion.
+_FOCUS_AND_CLEAR_JS = """
+const el = arguments[0];
+el.focus();
+if (el.value) {
+    document.execCommand('selectAll', false, null);
+    document.execCommand('delete', false, null);
+}
+return el.value;
+"""
+
+_BLUR_AND_READ_JS = """
+const el = arguments[0];
+el.blur();
+return el.value;
+"""
+
+
+def typing_mode(mode: str = None) -> str:
+    """The mode for one call: the explicit argument, else TYPING_MODE (default fast)."""
+    mode = (mode or os.getenv("TYPING_MODE", FAST)).strip().lower()
+    return mode if mode in (FAST, REALISTIC) else FAST
+
+
+class FattalTyper:
+    """
+    Types into inputs in a fixed number of WebDriver commands:
+    focus + select-all + delete in one script, the whole text through CDP Input.insertText
+    (which fires the same beforeinput/input events as a keyboard), then blur + read back.
+    Realistic mode keeps the old per-character send_keys behaviour for fields that
+    react to individual key events; fast mode falls back to it when the value doesn't stick.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def type(self, element, text, mode: str = None, label: str = "field", char_delay: float = 0.04) -> str:
+        text = str(text)
+        if typing_mode(mode) == FAST:
+            try:
+                value = self._insert(element, text)
+                # Masked fields (phone numbers, dates) format what they receive
+                if normalized_value(value) == normalized_value(text):
+                    return value
+                logging.warning(f"⚠️ Fast typing into '{label}' read back '{value}' — retyping key by key.")
+            except WebDriverException as e:
+                logging.warning(f"⚠️ Fast typing into '{label}' failed ({e.msg}) — retyping key by key.")
+        return self._type_keys(element, text, char_delay)
+
+    def _insert(self, element, text: str) -> str:
+        leftover = self.driver.execute_script(_FOCUS_AND_CLEAR_JS, element)
+        if leftover:
+            raise WebDriverException(f"field still holds '{leftover}' after clearing")
+        if text:
+            self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        return self.driver.execute_script(_BLUR_AND_READ_JS, element)
+
+    def _type_keys(self, element, text: str, char_delay: float) -> str:
+        element.click()
+        element.clear()
+        for _ in range(20):
+            element.send_keys(Keys.BACKSPACE)
+        for char in text:
+            element.send_keys(char)
+            time.sleep(char_delay)
+        return self.driver.execute_script(_BLUR_AND_READ_JS, element)
+
+
+def typer_for(driver) -> FattalTyper:
+    typer = getattr(driver, "_fattal_typer", None)
+    if typer is None:
+        typer = FattalTyper(driver)
+        driver._fattal_typer = typer
+    return typer
@@ -0,0 +1,223 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from selenium.common import NoSuchElementException, NoSuchFrameException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.wait import WebDriverWait
+
+# Every wait in the suites uses one of these names. Override with WAIT_TIMEOUT_<NAME>=<seconds>.
+TIMEOUTS = {
+    "element": 10,          # bare find_element calls (what implicitly_wait(10) used to give)
+    "short": 3,
+    "default": 10,
+    "popup": 2,
+    "page_load": 30,
+    "search_results": 90,
+    "payment": 30,
+}
+
+# What every negative probe cost while the suites ran with implicitly_wait(10)
+LEGACY_IMPLICIT_WAIT = 10
+
+# Card fields that must be interactable before the payment iframe is filled
+PAYMENT_FIELDS = ("card_holder_name_input", "credit_card_number_input", "date_month_input", "cvv_input")
+
+_FIELDS_READY_JS = """
+    if (document.readyState !== 'complete' || location.href === 'about:blank') return false;
+    return arguments[0].every(id => {
+        const el = document.getElementById(id);
+        if (!el || el.disabled || el.readOnly) return false;
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    });
+"""
+
+_FIND_COMMANDS = {Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS}
+_LIST_COMMANDS = {Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS}
+
+
+def timeout(name: str) -> float:
+    return float(os.getenv(f"WAIT_TIMEOUT_{name.upper()}", TIMEOUTS[name]))
+
+
+def _lookup_mode(driver):
+    """"wait" inside an explicit wait, "probe" inside FattalWaitPolicy.probe, otherwise None."""
+    modes = getattr(driver, "_fattal_lookup_modes", None)
+    return modes[-1] if modes else None
+
+
+@contextmanager
+def explicit_wait(driver, mode: str = "wait"):
+    """
+    Element lookups inside this block make a single attempt: the surrounding wait polls
+    (mode="wait"), or the caller wants an answer right now (mode="probe"). Everywhere
+    else ExplicitWaitMixin polls each lookup for the "element" timeout.
+    """
+    driver = getattr(driver, "parent", driver)  # a WebElement root -> its driver
+    modes = getattr(driver, "_fattal_lookup_modes", None)
+    if modes is None:
+        modes = driver._fattal_lookup_modes = []
+    modes.append(mode)
+    try:
+        yield
+    finally:
+        modes.pop()
+
+
+class FattalWait(WebDriverWait):
+    """WebDriverWait whose conditions look each element up once per poll (see explicit_wait)."""
+
+    def until(self, method, message: str = ""):
+        with explicit_wait(self._driver):
+            return super().until(method, message)
+
+    def until_not(self, method, message: str = ""):
+        with explicit_wait(self._driver):
+            return super().until_not(method, message)
+
+
+class FattalWaitStats:
+    """
+    Counts probes (FattalWaitPolicy.probe/present) that came back empty.
+    Under the old implicitly_wait(10) each of those blocked for the full 10 seconds,
+    so probes * 10 is the time the explicit-only policy saves per test.
+    """
+
+    def __init__(self):
+        self.negative_probes = 0
+        self.payment_iframe_seconds = 0.0
+
+    def reset(self):
+        self.negative_probes = 0
+        self.payment_iframe_seconds = 0.0
+
+    def record(self, found: bool):
+        if not found:
+            self.negative_probes += 1
+
+    def stats(self) -> dict:
+        return {
+            "implicit_wait_probes": self.negative_probes,
+            "implicit_wait_seconds_saved": self.negative_probes * LEGACY_IMPLICIT_WAIT,
+            "payment_iframe_wait": f"{self.payment_iframe_seconds:.2f}s",
+        }
+
+
+class ExplicitWaitMixin:
+    """
+    Mixed into the Chrome driver class built by Driver_Factory. Implicit waits stay at 0;
+    instead, outside explicit_wait() every element lookup (driver or child, single or list)
+    polls for the "element" timeout, as implicitly_wait(10) did. Inside an explicit wait
+    or a probe each lookup is one attempt, and empty probes are recorded in wait_stats_for(driver).
+    """
+
+    def execute(self, driver_command, params=None):
+        if driver_command not in _FIND_COMMANDS:
+            return super().execute(driver_command, params)
+        mode = _lookup_mode(self)
+        if mode:
+            response = super().execute(driver_command, params)
+            if mode == "probe" and driver_command in _LIST_COMMANDS:
+                wait_stats_for(self).record(found=bool(response.get("value")))
+            return response
+        deadline = time.monotonic() + timeout("element")
+        while True:
+            try:
+                response = super().execute(driver_command, params)
+                if driver_command not in _LIST_COMMANDS or response.get("value") or time.monotonic() >= deadline:
+                    return response
+            except NoSuchElementException:
+                if time.monotonic() >= deadline:
+                    raise
+            time.sleep(0.25)
+
+
+class payment_iframe_ready:
+    """
+    Expected condition: the payment iframe is attached and loaded, and every card field
+    in field_ids is visible and enabled inside it. Always leaves the driver on the main document.
+    """
+
+    def __init__(self, iframe_locator=(By.ID, "paymentIframe"), field_ids=PAYMENT_FIELDS):
+        self.iframe_locator = iframe_locator
+        self.field_ids = list(field_ids)
+
+    def __call__(self, driver):
+        driver.switch_to.default_content()
+        iframes = driver.find_elements(*self.iframe_locator)
+        if not iframes or not iframes[0].is_displayed():
+            return False
+        try:
+            driver.switch_to.frame(iframes[0])
+            return bool(driver.execute_script(_FIELDS_READY_JS, self.field_ids))
+        finally:
+            driver.switch_to.default_content()
+
+
+class FattalWaitPolicy:
+    """Explicit waits with named timeouts, plus zero-cost presence probes."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def wait(self, name: str = "default", **kwargs) -> FattalWait:
+        return FattalWait(self.driver, timeout(name), **kwargs)
+
+    def probe(self, by, value, root=None) -> list:
+        """Returns matching elements right now — never waits."""
+        with explicit_wait(self.driver, mode="probe"):
+            return (root or self.driver).find_elements(by, value)
+
+    def present(self, by, value, root=None) -> bool:
+        return bool(self.probe(by, value, root))
+
+    def find_all(self, by, value, name: str = "default") -> list:
+        """Waits until at least one element matches, returning [] when the timeout passes."""
+        try:
+            return self.wait(name).until(lambda d: d.find_elements(by, value))
+        except TimeoutException:
+            return []
+
+    def payment_iframe_ready(self, name: str = "payment") -> float:
+        """Waits for payment_iframe_ready() and returns how long it took (also recorded in wait stats)."""
+        start = time.monotonic()
+        try:
+            self.wait(name, poll_frequency=0.25, ignored_exceptions=(
+                NoSuchElementException, NoSuchFrameException, StaleElementReferenceException,
+            )).until(payment_iframe_ready())
+        except TimeoutException:
+            raise TimeoutException(f"Payment iframe not ready within {timeout(name):.0f}s")
+        finally:
+            elapsed = time.monotonic() - start
+            wait_stats_for(self.driver).payment_iframe_seconds += elapsed
+        logging.info(f"💳 Payment iframe ready after {elapsed:.2f}s.")
+        return elapsed
+
+    def first_of(self, locators: dict, name: str = "default"):
+        """
+        Waits until any of the named locators matches and returns its name, or None.
+        Replaces probing each alternative in turn (which paid the implicit wait per miss).
+        """
+        def any_present(driver):
+            for key, (by, value) in locators.items():
+                if driver.find_elements(by, value):
+                    return key
+            return False
+
+        try:
+            return self.wait(name, poll_frequency=0.25).until(any_present)
+        except TimeoutException:
+            logging.info(f"None of {', '.join(locators)} appeared within {timeout(name):.0f}s.")
+            return None
+
+
+def wait_stats_for(driver) -> FattalWaitStats:
+    stats = getattr(driver, "_fattal_wait_stats", None)
+    if stats is None:
+        stats = FattalWaitStats()
+        driver._fattal_wait_stats = stats
+    return stats
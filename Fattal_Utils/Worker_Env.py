@@ -0,0 +1,58 @@
+import os
+import threading
+from datetime import datetime
+
+# Set by Parallel_Runner for every worker process; all unset in a plain serial run
+RUN_FOLDER_ENV = "FATTAL_RUN_FOLDER"
+WORKER_ID_ENV = "FATTAL_WORKER_ID"
+PORT_BASE_ENV = "FATTAL_PORT_BASE"
+
+# Ports a worker owns from its base: each Chrome it launches takes two (chromedriver, devtools)
+PORT_BLOCK = 20
+
+_port_lock = threading.Lock()
+_ports_used = 0
+
+
+def worker_id() -> str:
+    """The runner-assigned worker id ("0", "1", ...), or "" outside the parallel runner."""
+    return os.getenv(WORKER_ID_ENV, "").strip()
+
+
+def new_run_folder(base_path: str) -> tuple:
+    """Creates html_reports/runs/run_<timestamp> under base_path and returns (folder, run_id)."""
+    os.makedirs(base_path, exist_ok=True)
+    now = datetime.now().strftime("run_%Y-%m-%d_%H-%M-%S")
+    run_folder = os.path.join(base_path, now)
+    os.makedirs(run_folder, exist_ok=True)
+    return run_folder, now
+
+
+def shared_run_folder():
+    """(folder, run_id) of the run the parallel runner created for all workers, or None."""
+    run_folder = os.getenv(RUN_FOLDER_ENV, "").strip()
+    if not run_folder:
+        return None
+    os.makedirs(run_folder, exist_ok=True)
+    return run_folder, os.path.basename(os.path.normpath(run_folder))
+
+
+def worker_dir(path: str) -> str:
+    """path itself in a serial run, path/worker_<id> inside a parallel worker."""
+    wid = worker_id()
+    return os.path.join(path, f"worker_{wid}") if wid else path
+
+
+def next_ports():
+    """
+    (chromedriver_port, devtools_port) for the next Chrome this worker launches, taken from
+    its own port block so workers never race for the same port. (None, None) in a serial run.
+    """
+    global _ports_used
+    base = os.getenv(PORT_BASE_ENV, "").strip()
+    if not base:
+        return None, None
+    with _port_lock:
+        offset = (_ports_used * 2) % PORT_BLOCK
+        _ports_used += 1
+    return int(base) + offset, int(base) + offset + 1
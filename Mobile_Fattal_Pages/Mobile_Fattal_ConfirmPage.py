@@ -5,20 +5,25 @@ from datetime import datetime
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
 
 
 class FattalMobileConfirmPage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 30)
+        self.wait = FattalWait(driver, 30)
 
     def complete_and_verify_payment(self, expected_email):
         try:
             logging.info("Mobile: Attempting to click 'בצע תשלום' in iframe...")
 
             # Switch to iframe (mobile may have dynamic ID or name)
-            WebDriverWait(self.driver, 15).until(
+            FattalWait(self.driver, 15).until(
                 EC.frame_to_be_available_and_switch_to_it(
                     (By.CSS_SELECTOR, "iframe[id*='credit-card'], iframe[name*='paymentIframe']"))
             )
@@ -38,7 +43,7 @@ class FattalMobileConfirmPage:
 
             # Wait for confirmation element to load
             logging.info("Waiting for confirmation page (מספר ההזמנה)...")
-            WebDriverWait(self.driver, 30).until(
+            FattalWait(self.driver, 30).until(
                 EC.presence_of_element_located((By.XPATH, "//p[contains(text(),'מספר ההזמנה')]"))
             )
 
@@ -59,19 +64,17 @@ class FattalMobileConfirmPage:
             logging.info("Waiting for mobile confirmation page to load...")
 
             # Wait until the whole confirmation section is ready
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, "thank-you-page-top-bar-root"))
+            FattalDomWait(self.driver, 20).until(
+                DC.presence_of_element_located((By.ID, "thank-you-page-top-bar-root"))
             )
             logging.info("✅ Confirmation root detected.")
 
             # Now let's wait for the specific order number element to be visible
-            WebDriverWait(self.driver, 15).until(
-                EC.visibility_of_element_located((By.XPATH, "//span[contains(@id, 'thank-you-page-top-bar-sub-text')]"))
+            order_number_element = FattalDomWait(self.driver, 15).until(
+                DC.visibility_of_element_located((By.XPATH, "//span[contains(@id, 'thank-you-page-top-bar-sub-text')]"))
             )
 
             # Extract the order number
-            order_number_element = self.driver.find_element(By.XPATH,
-                                                            "//span[contains(@id, 'thank-you-page-top-bar-sub-text')]")
             order_number = order_number_element.text.strip()
 
             # Screenshot
@@ -95,10 +98,8 @@ class FattalMobileConfirmPage:
 
     def _save_screenshot(self, prefix):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        path = os.path.join(screenshot_dir, f"{prefix}_{timestamp}.png")
-        self.driver.save_screenshot(path)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots"))
+        path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{prefix}_{timestamp}")
         logging.info(f"Screenshot saved at: {path}")
         return path
 
@@ -3,14 +3,15 @@ import logging
 import os
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium import webdriver
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
 
 
 class FattalMobileCustomerSupport:
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = FattalWait(driver, 15)
 
     def safe_click(self, element):
         try:
@@ -73,8 +74,7 @@ class FattalMobileCustomerSupport:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot_path = os.path.join("Fattal_Tests", "Screenshots", f"fill_fields_error_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"fill_fields_error_{timestamp}")
             logging.error(f"Failed to fill fields. Screenshot saved: {screenshot_path}")
             raise
 
@@ -104,8 +104,7 @@ class FattalMobileCustomerSupport:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            path = os.path.join("Fattal_Tests", "Screenshots", f"dropdown_fail_{label_text}_{timestamp}.png")
-            self.driver.save_screenshot(path)
+            path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"dropdown_fail_{label_text}_{timestamp}")
             logging.error(f"Failed to select from dropdown '{label_text}'. Screenshot saved: {path}")
             raise
 
@@ -130,8 +129,7 @@ class FattalMobileCustomerSupport:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot_path = os.path.join("Fattal_Tests", "Screenshots", f"recaptcha_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"recaptcha_fail_{timestamp}")
             logging.error(f"Failed to click reCAPTCHA: {e}. Screenshot saved: {screenshot_path}")
             raise
 
@@ -146,8 +144,7 @@ class FattalMobileCustomerSupport:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot_path = os.path.join("Fattal_Tests", "Screenshots", f"submit_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"submit_fail_{timestamp}")
             logging.error(f"Failed to submit form: {e}. Screenshot saved: {screenshot_path}")
             raise
     def assert_form_data_matches_input(self, first_name, last_name, id_number, phone, email, message):
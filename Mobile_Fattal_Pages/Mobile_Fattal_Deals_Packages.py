@@ -3,10 +3,10 @@ from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 import time
 import random
 import logging
+from Fattal_Utils.Wait_Policy import FattalWait
 from datetime import datetime
 logging.basicConfig(
     level=logging.INFO,
@@ -17,7 +17,7 @@ logging.basicConfig(
 
 class FattalDealsPageMobile:
     def __init__(self, driver: webdriver.Chrome):
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = FattalWait(driver, 10)
         self.driver = driver
 
     def click_view_all_deals_link(self):
@@ -27,7 +27,7 @@ class FattalDealsPageMobile:
         try:
             logging.info("Waiting for 'לכל הדילים והחבילות' link to be clickable...")
 
-            deals_link = WebDriverWait(self.driver, 20).until(
+            deals_link = FattalWait(self.driver, 20).until(
                 EC.element_to_be_clickable((By.XPATH, "//a[normalize-space()='לכל הדילים והחבילות']"))
             )
 
@@ -51,7 +51,7 @@ class FattalDealsPageMobile:
             logging.info("Waiting for 'להזמנה ופרטים נוספים' deal button to appear...")
 
             # Step 1: Wait for it to be visible
-            visible_button = WebDriverWait(self.driver, 15).until(
+            visible_button = FattalWait(self.driver, 15).until(
                 EC.visibility_of_element_located((
                     By.XPATH,
                     "//a[contains(text(),'להזמנה ופרטים נוספים')]"
@@ -60,7 +60,7 @@ class FattalDealsPageMobile:
             logging.info("Deal button is visible — waiting a moment for UI to stabilize...")
 
             # Step 2: Wait for it to be clickable (to avoid premature interaction)
-            clickable_button = WebDriverWait(self.driver, 10).until(
+            clickable_button = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((
                     By.XPATH,
                     "//a[contains(text(),'להזמנה ופרטים נוספים')]"
@@ -87,12 +87,12 @@ class FattalDealsPageMobile:
         try:
             logging.info("Waiting for 'הזמן עכשיו' (Book Now) button to become visible...")
 
-            button = WebDriverWait(self.driver, 20).until(
+            button = FattalWait(self.driver, 20).until(
                 EC.visibility_of_element_located((By.XPATH, "//button[normalize-space()='הזמן עכשיו']"))
             )
 
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='הזמן עכשיו']")))
             time.sleep(0.5)  # UI animations or transitions
 
@@ -112,7 +112,7 @@ class FattalDealsPageMobile:
 
         try:
             # ✅ Try by ID first (most accurate)
-            button_by_id = WebDriverWait(self.driver, 5).until(
+            button_by_id = FattalWait(self.driver, 5).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-next-field"))
             )
 
@@ -127,7 +127,7 @@ class FattalDealsPageMobile:
 
         try:
             # 🟡 Fallback only if ID click failed — match exact visible button
-            button_by_text = WebDriverWait(self.driver, 10).until(
+            button_by_text = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((
                     By.XPATH,
                     "//button[starts-with(normalize-space(text()), 'המשך') and not(contains(@id, 'search-engine-search-button-mobile-button-next-field'))]"
@@ -152,7 +152,7 @@ class FattalDealsPageMobile:
             logging.info("🔍 Looking for 'המשך' button in room selection...")
 
             # Wait for a <button> whose text starts with 'המשך'
-            continue_btn = WebDriverWait(self.driver, 15).until(
+            continue_btn = FattalWait(self.driver, 15).until(
                 EC.element_to_be_clickable((
                     By.XPATH, "//button[starts-with(normalize-space(text()), 'המשך')]"
                 ))
@@ -178,14 +178,14 @@ class FattalDealsPageMobile:
 
             try:
                 # ניסיון ראשון לפי ID (המתוקן)
-                search_btn = WebDriverWait(self.driver, 7).until(
+                search_btn = FattalWait(self.driver, 7).until(
                     EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-main"))
                 )
                 logging.info("כפתור 'חפש חופשה' נמצא לפי ID")
             except TimeoutException:
                 logging.warning("לא נמצא כפתור לפי ID — מנסה לפי טקסט...")
 
-                search_btn = WebDriverWait(self.driver, 5).until(
+                search_btn = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable((
                         By.XPATH, "//div[contains(text(), 'חפש חופשה')]"
                     ))
@@ -213,7 +213,7 @@ class FattalDealsPageMobile:
             logging.info("מחפש ולוחץ על כפתור 'הצג מחירים' במובייל...")
 
             # חפש לפי ID שמתחיל ב-room-price-button
-            show_price_btn = WebDriverWait(self.driver, 20).until(
+            show_price_btn = FattalWait(self.driver, 20).until(
                 EC.presence_of_element_located((By.XPATH, "//button[starts-with(@id, 'room-price-button')]"))
             )
 
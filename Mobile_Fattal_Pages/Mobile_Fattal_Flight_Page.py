@@ -3,9 +3,12 @@ from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 import time
 import logging
+
+from Fattal_Utils.Typing import REALISTIC, typer_for, typing_mode
+from Fattal_Utils.Wait_Policy import FattalWait
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -15,8 +18,9 @@ logging.basicConfig(
 
 class FattalFlightPageMobile:
     def __init__(self, driver: webdriver.Chrome):
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = FattalWait(driver, 10)
         self.driver = driver
+        self.typer = typer_for(driver)
 
     # Try booking flights by time of day
     def try_flight_options_by_time_of_day(self):
@@ -86,32 +90,13 @@ class FattalFlightPageMobile:
             logging.error(f"Failed to fill mobile passenger form: {e}")
             raise
 
-    def scroll_and_type(self, element, value):
+    def scroll_and_type(self, element, value, mode=None):
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
             self.wait.until(lambda d: element.is_displayed() and element.is_enabled())
-            time.sleep(0.3)
-
-            # Step 1: Focus & click
-            self.driver.execute_script("arguments[0].focus();", element)
-            element.click()
-
-            # Step 2: Backspace clear (React-safe)
-            element.clear()
-            for _ in range(20):
-                element.send_keys("\ue003")  # BACKSPACE
-                time.sleep(0.03)
 
-            # Step 3: Type char-by-char
-            for char in value:
-                element.send_keys(char)
-                time.sleep(0.04)
-
-            # Step 4: Trigger blur to confirm value
-            self.driver.execute_script("arguments[0].blur();", element)
-
-            # Step 5: Log actual value
-            actual_val = self.driver.execute_script("return arguments[0].value;", element)
+            # Clear + type (React-safe), blur to confirm the value and read it back
+            actual_val = self.typer.type(element, value, mode=mode)
             logging.info(f"Set value: '{actual_val}' for element ID='{element.get_attribute('id')}'")
 
         except ElementNotInteractableException:
@@ -119,9 +104,14 @@ class FattalFlightPageMobile:
             try:
                 actions = ActionChains(self.driver)
                 actions.move_to_element(element).click().pause(0.3)
-                for char in value:
-                    actions.send_keys(char).pause(0.05)
-                actions.perform()
+                if typing_mode(mode) == REALISTIC:
+                    for char in value:
+                        actions.send_keys(char).pause(0.05)
+                    actions.perform()
+                else:
+                    actions.perform()
+                    # insertText goes to the focused element, no per-key interaction needed
+                    self.typer.type(element, value, mode=mode)
                 logging.info("Typed value with ActionChains.")
             except Exception as e:
                 logging.error(f"ActionChains fallback failed: {e}")
@@ -228,7 +218,7 @@ class FattalFlightPageMobile:
                     By.CSS_SELECTOR, "input[id^='checkout-form-field-input_adult_']")
 
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", first_name_input)
-                WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(first_name_input))
+                FattalWait(self.driver, 10).until(EC.element_to_be_clickable(first_name_input))
                 self.type_into_react_field(first_name_input, first_names[i], label=f"First Name {i + 1}")
 
                 # Last Name
@@ -236,7 +226,7 @@ class FattalFlightPageMobile:
                     By.CSS_SELECTOR, "input[id^='checkout-form-field-input_adult_']")[1]
 
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", last_name_input)
-                WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(last_name_input))
+                FattalWait(self.driver, 10).until(EC.element_to_be_clickable(last_name_input))
                 self.type_into_react_field(last_name_input, last_name, label=f"Last Name {i + 1}")
 
             logging.info("[Mobile] Adult passenger form fields filled.")
@@ -246,18 +236,14 @@ class FattalFlightPageMobile:
             self.driver.save_screenshot("error_fill_adults.png")
             raise
 
-    def type_into_react_field(self, element, text, label="field"):
+    def type_into_react_field(self, element, text, label="field", mode=None):
         try:
             logging.info(f"🎯 Typing into '{label}' → '{text}'")
 
             # Scroll into view and wait until it's visible & enabled
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            WebDriverWait(self.driver, 10).until(EC.visibility_of(element))
-            WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(element))
-
-            # Focus + optional short wait
-            self.driver.execute_script("arguments[0].focus();", element)
-            time.sleep(0.2)
+            FattalWait(self.driver, 10).until(EC.visibility_of(element))
+            FattalWait(self.driver, 10).until(EC.element_to_be_clickable(element))
 
             # Try clicking — fallback to JS if intercepted
             try:
@@ -266,13 +252,8 @@ class FattalFlightPageMobile:
                 logging.warning(f"⚠️ Native click intercepted for '{label}', using JS click. {intercept_err}")
                 self.driver.execute_script("arguments[0].click();", element)
 
-            # Clear input via BACKSPACE x20
-            for _ in range(20):
-                element.send_keys("\ue003")
-                time.sleep(0.01)
-
-            # Type value
-            element.send_keys(text)
+            # Clear + type value
+            self.typer.type(element, text, mode=mode, label=label, char_delay=0)
             logging.info(f"✅ Typed into '{label}' normally.")
 
         except ElementNotInteractableException:
@@ -3,13 +3,14 @@ import logging
 import os
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
 
 
 class FattalMobileClubJoinPage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = FattalWait(driver, 15)
 
     def click_join_fattal_friends_button(self):
         """
@@ -29,8 +30,7 @@ class FattalMobileClubJoinPage:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            path = os.path.join("Fattal_Tests", "Screenshots", f"join_club_click_fail_{timestamp}.png")
-            self.driver.save_screenshot(path)
+            path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"join_club_click_fail_{timestamp}")
             logging.error(f"Failed to click 'להצטרפות למועדון'. Screenshot saved: {path}")
             raise
 
@@ -63,8 +63,7 @@ class FattalMobileClubJoinPage:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot = os.path.join("Fattal_Tests", "Screenshots", f"club_form_error_{timestamp}.png")
-            self.driver.save_screenshot(screenshot)
+            screenshot = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"club_form_error_{timestamp}")
             logging.error(f"Error while filling club form. Screenshot saved: {screenshot}")
             raise
 
@@ -93,8 +92,7 @@ class FattalMobileClubJoinPage:
 
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot = os.path.join("Fattal_Tests", "Screenshots", f"checkbox_click_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot)
+            screenshot = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"checkbox_click_fail_{timestamp}")
             logging.error(f"Failed to click checkbox. Screenshot saved: {screenshot}")
             raise
 
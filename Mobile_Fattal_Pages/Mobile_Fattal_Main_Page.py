@@ -1,16 +1,13 @@
 import os
 import time
-import random
 import logging
-import calendar
 from datetime import datetime, date, timedelta
 
 from dateutil.relativedelta import relativedelta
 
 from selenium import webdriver
-from selenium.webdriver import ActionChains, Keys
+from selenium.webdriver import Keys
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
@@ -18,6 +15,14 @@ from selenium.common.exceptions import (
     MoveTargetOutOfBoundsException,
 )
 
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy, timeout
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Calendar_Index import FattalCalendarIndex
+from Fattal_Utils.Occupancy import FattalOccupancy
+from Fattal_Utils.Deep_Links import DEEP_LINK, build_url, hotel_id, search_entry, stay_months_ahead
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -30,7 +35,7 @@ class FattalMainPageMobile:
 
     def close_war_popup(self):
         try:
-            popup = WebDriverWait(self.driver, 5).until(
+            popup = FattalWait(self.driver, 5).until(
                 EC.element_to_be_clickable((By.ID, "war-popup-close-button"))
             )
             popup.click()
@@ -39,16 +44,21 @@ class FattalMainPageMobile:
             logging.info("No WAR popup found.")
 
 class FattalMainPageMobile:
+    CALENDAR_MONTHS = "#search-engine-date-picker-mobile-month-wrapper"
+    CALENDAR_TILES = "#search-engine-date-picker-mobile-month-wrapper button"
+
     def __init__(self, driver: webdriver.Chrome):
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = FattalWait(driver, 10)
+        self.waits = FattalWaitPolicy(driver)
         self.driver = driver
+        self.occupancy = FattalOccupancy(driver)
 
     def click_mobile_hotel_search_input(self):
         try:
             logging.info("Searching for hotel input container (mobile)...")
 
             # Stable, robust selector based on visible text
-            search_box = WebDriverWait(self.driver, 10).until(
+            search_box = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((
                     By.XPATH,
                     "//div[@id='home-page-banner-root']//label[contains(text(),'חיפוש אזור')]/parent::div"
@@ -66,7 +76,7 @@ class FattalMainPageMobile:
             raise
 
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
+    from Fattal_Utils.Wait_Policy import FattalWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.common.keys import Keys
     import logging
@@ -75,7 +85,7 @@ class FattalMainPageMobile:
     def set_city_mobile(self, city_name: str):
         try:
             # חכה שהשדה יופיע ויהיה קליקבילי
-            input_field = WebDriverWait(self.driver, 10).until(
+            input_field = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "main-input"))
             )
             # השתמש ב-JS כדי לעקוף חפיפה/שכבה
@@ -96,17 +106,15 @@ class FattalMainPageMobile:
 
     def take_screenshot(self, name="error_screenshot"):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(os.getcwd(), "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        path = os.path.join(screenshot_dir, f"{name}_{timestamp}.png")
-        self.driver.save_screenshot(path)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Screenshots"))
+        path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{name}_{timestamp}")
         logging.error(f"Screenshot saved: {path}")
 
 
     def click_first_suggested_hotel(self):
         # chen bug
         try:
-            suggestion_btn = WebDriverWait(self.driver, 10).until(
+            suggestion_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-input-rendered-hotel-item"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", suggestion_btn)
@@ -118,7 +126,7 @@ class FattalMainPageMobile:
 
     def click_mobile_date_picker(self):
         try:
-            date_picker = WebDriverWait(self.driver, 10).until(
+            date_picker = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-date-picker-display-placeholder-container"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", date_picker)
@@ -129,140 +137,6 @@ class FattalMainPageMobile:
             self.take_screenshot("open_calendar_fail")
             raise
 
-    def select_date_range_months_ahead(self, months_ahead=2, stay_length=3):
-        """
-        Selects check-in and check-out dates from a month X months ahead.
-        :param months_ahead: How many months forward to go (default = 2).
-        :param stay_length: Optional integer for number of nights. If None, chooses randomly (3-5).
-        """
-        try:
-            logging.info(f"Selecting date range ({months_ahead} months forward)...")
-
-            # ✅ Calculate target month/year
-            today = datetime.today()
-            target_month = (today.month + months_ahead - 1) % 12 + 1
-            target_year = today.year + ((today.month + months_ahead - 1) // 12)
-
-            logging.info(f"Looking for dates in: {calendar.month_name[target_month]} {target_year}")
-
-            # ✅ Get all active tiles
-            all_tiles = self.driver.find_elements(
-                By.XPATH,
-                "//div[starts-with(@id,'search-engine-date-picker-tile-inner') and not(@disabled)]"
-            )
-            if not all_tiles:
-                raise Exception("No date tiles found in calendar")
-
-            # ✅ Filter only target month/year
-            target_tiles = []
-            for tile in all_tiles:
-                tile_id = tile.get_attribute("id")
-                try:
-                    date_str = tile_id.replace("search-engine-date-picker-tile-inner", "")
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    if date_obj.month == target_month and date_obj.year == target_year:
-                        target_tiles.append((tile, date_obj))
-                except Exception as e:
-                    logging.warning(f"Could not parse ID '{tile_id}': {e}")
-
-            if len(target_tiles) < 2:
-                raise Exception(f"Not enough active date tiles for {calendar.month_name[target_month]} {target_year}")
-
-            # ✅ Choose stay length
-            stay_length = stay_length or random.randint(3, 5)
-            start_idx = random.randint(0, len(target_tiles) - stay_length - 1)
-            checkin, checkin_date = target_tiles[start_idx]
-            checkout, checkout_date = target_tiles[start_idx + stay_length]
-
-            logging.info(f"Attempting to select: {checkin_date} to {checkout_date} ({stay_length} nights)")
-
-            # ✅ Click check-in and check-out
-            actions = ActionChains(self.driver)
-            actions.move_to_element(checkin).pause(0.5).click().pause(1.0)
-            actions.move_to_element(checkout).pause(0.5).click().perform()
-
-            # ✅ Continue button
-            continue_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-next-field"))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
-            time.sleep(0.4)
-            continue_btn.click()
-
-            logging.info(f"Selected check-in: {checkin_date} → check-out: {checkout_date}")
-            logging.info("Confirmed calendar selection.")
-
-        except Exception as e:
-            logging.error(f"Date selection failed: {e}")
-            self.take_screenshot("calendar_selection_fail")
-            raise
-
-    def select_date_range_months_ahead(self, months_ahead=3, stay_length=5):
-        """
-        Selects check-in and check-out dates from a month X months ahead.
-        :param months_ahead: How many months forward to go (default = 3).
-        :param stay_length: Number of nights (default = 5).
-        """
-        try:
-            logging.info(f"Selecting date range ({months_ahead} months forward)...")
-
-            # ✅ Calculate target month/year
-            today = datetime.today()
-            target_month = (today.month + months_ahead - 1) % 12 + 1
-            target_year = today.year + ((today.month + months_ahead - 1) // 12)
-
-            logging.info(f"Looking for dates in: {calendar.month_name[target_month]} {target_year}")
-
-            # ✅ Get all active tiles
-            all_tiles = self.driver.find_elements(
-                By.XPATH,
-                "//div[starts-with(@id,'search-engine-date-picker-tile-inner') and not(@disabled)]"
-            )
-            if not all_tiles:
-                raise Exception("No date tiles found in calendar")
-
-            # ✅ Filter only target month/year
-            target_tiles = []
-            for tile in all_tiles:
-                tile_id = tile.get_attribute("id")
-                try:
-                    date_str = tile_id.replace("search-engine-date-picker-tile-inner", "")
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    if date_obj.month == target_month and date_obj.year == target_year:
-                        target_tiles.append((tile, date_obj))
-                except Exception as e:
-                    logging.warning(f"Could not parse ID '{tile_id}': {e}")
-
-            if len(target_tiles) < stay_length + 1:
-                raise Exception(f"Not enough active date tiles for {calendar.month_name[target_month]} {target_year}")
-
-            # ✅ Pick check-in/out
-            checkin, checkin_date = target_tiles[0]
-            checkout, checkout_date = target_tiles[stay_length]
-
-            logging.info(f"Attempting to select: {checkin_date} → {checkout_date} ({stay_length} nights)")
-
-            # ✅ Clicks
-            actions = ActionChains(self.driver)
-            actions.move_to_element(checkin).pause(0.5).click().pause(1.0)
-            actions.move_to_element(checkout).pause(0.5).click().perform()
-
-            # ✅ Continue button
-            continue_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-next-field"))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
-            time.sleep(0.4)
-            continue_btn.click()
-
-            logging.info(f"Selected check-in: {checkin_date} → check-out: {checkout_date}")
-            logging.info("Confirmed calendar selection.")
-
-        except Exception as e:
-            logging.error(f"Date selection failed: {e}")
-            self.take_screenshot("calendar_selection_fail")
-            raise
-
     def get_valid_calendar_day_buttons(self):
         buttons = self.driver.find_elements(By.CSS_SELECTOR, ".react-calendar__month-view__days button")
         return [
@@ -304,7 +178,7 @@ class FattalMainPageMobile:
             # Check if the modal is already open
             modal_open = False
             try:
-                WebDriverWait(self.driver, 1).until(
+                FattalWait(self.driver, 1).until(
                     EC.presence_of_element_located((By.ID, "search-engine-build-room-mobile-wrapper-adults0"))
                 )
                 modal_open = True
@@ -313,7 +187,7 @@ class FattalMainPageMobile:
                 modal_open = False
 
             if not modal_open:
-                room_button = WebDriverWait(self.driver, 5).until(
+                room_button = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable((By.ID, "search-engine-room-selection-button-Main"))
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", room_button)
@@ -332,50 +206,13 @@ class FattalMainPageMobile:
         try:
             logging.info("Adjusting room occupants...")
 
-            # Map of room sections
-            room_config = {
-                "adults": adults,
-                "children": children,
-                "infants": infants
-            }
-
             # Wait until the modal structure is present
-            WebDriverWait(self.driver, 5).until(
+            FattalWait(self.driver, 5).until(
                 EC.presence_of_element_located((By.ID, "search-engine-build-room-mobile-room-container0"))
             )
             logging.info("Room modal confirmed present.")
 
-            for section, desired in room_config.items():
-                logging.info(f"Setting {section} to {desired}...")
-
-                count_id = f"search-engine-build-room-mobile-count-{section}0"
-                plus_id = f"search-engine-build-room-mobile-wrapper-{section}0"
-                minus_id = f"search-engine-build-room-mobile-wrapper-{section}-remove0"
-
-                # Wait for count element to show up and get initial value
-                count_el = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.ID, count_id))
-                )
-                plus_btn = self.driver.find_element(By.ID, plus_id)
-                minus_btn = self.driver.find_element(By.ID, minus_id)
-
-                current = int(self.driver.execute_script("return arguments[0].textContent.trim();", count_el))
-
-                # Increase or decrease until we reach desired
-                while current < desired:
-                    self.driver.execute_script("arguments[0].click();", plus_btn)
-                    current += 1
-                    time.sleep(0.25)
-
-                while current > desired:
-                    if minus_btn.get_attribute("disabled"):
-                        logging.warning(f"Cannot reduce {section} below {current}. Button disabled.")
-                        break
-                    self.driver.execute_script("arguments[0].click();", minus_btn)
-                    current -= 1
-                    time.sleep(0.25)
-
-                logging.info(f"{section.capitalize()} set to: {current}")
+            self.occupancy.set_rooms([{"adults": adults, "children": children, "infants": infants}])
 
             logging.info("Room occupant adjustment completed.")
 
@@ -394,7 +231,7 @@ class FattalMainPageMobile:
         try:
             # Step 1: Ensure modal is closed
             try:
-                WebDriverWait(self.driver, 5).until_not(
+                FattalWait(self.driver, 5).until_not(
                     EC.presence_of_element_located((By.ID, "search-engine-build-room-mobile-wrapper-adults0"))
                 )
                 logging.info("Room modal is now fully closed.")
@@ -402,7 +239,7 @@ class FattalMainPageMobile:
                 logging.warning("Room modal may still be open — click might be blocked.")
 
             # Step 2: Re-fetch the search button
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "search-engine-search-button-mobile-button-main"))
             )
             search_btn = self.driver.find_element(By.ID, "search-engine-search-button-mobile-button-main")
@@ -440,7 +277,7 @@ class FattalMainPageMobile:
         Clicks the הרכב button again to close the mobile room modal.
         """
         try:
-            room_button = WebDriverWait(self.driver, 5).until(
+            room_button = FattalWait(self.driver, 5).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-room-selection-button-Main"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", room_button)
@@ -456,7 +293,7 @@ class FattalMainPageMobile:
         try:
             logging.info("Clicking תאריכים to force close modals before final search...")
 
-            calendar_btn = WebDriverWait(self.driver, 5).until(
+            calendar_btn = FattalWait(self.driver, 5).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-date-picker-month-button"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", calendar_btn)
@@ -475,7 +312,7 @@ class FattalMainPageMobile:
         try:
             logging.info("Opening flight dropdown and selecting 'מכל שדות התעופה'...")
 
-            dropdown_btn = WebDriverWait(self.driver, 10).until(
+            dropdown_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-search-field-button_flights"))
             )
 
@@ -484,7 +321,7 @@ class FattalMainPageMobile:
             time.sleep(0.5)
             self.driver.execute_script("arguments[0].click();", dropdown_btn)
 
-            all_flights_btn = WebDriverWait(self.driver, 10).until(
+            all_flights_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-flight-select-option_all_flights"))
             )
             time.sleep(0.2)
@@ -499,7 +336,7 @@ class FattalMainPageMobile:
 
     def click_first_suggested_region(self):
         try:
-            suggestion_btn = WebDriverWait(self.driver, 10).until(
+            suggestion_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-input-rendered-item"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", suggestion_btn)
@@ -514,40 +351,25 @@ class FattalMainPageMobile:
         try:
             logging.info(f"Selecting specific range: {checkin_day} to {checkout_day}")
 
-            months = self.driver.find_elements(By.ID, "search-engine-date-picker-mobile-month-wrapper")
-            if len(months) < 2:
+            index = FattalCalendarIndex(self.driver, self.CALENDAR_TILES, self.CALENDAR_MONTHS,
+                                        months=2, timeout=timeout("default"))
+            if index.month_count() < 2:
                 raise Exception("Not enough months rendered in calendar.")
 
-            checkin_btn = None
-            checkout_btn = None
-
-            for month in months:
-                buttons = month.find_elements(By.XPATH, ".//button[not(@disabled)]")
-                for btn in buttons:
-                    try:
-                        label = btn.find_element(By.TAG_NAME, "abbr").get_attribute("aria-label")
-                        if f"{checkin_day} בספטמבר" in label:
-                            checkin_btn = btn
-                        if f"{checkout_day} בספטמבר" in label:
-                            checkout_btn = btn
-                    except Exception:
-                        continue
-
+            checkin_btn = index.find(f"{checkin_day} בספטמבר")
+            checkout_btn = index.find(f"{checkout_day} בספטמבר")
             if not checkin_btn or not checkout_btn:
                 raise Exception(f"Could not find one or both dates: {checkin_day}, {checkout_day}")
 
-            actions = ActionChains(self.driver)
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkin_btn)
-            actions.move_to_element(checkin_btn).pause(0.5).click().pause(1.0)
-
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkout_btn)
-            actions.move_to_element(checkout_btn).pause(0.5).click().perform()
+            index.click(checkin_btn)
+            time.sleep(1.0)
+            index.click(checkout_btn)
 
             logging.info(f"Clicked check-in: {checkin_day} ביוני")
             logging.info(f"Clicked check-out: {checkout_day} ביוני")
 
             # 🛠️ Fixed selector for continue button
-            continue_btn = WebDriverWait(self.driver, 10).until(
+            continue_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-next-field"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
@@ -571,7 +393,7 @@ class FattalMainPageMobile:
 
             xpath = "//*[contains(text(), 'המשך') and (self::button or self::div or self::span)]"
             #xpath = "//div[contains(@class, 'sc-f6382f5-0') and contains(text(), 'המשך')]"
-            continue_btn = WebDriverWait(self.driver, 8).until(
+            continue_btn = FattalWait(self.driver, 8).until(
                 EC.element_to_be_clickable((By.XPATH, xpath))
             )
 
@@ -592,7 +414,7 @@ class FattalMainPageMobile:
 
     def wait_for_room_modal_open(self, timeout=5):
         try:
-            WebDriverWait(self.driver, timeout).until(
+            FattalWait(self.driver, timeout).until(
                 EC.presence_of_element_located((By.ID, "search-engine-build-room-mobile-wrapper-adults0"))
             )
             logging.info("Room modal is visible and ready.")
@@ -613,7 +435,7 @@ class FattalMainPageMobile:
     def enter_promo_code(self, promo_code: str):
         """Inputs the promo code and triggers validation by clicking outside the input field."""
         try:
-            WebDriverWait(self.driver, 5).until(
+            FattalWait(self.driver, 5).until(
                 EC.visibility_of_element_located((By.ID, "search-engine-promo-code-input"))
             )
             promo_input = self.driver.find_element(By.ID, "search-engine-promo-code-input")
@@ -631,7 +453,7 @@ class FattalMainPageMobile:
     def enter_id(self, user_id: str):
         """Inputs the user ID and triggers validation by clicking outside the input field."""
         try:
-            WebDriverWait(self.driver, 5).until(
+            FattalWait(self.driver, 5).until(
                 EC.visibility_of_element_located((By.ID, "search-engine-promo-code-validation-input"))
             )
             id_input = self.driver.find_element(By.ID, "search-engine-promo-code-validation-input")
@@ -650,7 +472,7 @@ class FattalMainPageMobile:
         """Clicks the eligibility validation button after entering the ID."""
         try:
             # Wait until the button is clickable (i.e., enabled and visible)
-            WebDriverWait(self.driver, 10).until(
+            FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-promo-code-validation-button"))
             )
             button = self.driver.find_element(By.ID, "search-engine-promo-code-validation-button")
@@ -678,26 +500,20 @@ class FattalMainPageMobile:
         try:
             logging.info("Adding rooms and setting occupants...")
 
-            # Add 4 more rooms (total 5)
-            add_room_button = self.wait.until(
+            self.wait.until(
                 EC.element_to_be_clickable((By.ID, "search-engine-build-room-mobile-add-room-button"))
             )
-            for _ in range(4):
-                self.driver.execute_script("arguments[0].click();", add_room_button)
-                time.sleep(0.3)  # Give DOM a moment to update
 
             room_configurations = [
-                {"adults": 2, "kids": 1, "infants": 1},  # Room 1
-                {"adults": 2, "kids": 1, "infants": 0},  # Room 2
-                {"adults": 2, "kids": 0, "infants": 0},  # Room 3
-                {"adults": 2, "kids": 0, "infants": 0},  # Room 4
-                {"adults": 2, "kids": 0, "infants": 0},  # Room 5
+                {"adults": 2, "children": 1, "infants": 1},  # Room 1
+                {"adults": 2, "children": 1, "infants": 0},  # Room 2
+                {"adults": 2, "children": 0, "infants": 0},  # Room 3
+                {"adults": 2, "children": 0, "infants": 0},  # Room 4
+                {"adults": 2, "children": 0, "infants": 0},  # Room 5
             ]
 
-            for i, config in enumerate(room_configurations):
-                self._set_room_mobile_count(room_index=i, group="adults", value=config["adults"])
-                self._set_room_mobile_count(room_index=i, group="children", value=config["kids"])
-                self._set_room_mobile_count(room_index=i, group="infants", value=config["infants"])
+            # Adds the 4 extra rooms and sets every counter in one batched plan
+            self.occupancy.set_rooms(room_configurations)
 
             logging.info("All room configurations have been set.")
 
@@ -712,28 +528,11 @@ class FattalMainPageMobile:
         `group` must be one of: "adults", "children", "infants"
         """
         try:
-            count_id = f"search-engine-build-room-mobile-count-{group}{room_index}"
-            plus_id = f"search-engine-build-room-mobile-wrapper-{group}{room_index}"
-            minus_id = f"search-engine-build-room-mobile-wrapper-{group}-remove{room_index}"
-
-            count_el = self.wait.until(EC.presence_of_element_located((By.ID, count_id)))
-            plus_btn = self.driver.find_element(By.ID, plus_id)
-            minus_btn = self.driver.find_element(By.ID, minus_id)
-
-            current = int(self.driver.execute_script("return arguments[0].textContent.trim();", count_el))
-
-            while current < value:
-                self.driver.execute_script("arguments[0].click();", plus_btn)
-                current += 1
-                time.sleep(0.2)
-
-            while current > value:
-                if minus_btn.get_attribute("disabled"):
-                    logging.warning(f"Cannot reduce {group} below {current}. Button disabled.")
-                    break
-                self.driver.execute_script("arguments[0].click();", minus_btn)
-                current -= 1
-                time.sleep(0.2)
+            self.wait.until(EC.presence_of_element_located(
+                (By.ID, f"search-engine-build-room-mobile-count-{group}{room_index}")
+            ))
+            rooms = [{} for _ in range(room_index)] + [{group: value}]
+            current = self.occupancy.set_rooms(rooms)[room_index][group]
 
             logging.info(f"Set room {room_index + 1} — {group}: {current}")
 
@@ -747,30 +546,22 @@ class FattalMainPageMobile:
         OR the <a class="u-close-button"> element.
         Skips gracefully if popup is not present.
         """
-        try:
-            # Try by unique ID first
-            close_button = WebDriverWait(self.driver, 2).until(
-                EC.element_to_be_clickable((By.ID, "ex-popup-modal-close-btn"))
-            )
-            self.driver.execute_script("arguments[0].click();", close_button)
-            logging.info("WAR popup closed via ID button.")
+        if popup_watchdog_for(self.driver).handles("war"):
             return
-        except Exception:
-            logging.info("WAR popup ID button not found, trying class selector...")
 
-        try:
-            # Try by class, in case the ID is missing
-            close_button = WebDriverWait(self.driver, 2).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.u-close-button"))
-            )
-            self.driver.execute_script("arguments[0].click();", close_button)
-            logging.info("WAR popup closed via class selector (u-close-button).")
+        locators = {
+            "id": (By.ID, "ex-popup-modal-close-btn"),
+            "class": (By.CSS_SELECTOR, "a.u-close-button"),
+        }
+        # One explicit wait over both selectors instead of a full timeout per selector
+        found = self.waits.first_of(locators, "popup")
+        if not found:
+            logging.info("WAR popup not found — skipping close_war_popup.")
             return
-        except Exception:
-            logging.info("WAR popup class button not found — skipping close_war_popup.")
 
-        # If both fail, just continue silently
-        return
+        close_button = self.waits.probe(*locators[found])[0]
+        self.driver.execute_script("arguments[0].click();", close_button)
+        logging.info(f"WAR popup closed via {found} selector.")
 
     def select_date_range_months_ahead(self, months_ahead=2, stay_length=3):
         """
@@ -781,52 +572,37 @@ class FattalMainPageMobile:
         try:
             logging.info(f"Selecting date range from {months_ahead} months ahead, {stay_length} nights...")
 
-            # Find all month elements in the calendar
-            months = self.driver.find_elements(By.ID, "search-engine-date-picker-mobile-month-wrapper")
-            if len(months) < months_ahead + 1:
+            # One snapshot of every tile instead of a round trip per day
+            index = FattalCalendarIndex(self.driver, self.CALENDAR_TILES, self.CALENDAR_MONTHS,
+                                        months=months_ahead + 1, timeout=timeout("default"))
+            if index.month_count() < months_ahead + 1:
                 raise Exception(f"Less than {months_ahead + 1} months available in calendar")
 
-            # Scroll to the target month
-            target_month = months[months_ahead]
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", target_month)
-            time.sleep(2)
-
-            # Find all valid (enabled) date buttons in the target month
-            valid_buttons = target_month.find_elements(By.XPATH, ".//button[not(@disabled)]")
-            if len(valid_buttons) < stay_length + 1:
-                raise Exception("Not enough active date buttons in target month")
-
             # Pick a random starting date so that checkout is within the month
-            start_idx = random.randint(0, len(valid_buttons) - stay_length - 1)
-            checkin = valid_buttons[start_idx]
-            checkout = valid_buttons[start_idx + stay_length]
-
-            checkin_label = checkin.find_element(By.TAG_NAME, "abbr").get_attribute("aria-label")
-            checkout_label = checkout.find_element(By.TAG_NAME, "abbr").get_attribute("aria-label")
-            logging.info(f"Attempting to select: {checkin_label} to {checkout_label} ({stay_length} לילות)")
+            stay = index.random_range(stay_length, month=months_ahead)
+            if not stay:
+                raise Exception("Not enough active date buttons in target month")
+            checkin, checkout, _ = stay
+            logging.info(f"Attempting to select: {checkin.label} to {checkout.label} ({stay_length} לילות)")
 
-            # Use ActionChains for more reliable mobile-like click simulation
-            actions = ActionChains(self.driver)
-            actions.move_to_element(checkin).pause(0.5).click().pause(1.0)
-            actions.move_to_element(checkout).pause(0.5).click().perform()
+            index.click(checkin)
+            time.sleep(1.0)
+            index.click(checkout)
+            self.selected_check_in, self.selected_check_out = checkin.date, checkout.date
 
-            try:
-                # Confirm calendar is still open after selection
-                self.driver.find_element(By.ID, "search-engine-date-picker-mobile-month-wrapper")
-                logging.info("Calendar still open after selection – continuing.")
-            except:
+            if not self.driver.find_elements(By.ID, "search-engine-date-picker-mobile-month-wrapper"):
                 raise Exception("Calendar closed before both dates were selected!")
+            logging.info("Calendar still open after selection – continuing.")
 
             # Click the "continue" button to finalize date selection
-            continue_btn = WebDriverWait(self.driver, 10).until(
+            continue_btn = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "search-engine-search-button-mobile-button-next-field"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", continue_btn)
             time.sleep(0.4)
             continue_btn.click()
 
-            logging.info(f"Selected check-in: {checkin_label} → check-out: {checkout_label}")
+            logging.info(f"Selected check-in: {checkin.label} → check-out: {checkout.label}")
             logging.info("Confirmed calendar selection.")
 
         except Exception as e:
@@ -834,41 +610,49 @@ class FattalMainPageMobile:
             self.take_screenshot("calendar_selection_fail")
             raise
 
+    def open_search_results(self, hotel_name, check_in, check_out, rooms, kind="search"):
+        """Opens the results for hotel/dates/occupancy straight from a deep link, skipping the search widget."""
+        url = build_url(hotel_name, check_in, check_out, rooms, kind=kind)
+        logging.info(f"🔗 Opening deep link: {url}")
+        self.driver.get(url)
+        self.selected_check_in, self.selected_check_out = check_in, check_out
+
+    def search_hotel(self, hotel_name, months_ahead=3, stay_length=3, adults=2, children=0, infants=0, entry=None):
+        """
+        Gets to the hotel's results page through the search widget, or through a deep link when
+        SEARCH_ENTRY=deep_link (or entry="deep_link") and the hotel is in HOTEL_IDS.
+        """
+        entry = entry or search_entry()
+        if entry == DEEP_LINK and hotel_id(hotel_name):
+            check_in, check_out = stay_months_ahead(months_ahead, stay_length)
+            rooms = [{"adults": adults, "children": children, "infants": infants}]
+            self.open_search_results(hotel_name, check_in, check_out, rooms)
+            return
+        if entry == DEEP_LINK:
+            logging.warning(f"⚠️ No deep-link id for '{hotel_name}' — searching through the widget.")
+
+        self.click_mobile_hotel_search_input()
+        self.set_city_mobile(hotel_name)
+        self.click_first_suggested_hotel()
+        self.click_mobile_date_picker()
+        self.select_date_range_months_ahead(months_ahead=months_ahead, stay_length=stay_length)
+        self.click_mobile_room_selection()
+        self.set_mobile_room_occupants(adults=adults, children=children, infants=infants)
+        self.click_room_continue_button()
+        self.click_mobile_search_button()
+
     def set_mobile_room_adults(self, adults=2):
         """Adjust the number of adults in the room. Assumes the modal is already open. Does NOT open modal or click 'המשך'."""
         try:
             logging.info("Adjusting number of adults...")
 
             # Wait until the modal structure is present
-            WebDriverWait(self.driver, 5).until(
+            FattalWait(self.driver, 5).until(
                 EC.presence_of_element_located((By.ID, "search-engine-build-room-mobile-room-container0"))
             )
             logging.info("Room modal confirmed present.")
 
-            count_id = "search-engine-build-room-mobile-count-adults0"
-            plus_id = "search-engine-build-room-mobile-wrapper-adults0"
-            minus_id = "search-engine-build-room-mobile-wrapper-adults-remove0"
-
-            count_el = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.ID, count_id))
-            )
-            plus_btn = self.driver.find_element(By.ID, plus_id)
-            minus_btn = self.driver.find_element(By.ID, minus_id)
-
-            current = int(self.driver.execute_script("return arguments[0].textContent.trim();", count_el))
-
-            while current < adults:
-                self.driver.execute_script("arguments[0].click();", plus_btn)
-                current += 1
-                time.sleep(0.25)
-
-            while current > adults:
-                if minus_btn.get_attribute("disabled"):
-                    logging.warning(f"Cannot reduce adults below {current}. Button disabled.")
-                    break
-                self.driver.execute_script("arguments[0].click();", minus_btn)
-                current -= 1
-                time.sleep(0.25)
+            current = self.occupancy.set_rooms([{"adults": adults}])[0]["adults"]
 
             logging.info(f"Adults set to: {current}")
             logging.info("Adult occupant adjustment completed.")
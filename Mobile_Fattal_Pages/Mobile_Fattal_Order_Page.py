@@ -4,46 +4,73 @@ from selenium.webdriver import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 import time
 import random
 import logging
 from datetime import datetime
 import os
-from selenium.webdriver.support.ui import Select
+
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.React_Forms import fill_react_fields
+from Fattal_Utils.Payment_Form import payment_form_for
+from Fattal_Utils.Element_Snapshot import snapshot
+from Fattal_Utils.Typing import REALISTIC, typer_for
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
 
 class FattalOrderPageMobile:
+    GUEST_FIELDS = {
+        "email": "checkout-form-field-input_email",
+        "phone": "checkout-form-field-input_phone",
+        "first_name": "checkout-form-field-input_first-name",
+        "last_name": "checkout-form-field-input_last-name",
+        "id_number": "checkout-form-field-input_id",
+    }
+
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.wait = FattalWait(driver, 10)
+        self.waits = FattalWaitPolicy(driver)
+        self.typer = typer_for(driver)
+        self.payment_form = payment_form_for(driver)
 
     def take_screenshot(self, name="error_screenshot"):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(os.getcwd(), "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        path = os.path.join(screenshot_dir, f"{name}_{timestamp}.png")
-        self.driver.save_screenshot(path)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Screenshots"))
+        path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{name}_{timestamp}")
         logging.error(f"📸 Screenshot saved: {path}")
 
+    def wait_for_payment_iframe_ready(self):
+        """Waits until the card fields inside paymentIframe can be filled, instead of a fixed sleep."""
+        try:
+            self.waits.payment_iframe_ready()
+        except TimeoutException:
+            logging.error("❌ Payment iframe did not become ready.")
+            self.take_screenshot("payment_iframe_not_ready")
+            raise
+
     def wait_until_personal_form_ready(self):
         logging.info("🕐 Waiting for personal details form (mobile)...")
 
         try:
             def email_input_appears(driver):
-                email_inputs = driver.find_elements(By.ID, "checkout-form-field-input_email")
-                for el in email_inputs:
-                    if el.is_displayed():
-                        logging.info("✅ Email input is visible.")
-                        return el
-                    else:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", el)
-                        time.sleep(0.4)
-                        if el.is_displayed():
-                            logging.info("✅ Email input became visible after scrolling.")
-                            return el
+                # One snapshot per poll instead of find_elements + is_displayed per match
+                email = snapshot(driver, {"email": (By.ID, "checkout-form-field-input_email")})["email"]
+                if email.visible:
+                    logging.info("✅ Email input is visible.")
+                    return email.element
+                if email.present:
+                    # Checked again on the next poll
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", email.element)
                 return False
 
-            WebDriverWait(self.driver, 30).until(email_input_appears)
+            # Resolves as soon as the input is attached, then the visibility/scroll check takes over
+            FattalDomWait(self.driver, 30).until(
+                DC.presence_of_element_located((By.ID, "checkout-form-field-input_email"))
+            )
+            FattalWait(self.driver, 10).until(email_input_appears)
 
         except TimeoutException:
             self.take_screenshot("mobile_personal_form_timeout")
@@ -52,7 +79,7 @@ class FattalOrderPageMobile:
                 "❌ Personal form did not load in time: 🛑 Could not locate visible email input after scrolling.")
             raise TimeoutException("🛑 Could not locate visible email input after scrolling.")
 
-    def _safe_fill_mobile_field(self, by, value, text, label):
+    def _safe_fill_mobile_field(self, by, value, text, label, mode=None):
         try:
             logging.info(f"📝 Trying to fill {label} with '{text}'")
             for _ in range(8):
@@ -74,16 +101,10 @@ class FattalOrderPageMobile:
             # Wait for clickable (will also wait for visible & enabled)
             self.wait.until(EC.element_to_be_clickable((by, value)))
 
-            # Try click + clear + send_keys, then JS fallback if *any* fails
+            # Type through the typing engine, then JS fallback if *any* fails
             try:
-                el.click()
-                time.sleep(0.07)  # Sometimes helps with virtual keyboards
-                el.clear()
-                for _ in range(10):  # Clear any leftovers
-                    el.send_keys("\ue003")
-                    time.sleep(0.01)
-                el.send_keys(text)
-                logging.info(f" [Mobile] {label} filled correctly with send_keys().")
+                self.typer.type(el, text, mode=mode, label=label, char_delay=0)
+                logging.info(f" [Mobile] {label} filled correctly.")
             except Exception as click_exc:
                 logging.warning(f"⚠️ Element click/send_keys failed for '{label}': {click_exc}, trying JS fallback.")
 
@@ -129,6 +150,36 @@ class FattalOrderPageMobile:
     def set_id_number(self, id_number):
         self._safe_fill_mobile_field(By.ID, "checkout-form-field-input_id", id_number, "ID Number")
 
+    #  BATCHED FORM FILL
+    def fill_fields(self, values: dict, key_event_fields=()):
+        """
+        Sets several checkout fields (field id -> value) in a single round trip and verifies them.
+        Fields listed in key_event_fields, and any the batch could not set, are typed
+        one by one through _safe_fill_mobile_field.
+        """
+        batched = {k: v for k, v in values.items() if k not in key_event_fields}
+        report = fill_react_fields(self.driver, batched) if batched else {}
+        for field_id, value in values.items():
+            result = report.get(field_id)
+            if result and (result["ok"] or result["disabled"]):
+                continue
+            if result:
+                logging.warning(f"⚠️ Batch fill missed '{field_id}' (read back {result['value']!r}) — typing it instead.")
+            mode = REALISTIC if field_id in key_event_fields else None
+            self._safe_fill_mobile_field(By.ID, field_id, value, field_id, mode=mode)
+        return report
+
+    def fill_guest_form(self, email, phone, first_name, last_name, id_number=None):
+        values = {
+            self.GUEST_FIELDS["email"]: email,
+            self.GUEST_FIELDS["phone"]: phone,
+            self.GUEST_FIELDS["first_name"]: first_name,
+            self.GUEST_FIELDS["last_name"]: last_name,
+        }
+        if id_number is not None:
+            values[self.GUEST_FIELDS["id_number"]] = id_number
+        return self.fill_fields(values)
+
     #  CLUB CHECKBOX
     def click_join_club_checkbox(self):
         try:
@@ -221,59 +272,35 @@ class FattalOrderPageMobile:
         logging.info(f"🎲 Generated Israeli ID: {id_number}")
         self.set_id_number(id_number)
 
-    def _safe_fill_field(self, by, value, text, label):
+    def _safe_fill_field(self, by, value, text, label, mode=None):
         try:
             el = self.wait.until(EC.element_to_be_clickable((by, value)))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", el)
-            el.clear()
-            el.send_keys(text)
+            self.typer.type(el, text, mode=mode, label=label, char_delay=0)
             logging.info(f"✅ {label} filled correctly.")
         except Exception as e:
             self.take_screenshot(f"fail_{label.replace(' ', '_')}")
             logging.error(f"❌ Failed to fill {label}: {e}")
             raise
 
-    def fill_payment_iframe_mobile(self):
+    def fill_payment_card(self, card: dict) -> dict:
+        """Fills paymentIframe from a payment_card dict in one scripted call; returns the fill report."""
         try:
-            logging.info("💳 Scrolling iframe into view...")
-            iframe = self.wait.until(EC.presence_of_element_located((By.ID, "paymentIframe")))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", iframe)
-
-            logging.info("💳 Switching into payment iframe...")
-            self.driver.switch_to.frame(iframe)
-            logging.info("✅ Switched into iframe.")
-
-            # Fill Card Number
-            self._safe_fill_field(By.ID, "credit_card_number_input", "4580080111866879", "Card Number")
-
-            # Fill Cardholder Name
-            self._safe_fill_field(By.ID, "card_holder_name_input", "פתאל", "Cardholder Name")
-
-            # Select Expiry Month
-            month_select = Select(self.wait.until(EC.element_to_be_clickable((By.ID, "date_month_input"))))
-            month_select.select_by_visible_text("08")
-            logging.info("✅ Expiry Month selected: 08")
-
-            # Select Expiry Year
-            year_select = Select(self.wait.until(EC.element_to_be_clickable((By.ID, "date_year_input"))))
-            year_select.select_by_visible_text("2025")
-            logging.info("✅ Expiry Year selected: 2025")
-
-            # Fill CVV
-            self._safe_fill_field(By.ID, "cvv_input", "955", "CVV")
-
-            # Fill ID Number
-            self._safe_fill_field(By.ID, "id_number_input", "0356998", "Card ID Number")
-
-            logging.info("🎯 Payment form filled successfully.")
-
+            return self.payment_form.fill(card)
         except Exception as e:
             self.take_screenshot("iframe_payment_fail")
             logging.error(f"❌ Failed to fill payment form in iframe: {e}")
             raise
-        finally:
-            self.driver.switch_to.default_content()
-            logging.info("🔙 Switched back to main content.")
+
+    def fill_payment_iframe_mobile(self):
+        return self.fill_payment_card({
+            "card_number": "4580080111866879",
+            "cardholder_name": "פתאל",
+            "expiry_month": "08",
+            "expiry_year": "2025",
+            "cvv": "955",
+            "id_number": "0356998",
+        })
 
     def fill_payment_iframe_mobile_random(self):
         """
@@ -281,48 +308,14 @@ class FattalOrderPageMobile:
         כרטיס לא נשלח בפועל, מתאים להרצה ללא חיוב אמיתי.
         """
         fake = Faker('he_IL')
-
-        try:
-            logging.info(" Scrolling iframe into view (RANDOM)...")
-            iframe = self.wait.until(EC.presence_of_element_located((By.ID, "paymentIframe")))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", iframe)
-
-            logging.info(" Switching into payment iframe...")
-            self.driver.switch_to.frame(iframe)
-            logging.info(" Switched into iframe.")
-
-            # Card number (דמו בלבד)
-            card_number = "4580080111866879"
-            cardholder_name = fake.name()
-            expiry_month = str(random.randint(1, 12)).zfill(2)
-            expiry_year = str(random.randint(2025, 2028))
-            cvv = str(random.randint(100, 999))
-            id_number = str(random.randint(1000000, 9999999))
-
-            self._safe_fill_field(By.ID, "credit_card_number_input", card_number, "Card Number")
-            self._safe_fill_field(By.ID, "card_holder_name_input", cardholder_name, "Cardholder Name")
-
-            month_select = Select(self.wait.until(EC.element_to_be_clickable((By.ID, "date_month_input"))))
-            month_select.select_by_visible_text(expiry_month)
-            logging.info(f" Expiry Month selected: {expiry_month}")
-
-            year_select = Select(self.wait.until(EC.element_to_be_clickable((By.ID, "date_year_input"))))
-            year_select.select_by_visible_text(expiry_year)
-            logging.info(f" Expiry Year selected: {expiry_year}")
-
-            self._safe_fill_field(By.ID, "cvv_input", cvv, "CVV")
-            self._safe_fill_field(By.ID, "id_number_input", id_number, "Card ID Number")
-
-            logging.info(" Random Payment form filled successfully.")
-
-        except Exception as e:
-            self.take_screenshot("iframe_payment_random_fail")
-            logging.error(f" Failed to fill RANDOM payment form: {e}")
-            raise
-
-        finally:
-            self.driver.switch_to.default_content()
-            logging.info(" Switched back to main content.")
+        return self.fill_payment_card({
+            "card_number": "4580080111866879",  # דמו בלבד
+            "cardholder_name": fake.name(),
+            "expiry_month": str(random.randint(1, 12)).zfill(2),
+            "expiry_year": str(random.randint(2025, 2028)),
+            "cvv": str(random.randint(100, 999)),
+            "id_number": str(random.randint(1000000, 9999999)),
+        })
 
     def click_payment_submit_button(self):
         try:
@@ -440,7 +433,7 @@ class FattalOrderPageMobile:
             summary_h2 = None
             for by, value in selectors:
                 try:
-                    summary_h2 = WebDriverWait(self.driver, 6).until(
+                    summary_h2 = FattalWait(self.driver, 6).until(
                         EC.element_to_be_clickable((by, value))
                     )
                     break  # ✅ Found one, exit loop
@@ -456,10 +449,8 @@ class FattalOrderPageMobile:
 
         except Exception as e:
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            screenshot_dir = os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots")
-            os.makedirs(screenshot_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshot_dir, f"click_room_summary_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Fattal_Tests", "Screenshots"))
+            screenshot_path = screenshot_service_for(self.driver).capture(screenshot_dir, f"click_room_summary_fail_{timestamp}")
             logging.error(f"📸 Screenshot saved: {screenshot_path}")
             logging.error(f"❌ Failed to click room summary header: {e}")
             raise
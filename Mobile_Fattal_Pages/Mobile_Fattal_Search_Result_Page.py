@@ -3,17 +3,26 @@ import os
 import time
 from datetime import datetime
 from selenium import webdriver
-from selenium.common import TimeoutException, NoSuchElementException
+from selenium.common import TimeoutException, StaleElementReferenceException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from Fattal_Utils.Wait_Policy import FattalWait, FattalWaitPolicy
+from Fattal_Utils import Dom_Conditions as DC
+from Fattal_Utils.Dom_Wait import FattalDomWait
+from Fattal_Utils.Network_Idle import network_idle_for
+from Fattal_Utils.Element_Snapshot import snapshot_all
+from Fattal_Utils.Worker_Env import worker_dir
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
 
 
 class FattalSearchResultPageMobile:
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 30)
+        self.wait = FattalWait(driver, 30)
+        self.waits = FattalWaitPolicy(driver)
+        self.network_idle = network_idle_for(driver)
 
     SHOW_PRICES_BUTTONS = (By.XPATH, "//button[normalize-space()='הצג מחירים']")
     BOOK_ROOM_BUTTONS = (By.XPATH, "//button[normalize-space()='להזמנת חדר']")
@@ -21,17 +30,15 @@ class FattalSearchResultPageMobile:
 
     def take_screenshot(self, name="error_screenshot"):
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        screenshot_dir = os.path.join(os.getcwd(), "Screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        path = os.path.join(screenshot_dir, f"{name}_{timestamp}.png")
-        self.driver.save_screenshot(path)
+        screenshot_dir = worker_dir(os.path.join(os.getcwd(), "Screenshots"))
+        path = screenshot_service_for(self.driver).capture(screenshot_dir, f"{name}_{timestamp}")
         logging.error(f"Screenshot saved: {path}")
 
     def wait_for_rooms_to_load(self):
         try:
             logging.info("ממתין לטעינת כרטיסי חדרים (מובייל)...")
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located(self.BOOK_ROOM_BUTTONS)
+            FattalDomWait(self.driver, 30).until(
+                DC.presence_of_element_located(self.BOOK_ROOM_BUTTONS)
             )
             logging.info("כרטיסי חדרים נטענו.")
         except Exception as e:
@@ -46,7 +53,7 @@ class FattalSearchResultPageMobile:
         """
         try:
             logging.info("ממתין להופעת כפתור 'הצג מחירים'...")
-            show_price_button = WebDriverWait(self.driver, timeout).until(
+            show_price_button = FattalWait(self.driver, timeout).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'הצג מחירים')]"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", show_price_button)
@@ -61,19 +68,21 @@ class FattalSearchResultPageMobile:
         logging.info("📍 מחפש ולוחץ על כפתור 'הצג מחירים' (דינאמי)...")
 
         try:
-            WebDriverWait(self.driver, 20).until(
+            FattalWait(self.driver, 20).until(
                 EC.presence_of_all_elements_located((
                     By.XPATH,
                     "//button[starts-with(@id, 'room-price-button') and contains(., 'הצג מחירים')]"
                 ))
             )
 
-            buttons = self.driver.find_elements(
+            # Visibility and enabled state of every button in one snapshot
+            buttons = snapshot_all(self.driver, (
                 By.XPATH, "//button[starts-with(@id, 'room-price-button') and contains(., 'הצג מחירים')]"
-            )
+            ))
 
-            for button in buttons:
-                if button.is_displayed() and button.is_enabled():
+            for state in buttons:
+                if state.clickable:
+                    button = state.element
                     try:
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
                         time.sleep(0.3)
@@ -96,11 +105,11 @@ class FattalSearchResultPageMobile:
 
         for attempt in range(3):
             try:
-                show_buttons = WebDriverWait(self.driver, 15).until(
+                show_buttons = FattalWait(self.driver, 15).until(
                     EC.presence_of_all_elements_located(self.SHOW_PRICES_BUTTONS)
                 )
 
-                WebDriverWait(self.driver, 5).until(
+                FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable(self.SHOW_PRICES_BUTTONS)
                 )
 
@@ -110,7 +119,8 @@ class FattalSearchResultPageMobile:
                 return
             except Exception as e:
                 logging.warning(f"ניסיון {attempt + 1}: הכפתור עדיין לא מוכן. ממתין...")
-                time.sleep(3)
+                # Wait for the search/pricing requests to settle instead of a fixed pause
+                self.network_idle.wait_for_idle(cap=3, label="show prices retry")
 
         try:
             show_buttons = self.driver.find_elements(*self.SHOW_PRICES_BUTTONS)
@@ -129,13 +139,12 @@ class FattalSearchResultPageMobile:
 
         try:
             # Try finding buttons with dynamic ID pattern
-            buttons = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located(
-                    (By.XPATH, "//button[starts-with(@id, 'room-price-button-choose-room_')]"))
-            )
+            locator = (By.XPATH, "//button[starts-with(@id, 'room-price-button-choose-room_')]")
+            FattalWait(self.driver, 10).until(EC.presence_of_all_elements_located(locator))
 
-            for button in buttons:
-                if button.is_displayed() and "להזמנת חדר" in button.text:
+            for state in snapshot_all(self.driver, locator):
+                if state.visible and "להזמנת חדר" in state.text:
+                    button = state.element
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
                     time.sleep(0.3)
                     self.driver.execute_script("arguments[0].click();", button)
@@ -154,7 +163,7 @@ class FattalSearchResultPageMobile:
 
         # Fallback - try finding by exact text
         try:
-            button_by_text = WebDriverWait(self.driver, 10).until(
+            button_by_text = FattalWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='להזמנת חדר']"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button_by_text)
@@ -176,11 +185,8 @@ class FattalSearchResultPageMobile:
         logging.info("ממתין להופעת כפתורי מחירים...")
 
         try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located(self.ROOM_PRICE_LOADED)
-            )
-            WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located(self.ROOM_PRICE_LOADED)
+            self.network_idle.until(
+                EC.visibility_of_element_located(self.ROOM_PRICE_LOADED), cap=30, label="room prices"
             )
             logging.info("מחירי חדרים נטענו בהצלחה.")
         except Exception as e:
@@ -190,14 +196,12 @@ class FattalSearchResultPageMobile:
 
     def no_results_found(self) -> bool:
         try:
-            banner = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//h1[contains(text(),'לא נמצאו מלונות')]"))
-            )
-            if banner.is_displayed():
+            banners = self.waits.probe(By.XPATH, "//h1[contains(text(),'לא נמצאו מלונות')]")
+            if banners and banners[0].is_displayed():
                 logging.warning("אין תוצאות חיפוש — לא נמצאו מלונות.")
                 return True
             return False
-        except:
+        except StaleElementReferenceException:
             return False
 
     def click_show_prices_regional(self):
@@ -208,9 +212,10 @@ class FattalSearchResultPageMobile:
         try:
             logging.info("[REGIONAL] מחפש כפתור 'הצג מחירים'...")
 
-            # Try to locate the element first
-            WebDriverWait(self.driver, 90).until(
-                lambda d: d.find_elements(By.XPATH, "//button[contains(text(),'הצג מחירים')]")
+            # Bounded by the pricing requests: fails early once they finished without rendering the button
+            self.network_idle.until(
+                lambda d: d.find_elements(By.XPATH, "//button[contains(text(),'הצג מחירים')]"),
+                cap=90, label="regional show prices",
             )
             buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(),'הצג מחירים')]")
 
@@ -255,7 +260,7 @@ class FattalSearchResultPageMobile:
                 try:
                     logging.debug(f"[REGIONAL] Trying button index {idx}: {btn.get_attribute('outerHTML')[:100]}...")
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                    WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(btn))
+                    FattalWait(self.driver, 5).until(EC.element_to_be_clickable(btn))
                     btn.click()
                     logging.info("[REGIONAL] Clicked 'להזמנת חדר' successfully.")
                     return
@@ -279,7 +284,7 @@ class FattalSearchResultPageMobile:
             logging.info(f"Attempting to book {room_count} rooms in mobile flow...")
 
             # Step 1: Click the single 'הצג מחירים'
-            show_price_button = WebDriverWait(self.driver, 20).until(
+            show_price_button = FattalWait(self.driver, 20).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'הצג מחירים')]"))
             )
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", show_price_button)
@@ -290,7 +295,7 @@ class FattalSearchResultPageMobile:
             for i in range(room_count):
                 logging.info(f"Waiting for room selection {i + 1} 'הזמן' button...")
 
-                book_button = WebDriverWait(self.driver, 20).until(
+                book_button = FattalWait(self.driver, 20).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'הזמן')]"))
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", book_button)
@@ -327,15 +332,12 @@ class FattalSearchResultPageMobile:
             raise
 
     def is_no_results_found(self):
-        try:
-            element = self.driver.find_element(By.ID, "search-page-no-search-results-title")
-            return "לא נמצאו מלונות" in element.text
-        except NoSuchElementException:
-            return False
+        elements = self.waits.probe(By.ID, "search-page-no-search-results-title")
+        return bool(elements) and "לא נמצאו מלונות" in elements[0].text
 
     def click_view_more_deal_by_index(self, index=0):
         try:
-            deals = WebDriverWait(self.driver, 10).until(
+            deals = FattalWait(self.driver, 10).until(
                 EC.presence_of_all_elements_located(
                     (By.XPATH, "//a[contains(@href, '/deals/') and contains(text(), 'להזמנה ופרטים נוספים')]")
                 )
@@ -381,9 +383,12 @@ class FattalSearchResultPageMobile:
 
     def handle_search_flow_with_fallback(self, test):
         try:
-            # Check if fallback suggestion is shown (no real results)
-            no_results = self.driver.find_elements(By.CSS_SELECTOR, "div.sc-32916819-1.chtiXu")
-            if no_results:
+            # Wait for whichever page variant renders first — the fallback suggestions or real results
+            page_variant = self.waits.first_of({
+                "fallback": (By.CSS_SELECTOR, "div.sc-32916819-1.chtiXu"),
+                "results": (By.XPATH, "//button[starts-with(@id, 'room-price-button') or normalize-space()='הצג מחירים' or normalize-space()='להזמנת חדר']"),
+            }, "default")
+            if page_variant == "fallback":
                 logging.info("⚠️ No direct hotel results found — fallback path triggered.")
 
                 # Click the first dynamic "בחר חדר" fallback suggestion
@@ -5,13 +5,17 @@ from selenium.common import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 import logging
 
+from Fattal_Utils.Login_Session_Cache import login_with_session_cache
+from Fattal_Utils.Popup_Watchdog import popup_watchdog_for
+from Fattal_Utils.Screenshot_Service import screenshot_service_for
+from Fattal_Utils.Wait_Policy import FattalWait
+
 class FattalMobileToolBar:
     def __init__(self, driver: webdriver.Chrome):
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
+        self.wait = FattalWait(self.driver, 10)
 
     def open_login_menu(self):
         try:
@@ -59,6 +63,8 @@ class FattalMobileToolBar:
         logging.info("Login button clicked.")
 
     def close_post_login_popup(self):
+        if popup_watchdog_for(self.driver).handles("post_login"):
+            return
         try:
             logging.info("🔍 Checking for post-login popup...")
 
@@ -73,7 +79,7 @@ class FattalMobileToolBar:
             for selector in selectors:
                 try:
                     # Try to find the close button using current selector
-                    close_btn = WebDriverWait(self.driver, 7).until(
+                    close_btn = FattalWait(self.driver, 7).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     if close_btn:
@@ -95,7 +101,7 @@ class FattalMobileToolBar:
                 self.driver.execute_script("arguments[0].click();", close_btn)
             except StaleElementReferenceException:
                 logging.warning("⚠️ Stale element, retrying click...")
-                close_btn = WebDriverWait(self.driver, 5).until(
+                close_btn = FattalWait(self.driver, 5).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                 )
                 self.driver.execute_script("arguments[0].click();", close_btn)
@@ -107,6 +113,8 @@ class FattalMobileToolBar:
             self.driver.save_screenshot("popup_close_failed.png")
 
     def close_post_login_popup_expired(self):
+        if popup_watchdog_for(self.driver).handles("post_login"):
+            return
         try:
             logging.info("📍 Checking for post-login popup...")
 
@@ -142,7 +150,7 @@ class FattalMobileToolBar:
         try:
             logging.info("Checking for membership renewal popup...")
 
-            popup_container = WebDriverWait(self.driver, 5).until(
+            popup_container = FattalWait(self.driver, 5).until(
                 EC.presence_of_element_located((By.ID, "search-expired-before-vacation-dialog-container"))
             )
 
@@ -171,7 +179,7 @@ class FattalMobileToolBar:
         try:
             logging.info("Clicking on 'דילים וחבילות' tab using ID...")
 
-            deals_tab = WebDriverWait(self.driver, 15).until(
+            deals_tab = FattalWait(self.driver, 15).until(
                 EC.element_to_be_clickable((By.ID, "footer-mobile-tab_deals"))
             )
 
@@ -252,8 +260,7 @@ class FattalMobileToolBar:
             logging.info("'מועדון פתאל וחברים' tab clicked successfully.")
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            path = os.path.join("Fattal_Tests", "Screenshots", f"click_fattal_friends_fail_{timestamp}.png")
-            self.driver.save_screenshot(path)
+            path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"click_fattal_friends_fail_{timestamp}")
             logging.error(f"Failed to click 'מועדון פתאל וחברים' tab. Screenshot saved: {path}")
             raise
 
@@ -264,7 +271,7 @@ class FattalMobileToolBar:
         try:
             logging.info("Waiting for renew link to be clickable by class + href...")
             selector = "a[href*='/fattal-and-friends/checkout']"
-            link = WebDriverWait(self.driver, timeout).until(
+            link = FattalWait(self.driver, timeout).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
             )
             link.click()
@@ -277,6 +284,9 @@ class FattalMobileToolBar:
         """
         Attempts to close any club-related popup: either specific post-renewal or general one.
         """
+        if popup_watchdog_for(self.driver).handles("club"):
+            return
+
         selectors = [
             # Try the specific confirmation popup first
             "div.sc-c18678ea-3.iOzwib",
@@ -316,8 +326,31 @@ class FattalMobileToolBar:
             logging.info("✅ Clicked 'כניסה באמצעות ת.ז וסיסמה' footer button successfully.")
         except Exception as e:
             timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-            screenshot_path = os.path.join("Fattal_Tests", "Screenshots", f"click_footer_login_fail_{timestamp}.png")
-            self.driver.save_screenshot(screenshot_path)
+            screenshot_path = screenshot_service_for(self.driver).capture(os.path.join("Fattal_Tests", "Screenshots"), f"click_footer_login_fail_{timestamp}")
             logging.error(f"❌ Failed to click footer login button: {e}")
             logging.error(f"📸 Screenshot saved: {screenshot_path}")
             raise
+
+    def login_marker(self):
+        """Text of the header user area — it changes once a club member is logged in."""
+        return self.driver.execute_script("""
+            const el = document.querySelector('#header-user-section-button') ||
+                       document.querySelector('.sc-cba239cf-1.ceoYye');
+            return el ? (el.innerText + '|' + (el.getAttribute('aria-label') || '')).trim() : '';
+        """)
+
+    def club_login(self, user_id, password, post_login=None):
+        """
+        Logs a club member in, restoring a cached session when possible.
+        post_login runs after a UI login only (e.g. close_post_login_popup).
+        """
+        def ui_login():
+            self.open_login_menu()
+            self.click_login_with_email_button()
+            self.user_id_input().send_keys(user_id)
+            self.user_password_input().send_keys(password)
+            self.click_login_button()
+            if post_login:
+                post_login()
+
+        return login_with_session_cache(self.driver, user_id, ui_login, self.login_marker)